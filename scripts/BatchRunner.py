@@ -0,0 +1,164 @@
+import os
+import glob
+import time
+import yaml
+import Config
+import FDPClient
+import Log
+import Populator
+from concurrent.futures import ThreadPoolExecutor
+
+logger = Log.get_logger(__name__)
+
+
+class BatchJob:
+    """
+    Class contents one config file of a batch and the result of populating it
+    """
+
+    def __init__(self, name, config_file, base_path):
+        """
+        :param name: Name of the job in the logs and batch report
+        :param config_file: Path of the config file
+        :param base_path: Path the input files in the config file are relative to
+        """
+        self.NAME = name
+        self.CONFIG_FILE = config_file
+        self.BASE_PATH = base_path
+        self.CONFIG = None
+        self.POPULATOR = None
+        self.ERROR = None
+        self.SECONDS = 0
+
+
+class BatchRunner:
+    """
+    Class to populate FAIR Data Points from many config files in one process. The jobs share one connection pool,
+    the template cache and the token cache, and several jobs can run at the same time.
+    """
+
+    def __init__(self, path, parallelism=None):
+        """
+        :param path: Provide a directory, in which every config.yml is a job, or a batch manifest file
+        :param parallelism: Provide the number of jobs that run at the same time, overrides the manifest
+        """
+        manifest = {}
+        if os.path.isdir(path):
+            config_files = sorted(glob.glob(os.path.join(path, "**", "config.yml"), recursive=True))
+            self.JOBS = [BatchJob(os.path.relpath(config_file, path), config_file, os.path.dirname(config_file))
+                         for config_file in config_files]
+        elif os.path.isfile(path):
+            with open(path) as yaml_file:
+                manifest = yaml.load(yaml_file, Loader=yaml.FullLoader) or {}
+            self.JOBS = []
+            manifest_dir = os.path.dirname(path)
+            for index, job in enumerate(manifest.get('jobs') or []):
+                try:
+                    config_file = os.path.join(manifest_dir, job['config'])
+                except (KeyError, TypeError):
+                    raise SystemExit("Job " + str(index + 1) + " in the batch manifest is missing config")
+                base_path = os.path.join(manifest_dir, job['base_path']) if job.get('base_path') \
+                    else os.path.dirname(config_file)
+                self.JOBS.append(BatchJob(job.get('name', job['config']), config_file, base_path))
+        else:
+            raise SystemExit("Batch directory or manifest does not exist. Provided path: " + path)
+
+        if not self.JOBS:
+            raise SystemExit("No config files found in " + path)
+
+        try:
+            self.PARALLELISM = max(1, int(parallelism if parallelism is not None else manifest['parallelism']))
+        except:
+            self.PARALLELISM = 1
+
+        log_level = str(manifest.get('log_level', "INFO")).upper()
+        if log_level not in Log.LEVELS:
+            log_level = "INFO"
+        log_format = manifest.get('log_format', "text")
+        if log_format not in ("text", "json"):
+            log_format = "text"
+        payload_file = os.path.join(os.path.dirname(path), manifest['payload_file']) \
+            if manifest.get('payload_file') else None
+        Log.setup(log_level, log_format, payload_file)
+
+        self.START_TIME = time.monotonic()
+        self.SECONDS = 0
+
+    def run(self):
+        """
+        Method to read the settings of all jobs and populate them with a shared session
+        """
+        max_concurrency = 1
+        for job in self.JOBS:
+            try:
+                job.CONFIG = Config.Settings(job.CONFIG_FILE, job.BASE_PATH)
+                max_concurrency = max(max_concurrency, job.CONFIG.MAX_CONCURRENCY)
+            except (Exception, SystemExit) as error:
+                job.ERROR = error
+                logger.error("Config of %s is invalid: %s", job.NAME, error)
+
+        # One pool for all jobs, with a connection per concurrent upload of every parallel job
+        session = FDPClient.create_session(self.PARALLELISM * max_concurrency)
+        jobs = [job for job in self.JOBS if job.ERROR is None]
+        if self.PARALLELISM == 1:
+            for job in jobs:
+                self.run_job(job, session)
+        else:
+            with ThreadPoolExecutor(max_workers=self.PARALLELISM) as executor:
+                list(executor.map(lambda job: self.run_job(job, session), jobs))
+        self.SECONDS = time.monotonic() - self.START_TIME
+
+    def run_job(self, job, session):
+        """
+        Method to populate the FDPs of one job, errors are kept in the job so the other jobs continue
+
+        :param job: Provide BatchJob object
+        :param session: Provide shared requests session
+        """
+        logger.info("Starting %s", job.NAME)
+        start = time.monotonic()
+        try:
+            job.POPULATOR = Populator.Populator(job.CONFIG, session)
+            failed = [target.NAME for target in job.POPULATOR.TARGETS if target.ERROR is not None]
+            if failed:
+                job.ERROR = "upload failed for: " + ", ".join(failed)
+        except (Exception, SystemExit) as error:
+            job.ERROR = error
+            logger.error("%s failed: %s", job.NAME, error)
+        job.SECONDS = time.monotonic() - start
+
+    def get_summary(self):
+        """
+        Method to get the combined report of all jobs
+
+        :return: List of summary lines
+        """
+        lines = ["Batch report (%d jobs, parallelism %d, %.2f s):" % (len(self.JOBS), self.PARALLELISM,
+                                                                      self.SECONDS)]
+        created = 0
+        for job in self.JOBS:
+            job_created = sum(target.CREATED for target in job.POPULATOR.TARGETS) if job.POPULATOR else 0
+            created += job_created
+            status = "FAILED: " + str(job.ERROR) if job.ERROR is not None else "succeeded"
+            lines.append("  %-40s %6d resources  %8.2f s  %s" % (job.NAME, job_created, job.SECONDS, status))
+        failed = len([job for job in self.JOBS if job.ERROR is not None])
+        lines.append("  total: %d resources, %d succeeded, %d failed" % (created, len(self.JOBS) - failed, failed))
+        return lines
+
+    def print_summary(self):
+        """
+        Method to log the run reports of every job and the combined report
+        """
+        for job in self.JOBS:
+            if job.POPULATOR is not None:
+                logger.info("Reports of %s:", job.NAME)
+                job.POPULATOR.print_summary()
+        logger.info("\n".join(self.get_summary()))
+
+    def check_jobs(self):
+        """
+        Method to stop with an error if a job failed
+        """
+        failed = [job.NAME for job in self.JOBS if job.ERROR is not None]
+        if failed:
+            raise SystemExit("Batch failed for: " + ", ".join(failed))
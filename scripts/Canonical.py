@@ -0,0 +1,131 @@
+import hashlib
+from rdflib import BNode, Graph, Literal
+from rdflib.compare import to_canonical_graph
+
+"""
+Canonical N-Triples of a resource: the triples are sorted and every blank node is labelled by a hash of its content, so
+the same metadata gives the same bytes in every run and payloads can be compared or hashed without an isomorphism check.
+"""
+
+
+def nt_term(value):
+    """
+    :param value: Provide rdflib term
+    :return: N-Triples form of the term, literals are escaped like the N-Triples serializer of rdflib does
+    """
+    if not isinstance(value, Literal):
+        return value.n3()
+    quoted = '"%s"' % value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"').replace("\r", "\\r")
+    if value.language:
+        return quoted + "@" + value.language
+    if value.datatype:
+        return quoted + "^^<" + str(value.datatype) + ">"
+    return quoted
+
+
+def nt_row(subject, predicate, value):
+    """
+    :param subject: Provide subject of the triple
+    :param predicate: Provide predicate of the triple
+    :param value: Provide object of the triple
+    :return: N-Triples line of the triple
+    """
+    return subject.n3() + " " + predicate.n3() + " " + nt_term(value) + " .\n"
+
+
+def get_label(node, triples, labels, visiting):
+    """
+    Method to get the canonical label of a blank node from its triples and the labels of the blank nodes it refers to
+
+    :param node: Provide blank node
+    :param triples: Provide dict of blank node to list of its (predicate, object) tuples
+    :param labels: Provide dict of the labels found so far
+    :param visiting: Provide set of the blank nodes whose label is being computed, to detect cycles
+    :return: Label, or None if the blank node is part of a cycle
+    """
+    if node in labels:
+        return labels[node]
+    if node in visiting:
+        return None
+    visiting.add(node)
+    lines = []
+    for predicate, value in triples.get(node, ()):
+        if isinstance(value, BNode):
+            value = get_label(value, triples, labels, visiting)
+            if value is None:
+                return None
+            lines.append(predicate.n3() + " _:" + value)
+        else:
+            lines.append(nt_row(node, predicate, value).split(" ", 1)[1])
+    visiting.discard(node)
+    lines.sort()
+    labels[node] = "c" + hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:32]
+    return labels[node]
+
+
+def relabel(graph):
+    """
+    Label the blank nodes by their content. This works for the blank nodes of the generated resources, which form trees;
+    a blank node that is part of a cycle, or two blank nodes with the same content, cannot be labelled this way.
+
+    :param graph: Provide rdflib Graph
+    :return: Dict of blank node to canonical label, or None if the blank nodes cannot be labelled by their content
+    """
+    triples = {}
+    for subject, predicate, value in graph:
+        if isinstance(subject, BNode):
+            triples.setdefault(subject, []).append((predicate, value))
+        # A blank node that is only an object has no triples of its own, but needs a label too
+        if isinstance(value, BNode):
+            triples.setdefault(value, [])
+    labels = {}
+    for node in triples:
+        if get_label(node, triples, labels, set()) is None:
+            return None
+    if len(set(labels.values())) != len(labels):
+        return None
+    return labels
+
+
+def canonical_ntriples(graph, scope=None):
+    """
+    :param graph: Provide rdflib Graph
+    :param scope: Provide name that makes the blank node labels unique to the graph, e.g. the graph name in an export
+                  with several graphs, or None
+    :return: Canonical N-Triples of the graph
+    """
+    if not any(isinstance(term, BNode) for triple in graph for term in triple):
+        return "".join(sorted(nt_row(*triple) for triple in graph))
+
+    labels = relabel(graph)
+    if labels is None:
+        # General blank node structures are labelled with the slower RDFC algorithm of rdflib
+        graph = to_canonical_graph(graph)
+        labels = {term: str(term) for triple in graph for term in triple if isinstance(term, BNode)}
+    if scope is not None:
+        prefix = "s" + hashlib.sha256(scope.encode("utf-8")).hexdigest()[:16]
+        labels = {node: prefix + label for node, label in labels.items()}
+
+    def term(value):
+        return BNode(labels[value]) if isinstance(value, BNode) else value
+
+    return "".join(sorted(nt_row(term(subject), predicate, term(value)) for subject, predicate, value in graph))
+
+
+def digest(graph):
+    """
+    :param graph: Provide rdflib Graph
+    :return: SHA-256 hex digest of the canonical N-Triples of the graph
+    """
+    return hashlib.sha256(canonical_ntriples(graph).encode("utf-8")).hexdigest()
+
+
+def payload_digest(payload, rdf_format="turtle"):
+    """
+    :param payload: Provide serialized RDF
+    :param rdf_format: Provide rdflib format of the payload
+    :return: SHA-256 hex digest of the canonical N-Triples of the payload
+    """
+    graph = Graph()
+    graph.parse(data=payload, format=rdf_format)
+    return digest(graph)
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import threading
+import time
+import Log
+import ResourceEntry
+from rdflib import Graph, URIRef, BNode
+from rdflib.namespace import DCTERMS, DCAT
+from concurrent.futures import ThreadPoolExecutor
+
+logger = Log.get_logger(__name__)
+
+LDP_CONTAINS = URIRef("http://www.w3.org/ns/ldp#contains")
+FDP_METADATA_CATALOG = URIRef("https://w3id.org/fdp/fdp-o#metadataCatalog")
+R3D_DATA_CATALOG = URIRef("http://www.re3data.org/schema/3-0#dataCatalog")
+
+# Predicates that link a resource to its children in the FDP, the root of the FDP lists its catalogs with the
+# fdp-o or, in older versions, the r3d predicate
+CHILD_PREDICATES = (LDP_CONTAINS, DCAT.dataset, DCAT.distribution, DCAT.service, FDP_METADATA_CATALOG,
+                    R3D_DATA_CATALOG)
+
+# Triples the FDP adds or changes by itself, these are left out of the content hash
+IGNORED_NAMESPACES = ("https://w3id.org/fdp/fdp-o#", "http://www.w3.org/ns/ldp#", "http://rdfs.org/ns/void#")
+IGNORED_PREDICATES = CHILD_PREDICATES + (DCTERMS.issued, DCTERMS.modified)
+
+
+def content_hash(graph, subject):
+    """
+    Hash of the metadata of a resource that does not depend on the resource URL, triple order or blank node labels,
+    so the hash of a rendered payload can be compared to the hash of the same resource in the FDP
+
+    :param graph: Provide rdflib Graph
+    :param subject: Provide URL of the resource in the graph
+    :return: SHA-256 hex digest
+    """
+    lines = []
+    for predicate, value in graph.predicate_objects(URIRef(subject)):
+        if predicate in IGNORED_PREDICATES or str(predicate).startswith(IGNORED_NAMESPACES):
+            continue
+        lines.append(predicate.n3() + " " + ("_:b" if isinstance(value, BNode) else value.n3()))
+    lines.sort()
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def payload_hash(payload):
+    """
+    :param payload: Provide rendered Turtle payload of a new resource
+    :return: Content hash of the payload, comparable to the content hash of a resource in the FDP
+    """
+    graph = Graph()
+    graph.parse(data=payload, format="turtle")
+    return content_hash(graph, ResourceEntry.NEW_RESOURCE_URL)
+
+
+def resource_type_of(url):
+    """
+    :param url: Provide FDP URL of a resource, e.g. https://fdp.example.org/dataset/1234
+    :return: Resource type in the URL, e.g. dataset
+    """
+    segments = url.rstrip("/").split("/")
+    return segments[-2] if len(segments) > 1 else ""
+
+
+class CatalogIndex:
+    """
+    Class contents an index of the resources in a catalog, by URL and by type, parent and title or identifier
+    """
+
+    def __init__(self, catalog_url=None):
+        """
+        :param catalog_url: Provide URL of the indexed catalog
+        """
+        self.CATALOG_URL = catalog_url
+        self.entries = {}
+        self.by_title = {}
+        self.by_identifier = {}
+        self.lock = threading.Lock()
+
+    def add(self, url, resource_type, title=None, identifier=None, parent=None, content_hash=None):
+        """
+        Method to add a resource to the index, the first resource with a title or identifier is kept in the lookup
+
+        :param url: Provide URL of the resource
+        :param resource_type: Provide the type of resource
+        :param title: Provide title of the resource
+        :param identifier: Provide identifier of the resource
+        :param parent: Provide URL of the parent resource
+        :param content_hash: Provide content hash of the resource
+        """
+        entry = {"url": url, "type": resource_type, "title": title, "identifier": identifier, "parent": parent,
+                 "hash": content_hash}
+        with self.lock:
+            self.entries[url] = entry
+            if title is not None:
+                self.by_title.setdefault((resource_type, parent, str(title)), entry)
+            if identifier is not None:
+                self.by_identifier.setdefault((resource_type, parent, str(identifier)), entry)
+
+    def contains(self, url):
+        """
+        :param url: Provide URL of a resource
+        :return: True if the resource is in the index
+        """
+        return url in self.entries
+
+    def find(self, resource_type, parent, title=None, identifier=None):
+        """
+        Method to find a resource by identifier, or by title if the identifier is not indexed
+
+        :param resource_type: Provide the type of resource
+        :param parent: Provide URL of the parent resource
+        :param title: Provide title of the resource
+        :param identifier: Provide identifier of the resource
+        :return: Index entry dict, or None if there is no such resource
+        """
+        if identifier is not None:
+            entry = self.by_identifier.get((resource_type, parent, str(identifier)))
+            if entry is not None:
+                return entry
+        if title is not None:
+            return self.by_title.get((resource_type, parent, str(title)))
+        return None
+
+    def get_children(self, url):
+        """
+        :param url: Provide URL of a resource
+        :return: List of index entries whose parent is the resource
+        """
+        return [entry for entry in self.entries.values() if entry["parent"] == url]
+
+    def save(self, path):
+        """
+        Method to write the index to a JSON file
+
+        :param path: Provide path of the index file
+        """
+        with open(path, "w", encoding="utf-8") as index_file:
+            json.dump({"catalog": self.CATALOG_URL, "entries": list(self.entries.values())}, index_file, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Method to read an index written by save
+
+        :param path: Provide path of the index file
+        :return: CatalogIndex object
+        """
+        with open(path, encoding="utf-8") as index_file:
+            data = json.load(index_file)
+        index = cls(data.get("catalog"))
+        for entry in data.get("entries", []):
+            index.add(entry["url"], entry["type"], entry.get("title"), entry.get("identifier"), entry.get("parent"),
+                      entry.get("hash"))
+        return index
+
+
+class CatalogCrawler:
+    """
+    Class to fetch a catalog and all its descendants from an FDP, level by level with bounded parallelism, and index
+    them. Every resource is fetched and parsed once.
+    """
+
+    def __init__(self, fdp_client, concurrency=4):
+        """
+        :param fdp_client: Provide FDPClient object of the FDP
+        :param concurrency: Provide the number of resources fetched at the same time
+        """
+        self.FDP_CLIENT = fdp_client
+        self.CONCURRENCY = max(1, concurrency)
+        self.fetched = 0
+        self.seconds = 0
+
+    def crawl(self, catalog_url, index=None, depth=None):
+        """
+        Method to index the catalog and its descendants
+
+        :param catalog_url: Provide URL of the catalog
+        :param index: Provide CatalogIndex object to add the resources to, a new index is created if it is not provided
+        :param depth: Provide number of levels below the catalog that are fetched, or None for all levels
+        :return: CatalogIndex object
+        """
+        start = time.monotonic()
+        if index is None:
+            index = CatalogIndex(catalog_url)
+        seen = {catalog_url}
+        level = [(catalog_url, None)]
+        with ThreadPoolExecutor(max_workers=self.CONCURRENCY) as executor:
+            while level and (depth is None or depth >= 0):
+                if depth is not None:
+                    depth -= 1
+                next_level = []
+                for (url, parent), graph in zip(level, executor.map(self.fetch, [url for url, _ in level])):
+                    if graph is None:
+                        continue
+                    self.add_to_index(index, graph, url, parent)
+                    for child in self.get_child_urls(graph, url):
+                        if child not in seen:
+                            seen.add(child)
+                            next_level.append((child, url))
+                level = next_level
+        self.seconds += time.monotonic() - start
+        logger.info("Indexed %d resources of %s in %.2f s", len(index.entries), catalog_url, time.monotonic() - start)
+        return index
+
+    def fetch(self, url):
+        """
+        Method to fetch and parse the metadata of a resource
+
+        :param url: Provide URL of the resource
+        :return: rdflib Graph, or None if the resource does not exist
+        """
+        body = self.FDP_CLIENT.fdp_get_metadata(url)
+        if body is None:
+            logger.warning("Could not fetch %s while crawling the catalog", url)
+            return None
+        self.fetched += 1
+        graph = Graph()
+        graph.parse(data=body, format="turtle", publicID=url)
+        return graph
+
+    @staticmethod
+    def get_child_urls(graph, url):
+        """
+        :param graph: Provide graph of a resource
+        :param url: Provide URL of the resource
+        :return: List of URLs of the children of the resource
+        """
+        children = []
+        for subject, predicate, child in graph.triples((None, None, None)):
+            if not isinstance(child, URIRef) or predicate not in CHILD_PREDICATES:
+                continue
+            if predicate == LDP_CONTAINS or subject == URIRef(url):
+                children.append(str(child))
+        return children
+
+    @staticmethod
+    def add_to_index(index, graph, url, parent):
+        """
+        Method to add a fetched resource to the index
+
+        :param index: Provide CatalogIndex object
+        :param graph: Provide graph of the resource
+        :param url: Provide URL of the resource
+        :param parent: Provide URL of the resource the crawler found it in
+        """
+        subject = URIRef(url)
+        title = graph.value(subject, DCTERMS.title)
+        identifier = graph.value(subject, DCTERMS.identifier)
+        if isinstance(identifier, BNode):
+            identifier = None
+        index.add(url, resource_type_of(url), str(title) if title is not None else None,
+                  str(identifier) if identifier is not None else None, parent, content_hash(graph, url))
+
+    def get_summary(self):
+        """
+        Method to get the crawl lines of the run report
+
+        :return: List of summary lines
+        """
+        return ["crawl: %d resources fetched in %.2f s (concurrency %d)" % (self.fetched, self.seconds,
+                                                                            self.CONCURRENCY)]
@@ -0,0 +1,146 @@
+import os
+import subprocess
+import tempfile
+import Log
+
+logger = Log.get_logger(__name__)
+
+# Column with the title of the resource of a row, also the key of sheets without the configured key column
+TITLE_COLUMN = "Title"
+
+
+def find_key_column(header, key_column):
+    """
+    :param header: Provide header row of a sheet or CSV file
+    :param key_column: Provide name of the key column, matched without case and a trailing * of required columns
+    :return: Index of the key column, the title column (or else the first column) if the header has no such column
+    """
+    for name in (key_column, TITLE_COLUMN):
+        for index, column in enumerate(header):
+            if column is not None and str(column).strip().rstrip("*").lower() == name.lower():
+                return index
+    return 0
+
+
+def normalize_row(row):
+    """
+    :param row: Provide row of values
+    :return: Tuple of the values without trailing empty cells, so a sheet that got wider does not change every row
+    """
+    values = list(row)
+    while values and values[-1] in (None, ""):
+        values.pop()
+    return tuple(values)
+
+
+class ChangeDetector:
+    """
+    Class to find the rows of the input files that were added or changed since a git revision. Rows are matched by
+    the value of a key column, so moving a row does not change it, and reported by their title. Removed rows are not
+    reported.
+    """
+
+    def __init__(self, revision, key_column="Title"):
+        """
+        :param revision: Provide git revision to compare with, e.g. HEAD~1 or a commit hash
+        :param key_column: Provide name of the column that identifies a row
+        """
+        self.REVISION = revision
+        self.KEY_COLUMN = key_column
+        self.changed = set()
+        self.rows = 0
+
+    def get_previous_version(self, path):
+        """
+        Method to get the content of an input file at the revision
+
+        :param path: Provide path of the input file in a git working tree
+        :return: File content as bytes, or None if the file did not exist at the revision
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        result = subprocess.run(["git", "-C", directory, "show", self.REVISION + ":./" + name],
+                                capture_output=True)
+        if result.returncode == 0:
+            return result.stdout
+        error = result.stderr.decode("utf-8", "replace").strip()
+        if "does not exist" in error or "exists on disk, but not in" in error:
+            logger.info("%s did not exist at %s, all its rows are new", path, self.REVISION)
+            return None
+        raise SystemExit("Could not read " + path + " at revision " + self.REVISION + ": " + error)
+
+    def read_previous(self, path, read):
+        """
+        Method to read an input file as it was at the revision
+
+        :param path: Provide path of the input file
+        :param read: Provide function that reads the records of a file path
+        :return: Records, or None if the file did not exist at the revision
+        """
+        content = self.get_previous_version(path)
+        if content is None:
+            return None
+        # The reader needs a file with the same name, e.g. for the file type
+        with tempfile.TemporaryDirectory() as directory:
+            previous_path = os.path.join(directory, os.path.basename(path))
+            with open(previous_path, "wb") as previous_file:
+                previous_file.write(content)
+            return read(previous_path)
+
+    def compare_rows(self, source, rows, previous_rows):
+        """
+        Method to add the titles of the rows that are new or different to the changes
+
+        :param source: Provide name of the sheet or file the rows are from
+        :param rows: Provide current rows, the first row is the header
+        :param previous_rows: Provide rows at the revision, or None if there were none
+        """
+        previous = {}
+        if previous_rows:
+            column = find_key_column(previous_rows[0], self.KEY_COLUMN)
+            for row in previous_rows[1:]:
+                if column < len(row) and row[column] not in (None, ""):
+                    previous[row[column]] = normalize_row(row)
+
+        if not rows:
+            return
+        column = find_key_column(rows[0], self.KEY_COLUMN)
+        # Resources know the title of their row, not the value of the key column, so changed rows are recorded by title
+        title_column = find_key_column(rows[0], TITLE_COLUMN)
+        for row in rows[1:]:
+            if column >= len(row) or row[column] in (None, ""):
+                continue
+            self.rows += 1
+            if previous.get(row[column]) != normalize_row(row):
+                title = row[title_column] if title_column < len(row) else None
+                self.changed.add((source, title))
+                logger.debug("Row %s of %s changed since %s", row[column], source, self.REVISION)
+
+    def add_workbook(self, path, workbook, read):
+        """
+        Method to compare the sheets of a workbook with the workbook at the revision
+
+        :param path: Provide path of the workbook
+        :param workbook: Provide dict with the current rows of every sheet
+        :param read: Provide function that reads a workbook dict from a file path
+        """
+        previous = self.read_previous(path, read)
+        for sheet, rows in workbook["sheets"].items():
+            self.compare_rows(sheet, rows, previous["sheets"].get(sheet) if previous else None)
+
+    def add_file(self, path, rows, read):
+        """
+        Method to compare the rows of a CSV file with the file at the revision, the rows are identified by the path
+
+        :param path: Provide path of the CSV file
+        :param rows: Provide current rows of the file
+        :param read: Provide function that reads the rows from a file path
+        """
+        self.compare_rows(path, rows, self.read_previous(path, read))
+
+    def is_changed(self, source, title):
+        """
+        :param source: Provide name of the sheet or file
+        :param title: Provide title of the row
+        :return: True if the row was added or changed since the revision
+        """
+        return (source, title) in self.changed
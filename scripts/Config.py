@@ -1,52 +1,591 @@
 import os
-import glob
 import yaml
+import Log
+from urllib.parse import urlparse
 
-print("Files from the parent dir : " + str(glob.glob("*")))
-
-FDP_URL = os.environ['FDP_URL']
-FDP_USERNAME = os.environ['FDP_USERNAME']
-FDP_PASSWORD = os.environ['FDP_PASSWORD']
-FDP_PERSISTENT_URL = os.environ['FDP_PERSISTENT_URL']
-DATASET_INPUT_FILE = None
-DISTRIBUTION_INPUT_FILE = None
-EJP_VP_INPUT_FILE = None
-DRY_RUN = None
-CATALOG_URL = None
-CONFIG_FILE = os.environ['CONFIG_FILE']
-BASE_PATH = os.environ['BASE_PATH']
-
-if os.path.isfile(CONFIG_FILE) :
-    yaml_file = open(CONFIG_FILE)
-    config = yaml.load(yaml_file, Loader=yaml.FullLoader)
-
-    # Check for FDP template configuration
-    try:
-        DATASET_INPUT_FILE = os.path.join(BASE_PATH, config['dataset_file'])
-        DISTRIBUTION_INPUT_FILE = os.path.join(BASE_PATH, config['distribution'])
-    except:
-        pass
-
-    # Check for VP template configuration
-    try:
-        EJP_VP_INPUT_FILE = os.path.join(BASE_PATH, config['ejp_vp_file'])
-    except:
-        pass
-
-    try:
-        DRY_RUN = config['dry_run']
-        if DRY_RUN not in (True, False):
-            DRY_RUN = False
-    except:
-        DRY_RUN = False
-
-    try:
-        DEBUG = config['debug']
-        if DEBUG not in (True, False):
-            DEBUG = False
-    except:
-        DEBUG = False
-
-    CATALOG_URL = config['catalog_url']
-else:
-    raise SystemExit("Config file does not exist. Provided input file path: " + CONFIG_FILE)
\ No newline at end of file
+
+"""
+Settings of a populator run. The settings are read from a config file, the FDP credentials from the environment.
+"""
+
+
+class Settings:
+    """
+    Class contents the settings of one config file, so several config files can be used in one process
+    """
+    FDP_URL = None
+    FDP_USERNAME = None
+    FDP_PASSWORD = None
+    FDP_PERSISTENT_URL = None
+    DATASET_INPUT_FILE = None
+    DISTRIBUTION_INPUT_FILE = None
+    EJP_VP_INPUT_FILE = None
+    CATALOG_INPUT_FILE = None
+    CATALOG_CACHE = None
+    CREATE_CATALOGS = False
+    DRY_RUN = None
+    CATALOG_URL = None
+    COMPRESS_PAYLOADS = False
+    COMPRESSION_THRESHOLD = 1024
+    EXISTENCE_CHECK = "head"
+    RATE_LIMIT = 0
+    RATE_LIMIT_BURST = 1
+    MAX_CONCURRENCY = 1
+    ADAPTIVE_CONCURRENCY = False
+    LATENCY_TARGET = 2.0
+    ERROR_RATE_THRESHOLD = 0.05
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.5
+    SIMULATE = False
+    SIMULATION_LATENCY = 0.2
+    SIMULATION_LATENCY_STDDEV = 0.05
+    SIMULATION_BANDWIDTH = 0
+    SIMULATION_ERROR_RATE = 0.0
+    SIMULATION_SEED = None
+    LOG_LEVEL = "INFO"
+    LOG_FORMAT = "text"
+    PAYLOAD_FILE = None
+    RECONCILE = False
+    CRAWL_CONCURRENCY = 4
+    INDEX_FILE = None
+    PRUNE = False
+    PRUNE_CONCURRENCY = 4
+    PRUNE_RETRIES = 3
+    PRUNE_LOG = None
+    EXPORT_FILE = None
+    EXPORT_FORMAT = None
+    RDF_STORE = False
+    WORKBOOK_CACHE = None
+    WORKBOOK_CACHE_SIZE = 64 * 1024 * 1024
+    WORKBOOK_ENGINE = "openpyxl"
+    CHANGED_SINCE = None
+    CHANGE_KEY_COLUMN = "Title"
+    VOCABULARY_INDEX = None
+    VOCABULARIES = {}
+    VOCABULARY_CHECK = "error"
+    LINK_CHECK = "off"
+    LINK_CHECK_CONCURRENCY = 32
+    LINK_CHECK_RATE = 5
+    LINK_CHECK_TIMEOUT = 10
+    LINK_CHECK_CACHE = None
+    LINK_CHECK_TTL = 24 * 3600
+    MEMORY_ACCOUNTING = False
+    MEMORY_BUDGET = None
+    MEMORY_TOP = 10
+    SELECT_TYPES = None
+    SELECT_TITLE = None
+    SELECT_IDENTIFIER = None
+    SELECT_ROWS = None
+    SHARDS = 1
+    SHARD = None
+    JOURNAL_FILE = None
+    DEDUPLICATE = False
+    COLLISION_CHECK = "warn"
+    REGISTRY_FILE = None
+    DEBUG = False
+
+    def __init__(self, config_file, base_path, overrides=None):
+        """
+        :param config_file: Provide path of the config file
+        :param base_path: Provide path the input files in the config file are relative to
+        :param overrides: Provide dict of config keys and values that replace those of the config file, e.g. from the
+                          command line, or None
+        """
+        self.CONFIG_FILE = config_file
+        self.BASE_PATH = base_path
+        self.TARGETS = []
+        self.FDP_URL = os.environ.get('FDP_URL')
+        self.FDP_USERNAME = os.environ.get('FDP_USERNAME')
+        self.FDP_PASSWORD = os.environ.get('FDP_PASSWORD')
+        self.FDP_PERSISTENT_URL = os.environ.get('FDP_PERSISTENT_URL')
+
+        if not os.path.isfile(config_file):
+            raise SystemExit("Config file does not exist. Provided input file path: " + config_file)
+
+        with open(config_file) as yaml_file:
+            config = yaml.load(yaml_file, Loader=yaml.FullLoader)
+        if overrides:
+            config.update({key: value for key, value in overrides.items() if value is not None})
+
+        # Check for FDP template configuration
+        try:
+            self.DATASET_INPUT_FILE = os.path.join(self.BASE_PATH, config['dataset_file'])
+            self.DISTRIBUTION_INPUT_FILE = os.path.join(self.BASE_PATH, config['distribution'])
+        except:
+            pass
+
+        # Check for catalogs configuration
+        try:
+            self.CATALOG_INPUT_FILE = os.path.join(self.BASE_PATH, config['catalog_file']) \
+                if config['catalog_file'] else None
+        except:
+            self.CATALOG_INPUT_FILE = None
+
+        # Check for VP template configuration
+        try:
+            self.EJP_VP_INPUT_FILE = os.path.join(self.BASE_PATH, config['ejp_vp_file'])
+        except:
+            pass
+
+        try:
+            self.DRY_RUN = config['dry_run']
+            if self.DRY_RUN not in (True, False):
+                self.DRY_RUN = False
+        except:
+            self.DRY_RUN = False
+
+        try:
+            self.DEBUG = config['debug']
+            if self.DEBUG not in (True, False):
+                self.DEBUG = False
+        except:
+            self.DEBUG = False
+
+        try:
+            self.LOG_LEVEL = str(config['log_level']).upper()
+            if self.LOG_LEVEL not in Log.LEVELS:
+                self.LOG_LEVEL = "INFO"
+        except:
+            self.LOG_LEVEL = "DEBUG" if self.DEBUG else "INFO"
+
+        try:
+            self.LOG_FORMAT = config['log_format']
+            if self.LOG_FORMAT not in ("text", "json"):
+                self.LOG_FORMAT = "text"
+        except:
+            self.LOG_FORMAT = "text"
+
+        try:
+            self.PAYLOAD_FILE = os.path.join(self.BASE_PATH, config['payload_file']) if config['payload_file'] else None
+        except:
+            self.PAYLOAD_FILE = None
+
+        try:
+            self.COMPRESS_PAYLOADS = config['compress_payloads']
+            if self.COMPRESS_PAYLOADS not in (True, False):
+                self.COMPRESS_PAYLOADS = False
+        except:
+            self.COMPRESS_PAYLOADS = False
+
+        try:
+            self.COMPRESSION_THRESHOLD = int(config['compression_threshold'])
+        except:
+            self.COMPRESSION_THRESHOLD = 1024
+
+        try:
+            self.EXISTENCE_CHECK = config['existence_check']
+            if self.EXISTENCE_CHECK not in ("head", "get"):
+                self.EXISTENCE_CHECK = "head"
+        except:
+            self.EXISTENCE_CHECK = "head"
+
+        try:
+            self.RATE_LIMIT = float(config['rate_limit'])
+        except:
+            self.RATE_LIMIT = 0
+
+        try:
+            self.RATE_LIMIT_BURST = int(config['rate_limit_burst'])
+        except:
+            self.RATE_LIMIT_BURST = 1
+
+        try:
+            self.MAX_CONCURRENCY = max(1, int(config['max_concurrency']))
+        except:
+            self.MAX_CONCURRENCY = 1
+
+        try:
+            self.ADAPTIVE_CONCURRENCY = config['adaptive_concurrency']
+            if self.ADAPTIVE_CONCURRENCY not in (True, False):
+                self.ADAPTIVE_CONCURRENCY = False
+        except:
+            self.ADAPTIVE_CONCURRENCY = False
+
+        try:
+            self.LATENCY_TARGET = float(config['latency_target'])
+        except:
+            self.LATENCY_TARGET = 2.0
+
+        try:
+            self.ERROR_RATE_THRESHOLD = float(config['error_rate_threshold'])
+        except:
+            self.ERROR_RATE_THRESHOLD = 0.05
+
+        try:
+            self.MAX_RETRIES = max(0, int(config['max_retries']))
+        except:
+            self.MAX_RETRIES = 3
+
+        try:
+            self.RETRY_BACKOFF = max(0.0, float(config['retry_backoff']))
+        except:
+            self.RETRY_BACKOFF = 0.5
+
+        try:
+            self.SIMULATE = config['simulate']
+            if self.SIMULATE not in (True, False):
+                self.SIMULATE = False
+        except:
+            self.SIMULATE = False
+
+        try:
+            self.SIMULATION_LATENCY = float(config['simulation_latency'])
+        except:
+            self.SIMULATION_LATENCY = 0.2
+
+        try:
+            self.SIMULATION_LATENCY_STDDEV = float(config['simulation_latency_stddev'])
+        except:
+            self.SIMULATION_LATENCY_STDDEV = 0.05
+
+        try:
+            self.SIMULATION_BANDWIDTH = float(config['simulation_bandwidth'])
+        except:
+            self.SIMULATION_BANDWIDTH = 0
+
+        try:
+            self.SIMULATION_ERROR_RATE = float(config['simulation_error_rate'])
+        except:
+            self.SIMULATION_ERROR_RATE = 0.0
+
+        try:
+            self.SIMULATION_SEED = config['simulation_seed']
+        except:
+            self.SIMULATION_SEED = None
+
+        try:
+            self.RECONCILE = config['reconcile']
+            if self.RECONCILE not in (True, False):
+                self.RECONCILE = False
+        except:
+            self.RECONCILE = False
+
+        try:
+            self.CRAWL_CONCURRENCY = max(1, int(config['crawl_concurrency']))
+        except:
+            self.CRAWL_CONCURRENCY = 4
+
+        try:
+            self.INDEX_FILE = os.path.join(self.BASE_PATH, config['index_file']) if config['index_file'] else None
+        except:
+            self.INDEX_FILE = None
+
+        try:
+            self.PRUNE = config['prune']
+            if self.PRUNE not in (True, False):
+                self.PRUNE = False
+        except:
+            self.PRUNE = False
+
+        try:
+            self.PRUNE_CONCURRENCY = max(1, int(config['prune_concurrency']))
+        except:
+            self.PRUNE_CONCURRENCY = 4
+
+        try:
+            self.PRUNE_RETRIES = max(0, int(config['prune_retries']))
+        except:
+            self.PRUNE_RETRIES = 3
+
+        try:
+            self.PRUNE_LOG = os.path.join(self.BASE_PATH, config['prune_log']) if config['prune_log'] else None
+        except:
+            self.PRUNE_LOG = None
+
+        try:
+            self.EXPORT_FILE = os.path.join(self.BASE_PATH, config['export_file']) if config['export_file'] else None
+        except:
+            self.EXPORT_FILE = None
+
+        try:
+            self.EXPORT_FORMAT = config['export_format']
+            if self.EXPORT_FORMAT not in ("nquads", "trig"):
+                self.EXPORT_FORMAT = None
+        except:
+            self.EXPORT_FORMAT = None
+
+        try:
+            self.RDF_STORE = config['rdf_store']
+            if self.RDF_STORE not in (True, False):
+                self.RDF_STORE = False
+        except:
+            self.RDF_STORE = False
+
+        try:
+            self.WORKBOOK_CACHE = os.path.join(self.BASE_PATH, config['workbook_cache']) \
+                if config['workbook_cache'] else None
+        except:
+            self.WORKBOOK_CACHE = None
+
+        try:
+            self.WORKBOOK_CACHE_SIZE = int(float(config['workbook_cache_size']) * 1024 * 1024)
+        except:
+            self.WORKBOOK_CACHE_SIZE = 64 * 1024 * 1024
+
+        try:
+            self.WORKBOOK_ENGINE = config['workbook_engine']
+            if self.WORKBOOK_ENGINE not in ("openpyxl", "native"):
+                self.WORKBOOK_ENGINE = "openpyxl"
+        except:
+            self.WORKBOOK_ENGINE = "openpyxl"
+
+        # The revision is usually only known when the workflow runs, so the environment variable overrides the config
+        try:
+            self.CHANGED_SINCE = os.environ.get('CHANGED_SINCE') or config['changed_since'] or None
+        except:
+            self.CHANGED_SINCE = None
+
+        try:
+            self.CHANGE_KEY_COLUMN = str(config['change_key_column']) if config['change_key_column'] else "Title"
+        except:
+            self.CHANGE_KEY_COLUMN = "Title"
+
+        try:
+            self.VOCABULARY_INDEX = os.path.join(self.BASE_PATH, config['vocabulary_index']) \
+                if config['vocabulary_index'] else None
+        except:
+            self.VOCABULARY_INDEX = None
+
+        try:
+            self.VOCABULARIES = {str(name): os.path.join(self.BASE_PATH, path)
+                                 for name, path in config['vocabularies'].items()}
+        except:
+            self.VOCABULARIES = {}
+
+        try:
+            self.VOCABULARY_CHECK = config['vocabulary_check']
+            if self.VOCABULARY_CHECK not in ("error", "warn"):
+                self.VOCABULARY_CHECK = "error"
+        except:
+            self.VOCABULARY_CHECK = "error"
+
+        try:
+            self.LINK_CHECK = config['link_check']
+            if self.LINK_CHECK not in ("off", "warn", "error"):
+                self.LINK_CHECK = "off"
+        except:
+            self.LINK_CHECK = "off"
+
+        try:
+            self.LINK_CHECK_CONCURRENCY = int(config['link_check_concurrency'])
+        except:
+            self.LINK_CHECK_CONCURRENCY = 32
+
+        try:
+            self.LINK_CHECK_RATE = float(config['link_check_rate'])
+        except:
+            self.LINK_CHECK_RATE = 5
+
+        try:
+            self.LINK_CHECK_TIMEOUT = float(config['link_check_timeout'])
+        except:
+            self.LINK_CHECK_TIMEOUT = 10
+
+        try:
+            self.LINK_CHECK_CACHE = os.path.join(self.BASE_PATH, config['link_check_cache']) \
+                if config['link_check_cache'] else None
+        except:
+            self.LINK_CHECK_CACHE = None
+
+        try:
+            self.LINK_CHECK_TTL = float(config['link_check_ttl']) * 3600
+        except:
+            self.LINK_CHECK_TTL = 24 * 3600
+
+        try:
+            self.MEMORY_ACCOUNTING = config['memory_accounting']
+            if self.MEMORY_ACCOUNTING not in (True, False):
+                self.MEMORY_ACCOUNTING = False
+        except:
+            self.MEMORY_ACCOUNTING = False
+
+        try:
+            self.MEMORY_BUDGET = int(float(config['memory_budget']) * 1024 * 1024) if config['memory_budget'] else None
+        except:
+            self.MEMORY_BUDGET = None
+
+        try:
+            self.MEMORY_TOP = int(config['memory_top'])
+        except:
+            self.MEMORY_TOP = 10
+
+        try:
+            types = config['select_types']
+            self.SELECT_TYPES = [str(resource_type).strip() for resource_type in
+                                 (types.split(",") if isinstance(types, str) else types)] if types else None
+        except:
+            self.SELECT_TYPES = None
+
+        try:
+            self.SELECT_TITLE = str(config['select_title']) if config['select_title'] else None
+        except:
+            self.SELECT_TITLE = None
+
+        try:
+            self.SELECT_IDENTIFIER = str(config['select_identifier']) if config['select_identifier'] else None
+        except:
+            self.SELECT_IDENTIFIER = None
+
+        try:
+            self.SELECT_ROWS = str(config['select_rows']) if config['select_rows'] else None
+        except:
+            self.SELECT_ROWS = None
+
+        try:
+            self.CATALOG_CACHE = os.path.join(self.BASE_PATH, config['catalog_cache']) \
+                if config['catalog_cache'] else None
+        except:
+            self.CATALOG_CACHE = None
+
+        try:
+            self.CREATE_CATALOGS = config['create_catalogs']
+            if self.CREATE_CATALOGS not in (True, False):
+                self.CREATE_CATALOGS = False
+        except:
+            self.CREATE_CATALOGS = False
+
+        try:
+            self.SHARDS = max(1, int(config['shards']))
+        except:
+            self.SHARDS = 1
+
+        try:
+            self.SHARD = int(config['shard']) if config['shard'] is not None else None
+        except:
+            self.SHARD = None
+
+        try:
+            self.JOURNAL_FILE = os.path.join(self.BASE_PATH, config['journal_file']) if config['journal_file'] else None
+        except:
+            self.JOURNAL_FILE = None
+
+        try:
+            self.DEDUPLICATE = config['deduplicate']
+            if self.DEDUPLICATE not in (True, False):
+                self.DEDUPLICATE = False
+        except:
+            self.DEDUPLICATE = False
+
+        try:
+            self.COLLISION_CHECK = config['collision_check']
+            if self.COLLISION_CHECK not in ("warn", "error"):
+                self.COLLISION_CHECK = "warn"
+        except:
+            self.COLLISION_CHECK = "warn"
+
+        try:
+            self.REGISTRY_FILE = os.path.join(self.BASE_PATH, config['registry_file']) \
+                if config['registry_file'] else None
+        except:
+            self.REGISTRY_FILE = None
+
+        if self.SHARDS > 1:
+            if self.SHARD is None or not 1 <= self.SHARD <= self.SHARDS:
+                raise SystemExit("Set shard to a number from 1 to " + str(self.SHARDS) + " in a sharded run")
+            if self.PRUNE:
+                raise SystemExit("prune can not be combined with shards, the resources of other shards would be "
+                                 "deleted")
+            # The workers write their own export and index, the journal is named by the worker
+            self.EXPORT_FILE = get_shard_path(self.EXPORT_FILE, self.SHARD)
+            self.INDEX_FILE = get_shard_path(self.INDEX_FILE, self.SHARD)
+        elif self.SHARD not in (None, 1):
+            raise SystemExit("shard " + str(self.SHARD) + " is set, but shards is not")
+
+        if self.is_partial():
+            if self.PRUNE:
+                raise SystemExit("prune can not be combined with select_*, unselected resources would be deleted")
+            # The parents of the selected rows are found in the catalog instead of being created again
+            self.RECONCILE = True
+
+        if self.CHANGED_SINCE:
+            if self.PRUNE:
+                raise SystemExit("prune can not be combined with changed_since, unchanged resources would be deleted")
+            # The parents of changed rows are found in the catalog instead of being created again
+            self.RECONCILE = True
+
+        self.CATALOG_URL = config.get('catalog_url')
+
+        if self.SIMULATE:
+            # A simulation does not contact the FDP, so it runs without its URL and credentials
+            if self.FDP_URL is None:
+                parts = urlparse(self.CATALOG_URL or "")
+                self.FDP_URL = parts.scheme + "://" + parts.netloc if parts.netloc else "http://simulated-fdp"
+            if self.FDP_PERSISTENT_URL is None:
+                self.FDP_PERSISTENT_URL = self.FDP_URL
+            if self.FDP_USERNAME is None:
+                self.FDP_USERNAME = "simulated"
+            if self.FDP_PASSWORD is None:
+                self.FDP_PASSWORD = "simulated"
+
+        # Check for multiple FDP targets, otherwise the FDP from the environment and catalog_url are the only target
+        if config.get('targets'):
+            for index, target in enumerate(config['targets']):
+                try:
+                    self.TARGETS.append({'name': target.get('name', "target" + str(index + 1)),
+                                         'fdp_url': target['fdp_url'],
+                                         'persistent_url': target.get('persistent_url', target['fdp_url']),
+                                         'catalog_url': target['catalog_url'],
+                                         'username': self.get_credential(target['username_env']),
+                                         'password': self.get_credential(target['password_env'])})
+                except KeyError as error:
+                    raise SystemExit("Target " + str(index + 1) + " in the config file is missing " + str(error))
+            if self.CATALOG_URL is None:
+                self.CATALOG_URL = self.TARGETS[0]['catalog_url']
+        elif self.EXPORT_FILE and None in (self.FDP_URL, self.FDP_USERNAME, self.FDP_PASSWORD, self.FDP_PERSISTENT_URL):
+            # Only export the generated RDF if no FDP is configured
+            pass
+        else:
+            if None in (self.FDP_URL, self.FDP_USERNAME, self.FDP_PASSWORD, self.FDP_PERSISTENT_URL):
+                raise SystemExit("Set the FDP_URL, FDP_USERNAME, FDP_PASSWORD and FDP_PERSISTENT_URL environment "
+                                 "variables")
+            if self.CATALOG_URL is None:
+                raise SystemExit("Set catalog_url in the config file")
+            self.TARGETS.append({'name': "fdp", 'fdp_url': self.FDP_URL,
+                                 'persistent_url': self.FDP_PERSISTENT_URL, 'catalog_url': self.CATALOG_URL,
+                                 'username': self.FDP_USERNAME, 'password': self.FDP_PASSWORD})
+
+
+    def get_credential(self, name):
+        """
+        :param name: Provide name of the environment variable with the credential of a target
+        :return: Value of the environment variable, or a placeholder in a simulation
+        """
+        if self.SIMULATE:
+            return os.environ.get(name, "simulated")
+        return os.environ[name]
+
+    def is_partial(self):
+        """
+        :return: True if only the selected resources are processed
+        """
+        return any(value is not None for value in (self.SELECT_TYPES, self.SELECT_TITLE, self.SELECT_IDENTIFIER,
+                                                    self.SELECT_ROWS))
+
+
+def get_shard_path(path, shard):
+    """
+    :param path: Provide path of a file that every worker of a sharded run writes, or None
+    :param shard: Provide number of the shard of the worker
+    :return: Path with {shard} replaced by the shard number, or with -<shard> added before the extension (and .gz) if
+             the path has no {shard}
+    """
+    if not path:
+        return path
+    if "{shard}" not in path:
+        directory, name = os.path.split(path)
+        stem, extension = os.path.splitext(name)
+        if extension == ".gz":
+            stem, inner_extension = os.path.splitext(stem)
+            extension = inner_extension + extension
+        path = os.path.join(directory, stem + "-{shard}" + extension)
+    return path.replace("{shard}", str(shard))
+
+
+def from_environment(overrides=None):
+    """
+    Read the settings from the config file and base path in the CONFIG_FILE and BASE_PATH environment variables
+
+    :param overrides: Provide dict of config keys and values that replace those of the config file, or None
+    :return: Settings object
+    """
+    return Settings(os.environ['CONFIG_FILE'], os.environ['BASE_PATH'], overrides)
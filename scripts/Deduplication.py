@@ -0,0 +1,170 @@
+import hashlib
+import Log
+
+"""
+De-duplication of the resources of a run. Resources are fingerprinted by their normalised field values, type and
+parent; a resource with the fingerprint of an earlier one is not rendered or uploaded but gets its FDP URL. Resources
+with the same title and parent but other content are title collisions, which are reported.
+"""
+
+logger = Log.get_logger(__name__)
+
+# Fields that link a resource to its place in the FDP instead of describing it, the parent key is compared instead
+IGNORED_FIELDS = ("URL", "PARENT_URL", "CATALOG")
+
+
+def add_unique(resources, title, resource, row_number, keep_duplicates):
+    """
+    Method to add a resource read from a row to the resources of a sheet or CSV file. With keep_duplicates, a row with
+    the title of an earlier row does not replace it but is added under its row number, so the de-duplication can
+    compare them; otherwise the later row replaces the earlier one, as without de-duplication.
+
+    :param resources: Provide dict of resources of the sheet, by title
+    :param title: Provide title of the resource
+    :param resource: Provide resource object
+    :param row_number: Provide number of the row in its sheet or CSV file
+    :param keep_duplicates: Provide True to keep the rows with the title of an earlier row
+    """
+    resources[title if title not in resources or not keep_duplicates else "%s#%d" % (title, row_number)] = resource
+
+
+def normalise(value):
+    """
+    :param value: Provide field value of a resource
+    :return: Value with collapsed whitespace, lists without order and duplicates, linked resources by their title and
+             empty values as None
+    """
+    if isinstance(value, str):
+        return " ".join(value.split()) or None
+    if isinstance(value, (list, tuple, set)):
+        values = {repr(item): item for item in (normalise(item) for item in value) if item is not None}
+        return tuple(values[item] for item in sorted(values)) or None
+    if hasattr(value, "TITLE"):
+        return type(value).__name__, normalise(value.TITLE)
+    return value
+
+
+def get_fields(resource):
+    """
+    :param resource: Provide resource object
+    :return: Dict of field name to normalised value, without the fields that place the resource in the FDP
+    """
+    return {name: normalise(value) for name, value in vars(resource).items() if name not in IGNORED_FIELDS}
+
+
+def fingerprint(resource_type, parent_key, fields):
+    """
+    :param resource_type: Provide the type of resource
+    :param parent_key: Provide the key of the parent resource
+    :param fields: Provide dict of normalised fields of the resource
+    :return: SHA-256 hex digest, equal for resources with the same type, parent and normalised content
+    """
+    content = repr((resource_type, parent_key, sorted(fields.items())))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class Deduplicator:
+    """
+    Class to remove the duplicates of the resources of a run and find the title collisions. A duplicate is an alias of
+    the first resource with its fingerprint; the children of a duplicate are moved to that resource, and are then
+    compared with its children.
+    """
+
+    def __init__(self, collision_check="warn"):
+        """
+        :param collision_check: Provide "warn" to log title collisions or "error" to stop the run
+        """
+        self.COLLISION_CHECK = collision_check
+        self.ALIASES = {}
+        self.COLLISIONS = []
+        self.merged = {}
+
+    def deduplicate(self, entries, sources):
+        """
+        Method to remove the duplicates from the resources, their input rows are added to the sources of the resource
+        they are a duplicate of
+
+        :param entries: Provide list of ResourceEntry objects, parents before their children
+        :param sources: Provide dict of resource key to list of (sheet or file, key) tuples of its input rows
+        :return: List of ResourceEntry objects without duplicates
+        """
+        kept = []
+        by_content = {}
+        by_title = {}
+        for entry in entries:
+            entry.PARENT_KEY = self.ALIASES.get(entry.PARENT_KEY, entry.PARENT_KEY)
+            fields = get_fields(entry.RESOURCE)
+            content = fingerprint(entry.TYPE, entry.PARENT_KEY, fields)
+            if content in by_content:
+                original = by_content[content]
+                self.ALIASES[entry.KEY] = original.KEY
+                sources.setdefault(original.KEY, []).extend(sources.pop(entry.KEY, []))
+                self.merged[entry.TYPE] = self.merged.get(entry.TYPE, 0) + 1
+                logger.debug("%s is a duplicate of %s", entry.KEY, original.KEY)
+                continue
+            by_content[content] = entry
+
+            title = (entry.TYPE, entry.PARENT_KEY, normalise(entry.RESOURCE.TITLE))
+            if title in by_title:
+                first, first_fields = by_title[title]
+                self.add_collision(entry.TYPE, entry.RESOURCE.TITLE, first.KEY + " and " + entry.KEY, first_fields,
+                                   fields)
+            else:
+                by_title[title] = (entry, fields)
+            kept.append(entry)
+        return kept
+
+    def check_linked(self, resource_type, resources):
+        """
+        Method to find the duplicates and title collisions of resources that are linked instead of uploaded, e.g. the
+        organisations of the publishers; resources are linked to the first resource with their title
+
+        :param resource_type: Provide the type of the resources
+        :param resources: Provide dict of resources
+        """
+        by_title = {}
+        for name, resource in resources.items():
+            fields = get_fields(resource)
+            title = normalise(resource.TITLE)
+            if title not in by_title:
+                by_title[title] = (name, fields)
+            elif fields == by_title[title][1]:
+                self.merged[resource_type] = self.merged.get(resource_type, 0) + 1
+            else:
+                self.add_collision(resource_type, resource.TITLE, by_title[title][0] + " and " + name,
+                                   by_title[title][1], fields)
+
+    def add_collision(self, resource_type, title, names, first_fields, fields):
+        """
+        Method to record a title collision with the fields in which the resources differ
+
+        :param resource_type: Provide the type of the resources
+        :param title: Provide the title of the resources
+        :param names: Provide description of the colliding resources
+        :param first_fields: Provide normalised fields of the first resource
+        :param fields: Provide normalised fields of the other resource
+        """
+        differences = sorted(name.lower() for name in set(first_fields) | set(fields)
+                             if first_fields.get(name) != fields.get(name))
+        self.COLLISIONS.append("%s <%s>: %s differ in %s" % (resource_type, title, names, ", ".join(differences)))
+
+    def check(self):
+        """
+        Method to report the duplicates and title collisions, and stop the run on collisions if configured
+        """
+        if self.merged:
+            counts = ["%d %s" % (count, resource_type) for resource_type, count in sorted(self.merged.items())]
+            logger.info("Merged %d duplicate resources: %s", sum(self.merged.values()), ", ".join(counts))
+        for collision in self.COLLISIONS:
+            logger.warning("Title collision: %s", collision)
+        if self.COLLISIONS and self.COLLISION_CHECK == "error":
+            raise SystemExit(str(len(self.COLLISIONS)) + " title collisions in the input, see the log")
+
+    def get_summary(self):
+        """
+        Method to get the de-duplication lines of the run report
+
+        :return: List of summary lines
+        """
+        return ["deduplication: %d duplicates merged, %d title collisions" % (sum(self.merged.values()),
+                                                                              len(self.COLLISIONS))]
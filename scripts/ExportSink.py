@@ -0,0 +1,88 @@
+import gzip
+import threading
+import Canonical
+import Log
+import ResourceEntry
+
+logger = Log.get_logger(__name__)
+
+FORMATS = ("nquads", "trig")
+
+
+def get_format(path, export_format=None):
+    """
+    :param path: Provide path of the export file
+    :param export_format: Provide configured format, or None to use the file extension
+    :return: nquads or trig
+    """
+    if export_format in FORMATS:
+        return export_format
+    name = path[:-3] if path.endswith(".gz") else path
+    return "trig" if name.endswith(".trig") else "nquads"
+
+
+class ExportSink:
+    """
+    Class to write every generated resource as a named graph to one N-Quads or TriG file. The triples of a resource are
+    written in canonical order with canonical blank node labels, so exports of the same metadata are byte for byte the
+    same. Resources are written one by one as they are generated, so memory use does not grow with the number of
+    resources, and writes from several threads are serialized. The graph of a resource and its subject are named by its
+    resource key, and links to other resources in the export use the names of their graphs.
+    """
+
+    def __init__(self, path, export_format=None, catalog_url=None):
+        """
+        :param path: Provide path of the export file, the file is gzipped if the path ends with .gz
+        :param export_format: Provide nquads or trig, or None to use the file extension
+        :param catalog_url: Provide URL that is used for the catalog the resources are part of
+        """
+        self.PATH = path
+        self.FORMAT = get_format(path, export_format)
+        self.CATALOG_URL = catalog_url
+        if path.endswith(".gz"):
+            self.file = gzip.open(path, "wt", encoding="utf-8")
+        else:
+            self.file = open(path, "w", encoding="utf-8")
+        self.lock = threading.Lock()
+        self.resources = 0
+        self.triples = 0
+
+    def write(self, entry):
+        """
+        Method to write a rendered resource as a named graph
+
+        :param entry: Provide rendered ResourceEntry object
+        """
+        name = "<" + ResourceEntry.placeholder(entry.KEY) + ">"
+        # Blank node labels are shared by all graphs in the file, so they are made unique per resource
+        triples = Canonical.canonical_ntriples(entry.get_graph(), entry.KEY)
+        if self.CATALOG_URL:
+            triples = triples.replace("<" + ResourceEntry.placeholder(ResourceEntry.CATALOG_KEY) + ">",
+                                      "<" + self.CATALOG_URL + ">")
+        lines = triples.replace("<" + ResourceEntry.NEW_RESOURCE_URL + ">", name).splitlines()
+        lines = [line for line in lines if line]
+
+        if self.FORMAT == "trig":
+            text = name + " {\n" + "".join(line + "\n" for line in lines) + "}\n"
+        else:
+            # An N-Triples line ends with " .", the graph name goes before it
+            text = "".join(line[:-1] + name + " .\n" for line in lines)
+
+        with self.lock:
+            self.file.write(text)
+            self.resources += 1
+            self.triples += len(lines)
+
+    def close(self):
+        """
+        Method to close the export file
+        """
+        self.file.close()
+        logger.info("Exported %d resources to %s", self.resources, self.PATH)
+
+    def get_summary(self):
+        """
+        :return: List of summary lines
+        """
+        return ["export: %d resources, %d triples in %s (%s)" % (self.resources, self.triples, self.PATH,
+                                                                self.FORMAT)]
@@ -1,101 +1,408 @@
-import Config
+import Log
+import RunReport
+import RateLimiter
 import requests
+import urllib3
 import json
+import logging
+import gzip
+import time
+import random
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 
 
 """
 Interface to interact FDP content
 """
 
+logger = Log.get_logger(__name__)
+
+
+def create_session(pool_size):
+    """
+    Create a session that reuses connections
+
+    :param pool_size: Provide the number of connections to keep per host
+    :return: requests.Session
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(10, pool_size))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class TokenCache:
+    """
+    Authentication tokens shared by all clients in the process, per FDP URL and username. A token is reused until it
+    is older than LIFETIME or the FDP rejects it.
+    """
+    LIFETIME = 3600
+
+    def __init__(self):
+        self.tokens = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, request_token, rejected=None):
+        """
+        :param key: Provide (FDP URL, username)
+        :param request_token: Provide function that requests a new token
+        :param rejected: Provide a token the FDP rejected, it is replaced unless another client already did
+        :return: token
+        """
+        with self.lock:
+            key_lock = self.locks.setdefault(key, threading.Lock())
+        with key_lock:
+            token, token_time = self.tokens.get(key, (None, 0))
+            if token and token != rejected and time.monotonic() - token_time < self.LIFETIME:
+                return token
+            token = request_token()
+            self.tokens[key] = (token, time.monotonic())
+            return token
+
+
+TOKENS = TokenCache()
+
+
+def get_retry_after(failure):
+    """
+    :param failure: Provide response or exception of a failed request
+    :return: Seconds to wait in the Retry-After header of a response, given in seconds or as a date, or None
+    """
+    headers = getattr(failure, "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_connect_error(error):
+    """
+    :param error: Provide exception of a failed request
+    :return: True if the request failed while connecting, so the FDP has not received it
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.ConnectTimeoutError)
+
+
 class FDPClient:
 
     FDP_URL = None
     FDP_ADMIN_USERNAME = "albert.einstein@example.com"
     FDP_ADMIN_PASSWORD = "password"
     FDP_P_URL =None
+    ETAG_CACHE_SIZE = 256
 
-    def __init__(self, fdp_url, username, password, persistent_url):
+    def __init__(self, fdp_url, username, password, persistent_url, config, report=None, session=None):
         self.FDP_URL = fdp_url
         self.FDP_ADMIN_USERNAME = username
         self.FDP_ADMIN_PASSWORD = password
         self.FDP_P_URL = persistent_url
+        self.CONFIG = config
+        if session is None:
+            # Reuse connections and allow one pooled connection per concurrent upload
+            session = create_session(config.MAX_CONCURRENCY)
+        self.session = session
+        self.REPORT = report if report is not None else RunReport.RunReport()
+        self.head_supported = config.EXISTENCE_CHECK == "head"
+        self.etag_cache = OrderedDict()
+        # The cache is shared by the concurrent uploads
+        self.etag_lock = threading.Lock()
+        self.RATE_LIMITER = RateLimiter.TokenBucket(config.RATE_LIMIT, config.RATE_LIMIT_BURST)
+        self.CONCURRENCY_LIMITER = RateLimiter.ConcurrencyLimiter(config.MAX_CONCURRENCY,
+                                                                  config.ADAPTIVE_CONCURRENCY,
+                                                                  config.LATENCY_TARGET,
+                                                                  config.ERROR_RATE_THRESHOLD)
+        self.retries = 0
+        self.lock = threading.Lock()
+        self.REPORT.add_source(self.RATE_LIMITER)
+        self.REPORT.add_source(self.CONCURRENCY_LIMITER)
+        self.REPORT.add_source(self)
+
+    def fdp_get_token(self, rejected=None):
+        """
+        Method to get an authentication token. Tokens are cached in TOKENS and shared with the other clients of the
+        same FDP and user.
+
+        :param rejected: Provide a token the FDP rejected to request a new token
+        :return: token
+        """
+        return TOKENS.get((self.FDP_URL, self.FDP_ADMIN_USERNAME), self.request_token, rejected)
 
-    def fdp_get_token(self):
+    def request_token(self):
+        """
+        Method to request a new authentication token from the FDP
+
+        :return: token
+        """
         url = self.FDP_URL + "/tokens"
         data = {"email": self.FDP_ADMIN_USERNAME, "password": self.FDP_ADMIN_PASSWORD}
         payload = json.dumps(data)
         headers = {
             'Content-Type': "application/json"
         }
-        
-        if Config.DEBUG:
-            print("Sending authentication request:")
-            print("URL:", url)
-            print("headers:", headers)
-            print("payload:", payload)
-
-        response = requests.request("POST", url, data=payload, headers=headers)
-        data = json.loads(response.text)
-        if Config.DEBUG:
-            print("server response:", response)
-            print("response data:", response.text)
+
+        logger.debug("Sending authentication request for %s to %s", self.FDP_ADMIN_USERNAME, url)
+
+        response = self.session.request("POST", url, data=payload, headers=headers)
+        self.REPORT.record("token", len(payload), len(response.content))
+        logger.debug("Authentication response: %s", response)
         try:
-            return data["token"]
+            return json.loads(response.text)["token"]
         except:
             raise SystemError("Error getting authentication token. Is the configuration of the FDP URL, username and password correct? Make sure the URL's don't end with a '/' character.")
-        
 
-    def fdp_create_metadata(self, data, resource_type):
+    def send_authorized(self, operation, method, url, body, headers, max_retries=None, idempotent=True):
+        """
+        Method to send a rate limited request with the cached token. The token is refreshed once if the FDP
+        rejects it, and requests that fail with a 5xx status or a connection error are retried up to max_retries times
+        with an exponential backoff. A request that is not idempotent is only retried if it failed while connecting,
+        since the FDP may have processed it otherwise. Requests the FDP throttles with 429 Too Many Requests are
+        retried after the wait in their Retry-After header. Throttled and failed attempts count as errors for the
+        adaptive concurrency.
 
-        url = self.FDP_URL + "/" + resource_type
+        :param operation: Name of the operation in the run report
+        :param method: HTTP method
+        :param url: Request URL
+        :param body: Request body as bytes or string
+        :param headers: Request headers without authorization
+        :param max_retries: Number of retries of a failed request, max_retries of the config if it is not provided
+        :param idempotent: Provide False for a request that must not be sent twice, e.g. a create
+        :return: response of the last attempt
+        """
+        if max_retries is None:
+            max_retries = self.CONFIG.MAX_RETRIES
         token = self.fdp_get_token()
-        authorization = "Bearer " + token
+        refreshed = False
+        retries = 0
+        while True:
+            headers['Authorization'] = "Bearer " + token
+            self.RATE_LIMITER.acquire()
+            response = None
+            error = None
+            start = time.monotonic()
+            try:
+                # A failed attempt is reported to the concurrency limiter, also when it is retried
+                with self.CONCURRENCY_LIMITER.slot() as result:
+                    response = self.session.request(method, url, data=body, headers=headers)
+                    result["error"] = response.status_code >= 500 or response.status_code == 429
+            except (requests.ConnectionError, requests.Timeout) as request_error:
+                error = request_error
+            # A throttled request has not been processed, so it can always be sent again
+            throttled = response is not None and response.status_code == 429
+            failed = response is None or response.status_code >= 500 or throttled
+            retry = failed and (idempotent or throttled or (error is not None and is_connect_error(error)))
+            self.REPORT.record(operation, len(body), len(response.content) if response is not None else 0,
+                               time.monotonic() - start, failed)
+
+            if response is not None and response.status_code in (401, 403) and not refreshed:
+                token = self.fdp_get_token(rejected=token)
+                refreshed = True
+            elif retry and retries < max_retries:
+                retries += 1
+                self.retry_wait(operation, url, retries, max_retries, error if error is not None else response)
+            elif error is not None:
+                raise error
+            else:
+                return response
+
+    def retry_wait(self, operation, url, retry, max_retries, failure):
+        """
+        Method to wait before retrying a failed request, the wait doubles with every retry and has a random jitter so
+        concurrent uploads do not retry at the same time. It is at least the wait the FDP asks for in a Retry-After
+        header.
+
+        :param operation: Name of the operation in the run report
+        :param url: Request URL
+        :param retry: Number of the retry, starting at 1
+        :param max_retries: Number of retries of the request
+        :param failure: Response or exception of the failed attempt
+        """
+        delay = self.CONFIG.RETRY_BACKOFF * 2 ** (retry - 1) * random.uniform(0.5, 1.5)
+        retry_after = get_retry_after(failure)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        with self.lock:
+            self.retries += 1
+        logger.warning("%s request to %s failed (%s), retry %d of %d in %.1f s", operation, url, failure, retry,
+                       max_retries, delay)
+        time.sleep(delay)
+
+    def fdp_create_metadata(self, data, resource_type, find_created=None):
+        """
+        Method to create and publish metadata in the FDP. A create request that fails after the FDP may have
+        received it is only sent again if find_created does not find the resource it created.
+
+        :param data: Provide Turtle payload
+        :param resource_type: Provide the type of resource
+        :param find_created: Provide function that returns the URL of the resource if a failed request created it, or
+                             None; without it a failed create request is not sent again
+        :return: URL of the resource
+        """
+
+        url = self.FDP_URL + "/" + resource_type
         headers = {
-            'Content-Type': "text/turtle",
-            'Authorization': authorization
+            'Content-Type': "text/turtle"
         }
         if not isinstance(data, str):
             data = data.decode("utf-8")
+        body = data.encode('utf-8')
+        if self.CONFIG.COMPRESS_PAYLOADS and len(body) > self.CONFIG.COMPRESSION_THRESHOLD:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = "gzip"
 
-        if Config.DEBUG:
-            print("Sending POST request:")
-            print("URL:", url)
-            print("authorization:", authorization)
-            print("headers:", headers)
-            print("payload:", data)
+        logger.debug("Sending POST request to %s (%d bytes, %s)", url, len(body),
+                     headers.get('Content-Encoding', "uncompressed"))
 
-        response = requests.request("POST", url, data=data.encode('utf-8'), headers=headers)
-        
-        if Config.DEBUG:
-            print("server response:", response)
-            print("response data:", response.text)
+        retries = 0
+        while True:
+            error = None
+            try:
+                response = self.send_authorized("create", "POST", url, body, headers, idempotent=False)
+            except (requests.ConnectionError, requests.Timeout) as request_error:
+                response = None
+                error = request_error
+            if (response is not None and response.status_code < 500) or find_created is None \
+                    or retries >= self.CONFIG.MAX_RETRIES:
+                break
+            retries += 1
+            self.retry_wait("create", url, retries, self.CONFIG.MAX_RETRIES, error if error is not None else response)
+            resource_url = find_created()
+            if resource_url is not None:
+                logger.warning("The failed create request to %s created %s, it is not sent again", url, resource_url)
+                self.fdp_publish_metadata(resource_url.replace(self.FDP_P_URL, self.FDP_URL))
+                return resource_url
+        if error is not None:
+            raise error
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Server response: %s %s", response, response.text)
 
         try:
             resource_url = response.headers["Location"]
         except:
-            raise SystemError("Error getting location url after sending RDF. Did the RDF fail validation in the FDP? (Then check the FPD logs)")
+            raise SystemError("Error getting location url after sending RDF (status " + str(response.status_code) + "). Did the RDF fail validation in the FDP? (Then check the FPD logs)")
 
         self.fdp_publish_metadata(resource_url.replace(self.FDP_P_URL, self.FDP_URL))
 
         return resource_url
 
+    def fdp_update_metadata(self, url, data):
+        """
+        Method to replace the metadata of an existing resource
+
+        :param url: Provide metadata URL
+        :param data: Provide Turtle payload about the resource at the URL
+        """
+        headers = {
+            'Content-Type': "text/turtle"
+        }
+        logger.debug("Sending PUT request to %s", url)
+        response = self.send_authorized("update", "PUT", url.replace(self.FDP_P_URL, self.FDP_URL),
+                                        data.encode('utf-8'), headers)
+        if not 200 <= response.status_code < 300:
+            raise SystemError("Error updating <" + url + "> (status " + str(response.status_code) + "). Did the RDF "
+                              "fail validation in the FDP? (Then check the FPD logs)")
+
     def fdp_publish_metadata(self, url):
-        token = self.fdp_get_token()
-        authorization = "Bearer " + token
         state_url = url + "/meta/state"
         data = {"current": "PUBLISHED"}
         headers = {
-            'Content-Type': "application/json",
-            'Authorization': authorization
+            'Content-Type': "application/json"
         }
         payload = json.dumps(data)
-        response = requests.request("PUT", state_url, data=payload, headers=headers)
-        print(response)
+        response = self.send_authorized("publish", "PUT", state_url, payload, headers)
+        logger.debug("Publish response for %s: %s", url, response)
+        if not 200 <= response.status_code < 300:
+            raise SystemError("Error publishing <" + url + "> (status " + str(response.status_code) + "), the metadata "
+                              "was created but is not published")
+
+    def fdp_delete_metadata(self, url):
+        """
+        Method to delete metadata from the FDP
+
+        :param url: Provide metadata URL
+        :return: response
+        """
+        logger.debug("Sending DELETE request to %s", url)
+        # The pruner retries failed deletions itself
+        return self.send_authorized("delete", "DELETE", url.replace(self.FDP_P_URL, self.FDP_URL), b"", {},
+                                    max_retries=0)
+
+    def fdp_get_metadata(self, url):
+        """
+        Method to get the metadata of a resource as Turtle
+
+        :param url: Provide metadata URL
+        :return: Turtle string, or None if the metadata does not exist
+        """
+        start = time.monotonic()
+        response = self.session.request("GET", url.replace(self.FDP_P_URL, self.FDP_URL),
+                                        headers={'Accept': "text/turtle"})
+        self.REPORT.record("crawl", 0, len(response.content), time.monotonic() - start,
+                           response.status_code >= 500)
+        if response.status_code != 200:
+            return None
+        return response.text
 
     def does_metadata_exists(self, url):
-        response = requests.request("GET", url)
+        """
+        Method to check whether metadata exists in the FDP. A HEAD request is used when the server supports it,
+        otherwise a conditional GET is sent with the ETag of an earlier response so unchanged metadata is not
+        downloaded again.
 
-        if response.status_code == 200:
-            return True
-        else:
+        :param url: Provide metadata URL
+        :return: True if the metadata exists
+        """
+        if self.head_supported:
+            response = self.session.request("HEAD", url, allow_redirects=True)
+            self.REPORT.record("exists", 0, 0)
+            if response.status_code not in (405, 501):
+                return response.status_code == 200
+            # Server does not allow HEAD, use conditional GET from now on
+            self.head_supported = False
+
+        headers = {'Accept': "text/turtle"}
+        with self.etag_lock:
+            etag = self.etag_cache.get(url)
+        if etag:
+            headers['If-None-Match'] = etag
+
+        response = self.session.request("GET", url, headers=headers)
+        self.REPORT.record("exists", 0, len(response.content))
+
+        with self.etag_lock:
+            if response.status_code == 304:
+                # The entry may have been evicted by another upload in the meantime
+                if url in self.etag_cache:
+                    self.etag_cache.move_to_end(url)
+                return True
+            if response.status_code == 200:
+                if response.headers.get("ETag"):
+                    self.etag_cache[url] = response.headers["ETag"]
+                    self.etag_cache.move_to_end(url)
+                    if len(self.etag_cache) > self.ETAG_CACHE_SIZE:
+                        self.etag_cache.popitem(last=False)
+                return True
+            self.etag_cache.pop(url, None)
             return False
+
+    def get_summary(self):
+        """
+        Method to get the retry lines of the run report
+
+        :return: List of summary lines
+        """
+        return ["retries: %d (max %d per request)" % (self.retries, self.CONFIG.MAX_RETRIES)]
@@ -0,0 +1,180 @@
+import gzip
+import json
+import math
+import random
+import threading
+import time
+import uuid
+import ResourceEntry
+from rdflib import Graph, URIRef
+from rdflib.namespace import DCTERMS
+from urllib.parse import urlparse
+
+
+"""
+In-process stand-in for a FAIR Data Point, used to simulate a run without network access
+"""
+
+
+class FakeResponse:
+    """
+    Minimal response object with the attributes of requests.Response used by FDPClient
+    """
+
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def __repr__(self):
+        return "<Response [%d]>" % self.status_code
+
+
+class FakeFDP:
+    """
+    Fake FDP that accepts metadata, issues Location headers and applies a configurable latency and error
+    distribution. It can be used in place of a requests.Session by FDPClient.
+    """
+
+    def __init__(self, fdp_url, existing_urls=(), latency=0.2, latency_stddev=0.05, bandwidth=0,
+                 error_rate=0.0, seed=None):
+        """
+        :param fdp_url: URL under which new metadata is created
+        :param existing_urls: URLs of metadata that exists before the run, e.g. the catalog
+        :param latency: Mean latency of a request in seconds
+        :param latency_stddev: Standard deviation of the latency in seconds, latencies are log-normally distributed
+        :param bandwidth: Bytes per second used to add a transfer time to each request (0 disables this)
+        :param error_rate: Fraction of create, update, publish and delete requests answered with 503 Service Unavailable
+        :param seed: Seed of the random generator, to make simulations reproducible
+        """
+        self.fdp_url = fdp_url.rstrip("/")
+        self.latency = latency
+        self.latency_stddev = latency_stddev
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.resources = {urlparse(url).path: b"" for url in existing_urls if url}
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        """
+        Method with the signature of requests.Session.request
+
+        :return: FakeResponse
+        """
+        headers = headers or {}
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        data = data or b""
+        response = self.handle(method, urlparse(url).path, data, headers)
+        self.wait(len(data) + len(response.content))
+        return response
+
+    def wait(self, transferred_bytes):
+        """
+        Method to sleep for a sampled latency plus the transfer time of the request
+
+        :param transferred_bytes: Number of bytes sent and received
+        """
+        with self.lock:
+            delay = 0.0
+            if self.latency > 0:
+                # Log-normal distribution with the configured mean and standard deviation
+                sigma = math.sqrt(math.log(1 + (self.latency_stddev / self.latency) ** 2))
+                delay = self.random.lognormvariate(math.log(self.latency) - sigma ** 2 / 2, sigma)
+        if self.bandwidth:
+            delay += transferred_bytes / float(self.bandwidth)
+        if delay > 0:
+            time.sleep(delay)
+
+    def fail(self):
+        """
+        :return: True if the current write request should fail
+        """
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def handle(self, method, path, data, headers):
+        """
+        Method to answer a request like the FDP would
+
+        :return: FakeResponse
+        """
+        if method == "POST" and path.endswith("/tokens"):
+            return FakeResponse(200, json.dumps({"token": "simulated"}).encode("utf-8"))
+
+        if method == "POST":
+            if self.fail():
+                return FakeResponse(503)
+            if headers.get("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            resource_type = path.strip("/").split("/")[-1]
+            location = self.fdp_url + "/" + resource_type + "/" + str(uuid.uuid4())
+            graph = Graph()
+            try:
+                graph.parse(data=data.decode("utf-8"), format="turtle")
+            except Exception:
+                return FakeResponse(400)
+            for triple in list(graph.triples((URIRef(ResourceEntry.NEW_RESOURCE_URL), None, None))):
+                graph.remove(triple)
+                graph.add((URIRef(location), triple[1], triple[2]))
+            parent = graph.value(URIRef(location), DCTERMS.isPartOf)
+            with self.lock:
+                self.resources[urlparse(location).path] = graph.serialize(format="turtle").encode("utf-8")
+                if parent is not None:
+                    self.children.setdefault(urlparse(str(parent)).path, []).append(location)
+            return FakeResponse(201, headers={"Location": location})
+
+        if method == "PUT" and path.endswith("/meta/state"):
+            if self.fail():
+                return FakeResponse(503)
+            resource_path = path[:-len("/meta/state")]
+            if resource_path not in self.resources:
+                return FakeResponse(404)
+            return FakeResponse(200)
+
+        if method == "PUT":
+            if self.fail():
+                return FakeResponse(503)
+            graph = Graph()
+            try:
+                graph.parse(data=data.decode("utf-8"), format="turtle")
+            except Exception:
+                return FakeResponse(400)
+            with self.lock:
+                if path not in self.resources:
+                    return FakeResponse(404)
+                self.resources[path] = graph.serialize(format="turtle").encode("utf-8")
+            return FakeResponse(200)
+
+        if method in ("GET", "HEAD"):
+            with self.lock:
+                body = self.resources.get(path)
+                children = list(self.children.get(path, ()))
+            if body is None:
+                return FakeResponse(404)
+            if children:
+                # Children are listed in an LDP container like in the FDP
+                body += ("\n<%s#children> <http://www.w3.org/ns/ldp#contains> %s .\n"
+                         % (self.fdp_url + path, ", ".join("<" + child + ">" for child in children))).encode("utf-8")
+            etag = '"%s"' % uuid.uuid5(uuid.NAMESPACE_URL, path + "#" + str(len(children)))
+            if method == "GET" and headers.get("If-None-Match") == etag:
+                return FakeResponse(304, headers={"ETag": etag})
+            return FakeResponse(200, body if method == "GET" else b"", {"ETag": etag})
+
+        if method == "DELETE":
+            if self.fail():
+                return FakeResponse(503)
+            with self.lock:
+                existed = self.resources.pop(path, None) is not None
+                for children in self.children.values():
+                    if self.fdp_url + path in children:
+                        children.remove(self.fdp_url + path)
+            return FakeResponse(204 if existed else 404)
+
+        return FakeResponse(405)
@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import FDPClient
+import Log
+from RateLimiter import TokenBucket
+
+logger = Log.get_logger(__name__)
+
+# Resource attributes with URLs that should resolve
+URL_ATTRIBUTES = ("LANDINGPAGE", "LANDING_PAGE", "LOGO", "ACCESSURL", "ACCESS_URL", "DOWNLOADURL", "DOWNLOAD_URL",
+                  "ENDPOINTURL", "ENDPOINTDESCRIPTION")
+
+
+def collect_urls(entries):
+    """
+    :param entries: Provide list of ResourceEntry objects
+    :return: Dict of every distinct http(s) URL to the list of (type, title, attribute) tuples that use it
+    """
+    urls = {}
+    for entry in entries:
+        values = vars(entry.RESOURCE)
+        for attribute in URL_ATTRIBUTES:
+            value = values.get(attribute)
+            for url in (value if isinstance(value, list) else [value]):
+                if isinstance(url, str) and url.strip().startswith(("http://", "https://")):
+                    urls.setdefault(url.strip(), []).append((entry.TYPE, entry.RESOURCE.TITLE, attribute.lower()))
+    return urls
+
+
+class LinkChecker:
+    """
+    Class to check whether URLs resolve, with HEAD requests from a bounded pool of workers and a rate limit per host.
+    Working links are kept in a result cache file until their result is older than the TTL, broken links are checked
+    again on every run.
+    """
+
+    def __init__(self, concurrency=32, host_rate=5, timeout=10, cache_file=None, ttl=24 * 3600, session=None):
+        """
+        :param concurrency: Provide the number of URLs checked at the same time
+        :param host_rate: Provide the number of requests per second per host, 0 disables the limit
+        :param timeout: Provide timeout of a request in seconds
+        :param cache_file: Provide path of the result cache file, or None
+        :param ttl: Provide number of seconds a cached result is used
+        :param session: Provide requests session, or None to create one
+        """
+        self.CONCURRENCY = max(1, concurrency)
+        self.HOST_RATE = host_rate
+        self.TIMEOUT = timeout
+        self.CACHE_FILE = cache_file
+        self.TTL = ttl
+        self.SESSION = session if session is not None else FDPClient.create_session(self.CONCURRENCY)
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.cache = self.load_cache()
+        self.results = {}
+        self.cached = 0
+        self.seconds = 0
+
+    def load_cache(self):
+        """
+        :return: Dict of URL to cached result that is not older than the TTL
+        """
+        if not self.CACHE_FILE or not os.path.isfile(self.CACHE_FILE):
+            return {}
+        try:
+            with open(self.CACHE_FILE, encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+        except ValueError as error:
+            logger.warning("Ignoring unreadable link check cache %s: %s", self.CACHE_FILE, error)
+            return {}
+        now = time.time()
+        return {url: result for url, result in cache.items() if now - result["checked"] < self.TTL}
+
+    def save_cache(self):
+        """
+        Method to write the working links to the result cache file
+        """
+        if not self.CACHE_FILE:
+            return
+        cache = dict(self.cache)
+        cache.update({url: result for url, result in self.results.items() if result["ok"]})
+        # Write to a temporary file first so parallel runs never read a partial cache
+        directory = os.path.dirname(os.path.abspath(self.CACHE_FILE))
+        handle, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(handle, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file)
+        os.replace(temp_path, self.CACHE_FILE)
+
+    def get_bucket(self, url):
+        """
+        :param url: Provide URL
+        :return: TokenBucket of the host of the URL
+        """
+        host = urlsplit(url).netloc.lower()
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.HOST_RATE)
+            return self.buckets[host]
+
+    def check(self, urls):
+        """
+        Method to check URLs, every distinct URL is requested at most once
+
+        :param urls: Provide iterable of URLs
+        :return: Dict of URL to result dict with ok, status, error and checked
+        """
+        start = time.monotonic()
+        pending = []
+        for url in dict.fromkeys(urls):
+            if url in self.cache:
+                self.results[url] = self.cache[url]
+                self.cached += 1
+            else:
+                pending.append(url)
+
+        with ThreadPoolExecutor(max_workers=self.CONCURRENCY) as executor:
+            for url, result in zip(pending, executor.map(self.check_url, pending)):
+                self.results[url] = result
+
+        self.seconds = time.monotonic() - start
+        self.save_cache()
+        return self.results
+
+    def check_url(self, url):
+        """
+        Method to check one URL with a HEAD request, or a GET request if the server does not support HEAD
+
+        :param url: Provide URL
+        :return: Result dict
+        """
+        self.get_bucket(url).acquire()
+        result = {"ok": False, "status": None, "error": None, "checked": time.time()}
+        try:
+            response = self.SESSION.head(url, allow_redirects=True, timeout=self.TIMEOUT)
+            if response.status_code in (403, 405, 501):
+                # Some servers refuse HEAD requests, only the status of the GET response is read
+                self.get_bucket(url).acquire()
+                response = self.SESSION.get(url, allow_redirects=True, timeout=self.TIMEOUT, stream=True)
+                response.close()
+            result["status"] = response.status_code
+            result["ok"] = response.status_code < 400
+            if not result["ok"]:
+                result["error"] = "HTTP %d" % response.status_code
+        except Exception as exception:
+            result["error"] = exception.__class__.__name__ + ": " + str(exception)
+        logger.debug("Checked %s: %s", url, result["status"] if result["ok"] else result["error"])
+        return result
+
+    def get_broken(self):
+        """
+        :return: Dict of URL to result of the links that do not resolve
+        """
+        return {url: result for url, result in self.results.items() if not result["ok"]}
+
+    def get_summary(self):
+        """
+        Method to get the link check lines of the run report
+
+        :return: List of summary lines
+        """
+        return ["link check: %d URLs, %d broken, %d from the cache, %.2f s (concurrency %d)"
+                % (len(self.results), len(self.get_broken()), self.cached, self.seconds, self.CONCURRENCY)]
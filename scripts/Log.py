@@ -0,0 +1,107 @@
+import json
+import logging
+import sys
+import threading
+
+
+"""
+Logging setup of the populator. Every module gets its own logger below the "fdpp" logger, warnings about the input
+can be reported once per run and generated payloads can be written to a separate file.
+"""
+
+ROOT_LOGGER_NAME = "fdpp"
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+_warned = set()
+_warned_lock = threading.Lock()
+_payload_file = None
+_payload_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats log records as one JSON object per line
+    """
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record), "level": record.levelname,
+                 "logger": record.name, "message": record.getMessage()}
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def setup(level="INFO", log_format="text", payload_file=None):
+    """
+    Configure the populator loggers
+
+    :param level: Provide log level (DEBUG, INFO, WARNING or ERROR)
+    :param log_format: Provide "text" or "json"
+    :param payload_file: Provide path of the file the generated RDF is written to, or None to not write it
+    """
+    global _payload_file
+
+    handler = logging.StreamHandler(sys.stdout)
+    if log_format == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.handlers = [handler]
+    root.setLevel(level)
+    root.propagate = False
+
+    if _payload_file is not None:
+        _payload_file.close()
+        _payload_file = None
+    if payload_file:
+        _payload_file = open(payload_file, "w", encoding="utf-8")
+
+
+def get_logger(name):
+    """
+    :param name: Provide module name
+    :return: Logger of the module
+    """
+    return logging.getLogger(ROOT_LOGGER_NAME + "." + name)
+
+
+def warn_once(logger, message):
+    """
+    Log a warning only the first time it occurs in a run
+
+    :param logger: Provide logger
+    :param message: Provide warning message
+    """
+    if message in _warned:
+        return
+    with _warned_lock:
+        if message in _warned:
+            return
+        _warned.add(message)
+    logger.warning(message)
+
+
+def payloads_enabled():
+    """
+    :return: True if generated payloads are written to a file
+    """
+    return _payload_file is not None
+
+
+def dump_payload(resource_type, title, payload):
+    """
+    Write a generated payload to the payload file, if one is configured
+
+    :param resource_type: Provide the type of resource
+    :param title: Provide the title of the resource
+    :param payload: Provide the serialized RDF
+    """
+    if _payload_file is None:
+        return
+    if not isinstance(payload, str):
+        payload = payload.decode("utf-8")
+    with _payload_lock:
+        _payload_file.write("# " + resource_type + ": " + str(title) + "\n" + payload + "\n")
+        _payload_file.flush()
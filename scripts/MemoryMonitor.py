@@ -0,0 +1,150 @@
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+"""
+Memory accounting of the phases of a run. With tracing on, every phase records the peak of the memory allocated by
+Python and the sites that allocated the most, and the resident set size (RSS) of the process is sampled at the
+boundaries of the phases and at checkpoints within them. With a budget the run stops at the first sample above it.
+"""
+
+MB = 1024 * 1024
+
+
+def get_rss():
+    """
+    :return: Resident set size of the process in bytes, or None if the platform does not report it
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # Other platforms only report the peak, in bytes on macOS and in KB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+class MemoryMonitor:
+    """
+    Class to account the memory use of the phases of a run. Phases can be nested, e.g. the workbook in the read phase;
+    a nested phase is named after its parent, e.g. read/workbook. If neither tracing nor a budget is configured the
+    phases and checkpoints do nothing.
+    """
+
+    def __init__(self, tracing=False, budget=None, top=10):
+        """
+        :param tracing: Provide True to trace the Python allocations with tracemalloc
+        :param budget: Provide maximum RSS in bytes, or None for no limit
+        :param top: Provide number of allocation sites that are reported per phase
+        """
+        self.TRACING = tracing
+        self.BUDGET = budget
+        self.TOP = top
+        self.ENABLED = tracing or budget is not None
+        self.stack = []
+        self.phases = []
+        if self.TRACING and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def phase(self, name):
+        """
+        :param name: Provide name of the phase
+        :return: Context manager that accounts the memory use of the code in its block
+        """
+        if not self.ENABLED:
+            return contextlib.nullcontext()
+        return self.account(name)
+
+    @contextlib.contextmanager
+    def account(self, name):
+        """
+        Context manager that accounts the memory use of its block as a phase
+        """
+        current = {"name": "/".join([parent["name"] for parent in self.stack[-1:]] + [name]), "peak": 0,
+                   "rss": [], "start": time.monotonic(), "snapshot": None, "top": []}
+        if self.TRACING:
+            self.fold_peak()
+            current["snapshot"] = tracemalloc.take_snapshot()
+            self.reset_peak()
+        self.stack.append(current)
+        self.checkpoint("start")
+        try:
+            yield
+            self.checkpoint("end")
+        finally:
+            self.stack.pop()
+            if self.TRACING:
+                current["peak"] = max(current["peak"], tracemalloc.get_traced_memory()[1])
+                # The allocations of the accounting itself are left out
+                ignored = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+                statistics = tracemalloc.take_snapshot().filter_traces(ignored).compare_to(current["snapshot"],
+                                                                                           "lineno")
+                current["top"] = [statistic for statistic in statistics[:self.TOP] if statistic.size_diff > 0]
+                current["snapshot"] = None
+                if self.stack:
+                    self.stack[-1]["peak"] = max(self.stack[-1]["peak"], current["peak"])
+                self.reset_peak()
+            current["seconds"] = time.monotonic() - current["start"]
+            self.phases.append(current)
+
+    def fold_peak(self):
+        """
+        Method to add the traced peak so far to the running phase before a nested phase resets it
+        """
+        if self.stack:
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        self.reset_peak()
+
+    @staticmethod
+    def reset_peak():
+        # Python 3.8 cannot reset the peak, there the peak of a phase is the peak of the run so far
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def checkpoint(self, label):
+        """
+        Method to sample the RSS in the running phase and stop the run if it is above the budget
+
+        :param label: Provide description of the point in the phase, used in the error
+        """
+        if not self.ENABLED or not self.stack:
+            return
+        rss = get_rss()
+        if rss is None:
+            return
+        for running in self.stack:
+            running["rss"].append(rss)
+        if self.BUDGET is not None and rss > self.BUDGET:
+            raise SystemExit("The memory budget of %.0f MB is exceeded in the %s phase (%s): RSS %.1f MB"
+                             % (self.BUDGET / MB, self.stack[-1]["name"], label, rss / MB))
+
+    def get_summary(self):
+        """
+        :return: List of summary lines with the memory use of every phase
+        """
+        if not self.ENABLED:
+            return []
+        lines = ["memory per phase" + (" (budget %.0f MB RSS)" % (self.BUDGET / MB) if self.BUDGET else "") + ":"]
+        for phase in self.phases:
+            line = "  %-16s %7.2f s" % (phase["name"], phase["seconds"])
+            if phase["rss"]:
+                line += "  RSS %8.1f MB -> %8.1f MB, max %8.1f MB" % (phase["rss"][0] / MB, phase["rss"][-1] / MB,
+                                                                     max(phase["rss"]) / MB)
+            if self.TRACING:
+                line += "  traced peak %8.1f MB" % (phase["peak"] / MB)
+            lines.append(line)
+            for statistic in phase["top"]:
+                frame = statistic.traceback[0]
+                lines.append("    %+9.1f KB in %6d blocks  %s:%d" % (statistic.size_diff / 1024, statistic.count_diff,
+                                                                    frame.filename, frame.lineno))
+        return lines
@@ -1,9 +1,23 @@
-import FDPClient
-import Config
+import Log
 import Utils
-from warnings import warn
+import ResourceEntry
+import UploadTarget
+import ExportSink
+import ChangeDetector
+import Vocabulary
+import LinkChecker
+import RDFStore
+import Profiler
+import MemoryMonitor
+import Selection
+import Sharding
+import Deduplication
 from template_readers import FDPTemplateReader, VPTemplateReader
-import uuid
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = Log.get_logger(__name__)
 
 
 
@@ -11,146 +25,517 @@ class Populator:
     """
     Class contents methods to extract content from the input CSV files and methods to populate FDP with content.
     """
-    FDP_CLIENT = FDPClient.FDPClient(Config.FDP_URL, Config.FDP_USERNAME, Config.FDP_PASSWORD,
-                                     Config.FDP_PERSISTENT_URL)
     UTILS = Utils.Utils()
 
-    def __init__(self):
+    def __init__(self, config, session=None, profiler=None):
         """
         This __init__ method exacts datasets and distribution objects from the input CSV files. These objects are used to
         create metadata entries in the FAIR Data Point.
+
+        :param config: Provide Settings object of the run
+        :param session: Provide requests session shared with other runs, or None to create one per target
+        :param profiler: Provide Profiler object to profile the phases of the run, or None
         """
+        self.START_TIME = time.monotonic()
+        self.CONFIG = config
+        self.PROFILER = profiler if profiler is not None else Profiler.Profiler()
+        self.MEMORY = MemoryMonitor.MemoryMonitor(config.MEMORY_ACCOUNTING, config.MEMORY_BUDGET, config.MEMORY_TOP)
+        self.TARGETS = [UploadTarget.UploadTarget(target['name'], target['fdp_url'], target['username'],
+                                                  target['password'], target['persistent_url'],
+                                                  target['catalog_url'], config, session)
+                        for target in config.TARGETS]
+        self.ENTRIES = []
+        self.KEYS = set()
+        self.CATALOG_KEYS = {}
+        self.SOURCES = {}
+        self.CHANGES = None
+        if config.CHANGED_SINCE:
+            self.CHANGES = ChangeDetector.ChangeDetector(config.CHANGED_SINCE, config.CHANGE_KEY_COLUMN)
+        self.DEDUPLICATOR = Deduplication.Deduplicator(config.COLLISION_CHECK) if config.DEDUPLICATE else None
+        self.SELECTION = None
+        if config.is_partial():
+            self.SELECTION = Selection.Selection(config.SELECT_TYPES, config.SELECT_TITLE, config.SELECT_IDENTIFIER,
+                                                 config.SELECT_ROWS)
 
-        # Read FDP templates and write to FDP if configured to do this
-        if Config.DATASET_INPUT_FILE != None and Config.DISTRIBUTION_INPUT_FILE != None:
-            # Get dataset and distribution data
-            fdp_template_reader = FDPTemplateReader.FDPTemplateReader()
-            datasets = fdp_template_reader.get_datasets()
-            distributions = fdp_template_reader.get_distributions()
-
-            # Populate FDP with datasets
-            for dataset_name, dataset in datasets.items():
-                dataset_url = self.create_resource(dataset, "dataset")
-                # Populate FDP with distribution(s) as child to dataset
-                for distribution_name, distribution in distributions.items():
-                    if distribution.DATASET_NAME == dataset_name:
-                        distribution.PARENT_URL = dataset_url
-
-                        # This logic is required since both download and access URLs are captured in same row
-                        download_url = distribution.DOWNLOAD_URL
-                        distribution_name = distribution.TITLE
-                        if distribution.ACCESS_URL:
-                            distribution.TITLE = "Access distribution of : " + distribution_name
-                            distribution.DOWNLOAD_URL = None
-                            self.create_resource(distribution, "distribution")
-
-                        if download_url:
-                            distribution.TITLE = "Downloadable distribution of : " + distribution_name
-                            distribution.ACCESS_URL = None
-                            distribution.DOWNLOAD_URL = download_url
-                            self.create_resource(distribution, "distribution")
-
-        # Read VP templates and write to FDP if configured to do this
-        if Config.EJP_VP_INPUT_FILE != None:
-            # Read the excel template
-            vp_template_reader = VPTemplateReader.VPTemplateReader()
-            vp_template_reader.check_template_version()
-            organisations = vp_template_reader.get_organisations()
-            biobanks = vp_template_reader.get_biobanks()
-            patientregistries = vp_template_reader.get_patientregistries()
-            datasets = vp_template_reader.get_datasets()
-            distributions = vp_template_reader.get_distributions()
-            dataservices = vp_template_reader.get_dataservices()
-
-            warn("Multiple descriptions for a resource are now allowed in the implementation", Warning)
-            warn("PopulationCoverage in the dataset sheet is not used", Warning)
-
-            # Create biobank entries
-            for biobank_name, biobank in biobanks.items():
-                # Link organisation
-                for organisation_name, organisation in organisations.items():
-                    if biobank.PUBLISHER == organisation.TITLE:
-                        biobank.PUBLISHER = organisation.URL # TODO: replace this with the whole blank node
-                
-                # Create entry
-                biobank.URL = self.create_resource(biobank, "biobank")
-
-            # Create patient registry entries
-            for patientregistry_name, patientregistry in patientregistries.items():
-                # Link organisation
-                for organisation_name, organisation in organisations.items():
-                    if patientregistry.PUBLISHER == organisation.TITLE:
-                        patientregistry.PUBLISHER = organisation.URL # TODO: replace this with the whole blank node
-
-                # Create entry
-                patientregistry.URL = self.create_resource(patientregistry, "patientregistry")
-
-            # Create datasets
-            for dataset_name, dataset in datasets.items():
-                # Link organisation
-                for organisation_name, organisation in organisations.items():
-                    if dataset.PUBLISHER == organisation.TITLE:
-                        dataset.PUBLISHER = organisation.get_blank_node()
-
-                # Create entry
-                dataset.URL = self.create_resource(dataset, "dataset")
-
-            # Create distributions
-            for distribution_name, distribution in distributions.items():
-                # Link organisation
-                for organisation_name, organisation in organisations.items():
-                    if distribution.PUBLISHER == organisation.TITLE:
-                        distribution.PUBLISHER = organisation.get_blank_node()
+        # Read the input files, resources are linked to their parents and publishers while they are read
+        with self.PROFILER.phase("read"), self.MEMORY.phase("read"):
+            # Read the catalogs that are created in the FDP
+            if self.CONFIG.CATALOG_INPUT_FILE != None:
+                self.add_catalogs(FDPTemplateReader.FDPTemplateReader(self.CONFIG).get_catalogs(),
+                                  self.CONFIG.CATALOG_INPUT_FILE)
+
+            # Read FDP templates and write to FDP if configured to do this
+            if self.CONFIG.DATASET_INPUT_FILE != None and self.CONFIG.DISTRIBUTION_INPUT_FILE != None:
+                self.add_fdp_template_resources()
+
+            # Read VP templates and write to FDP if configured to do this
+            if self.CONFIG.EJP_VP_INPUT_FILE != None:
+                self.add_vp_template_resources()
 
-                # Link dataset
-                for dataset_name, dataset in datasets.items():
-                    if distribution.DATASET_TITLE == dataset.TITLE:
-                        distribution.PARENT_URL = dataset.URL
+            if self.SELECTION is not None:
+                self.SELECTION.log_summary()
+                # Only the catalogs of the selected resources are created
+                parent_keys = {entry.PARENT_KEY for entry in self.ENTRIES}
+                self.ENTRIES = [entry for entry in self.ENTRIES if entry.TYPE != "catalog" or entry.KEY in parent_keys]
 
-                # Create entry
-                distribution.URL = self.create_resource(distribution, "distribution")
+        self.LINK_CHECKER = None
+        with self.PROFILER.phase("check"), self.MEMORY.phase("check"):
+            # Identical resources are uploaded once, title collisions are reported before anything is uploaded
+            if self.DEDUPLICATOR is not None:
+                self.ENTRIES = self.DEDUPLICATOR.deduplicate(self.ENTRIES, self.SOURCES)
+                self.DEDUPLICATOR.check()
 
-            # Create dataservices
-            for dataservice_name, dataservice in dataservices.items():
-                # Link datasets
-                # for dataset_name, dataset in datasets.items():
-                #     if dataset.TITLE in dataservice.DATASET_NAMES:
-                #         dataservice.DATASET_URLS.append(dataset.URL)
+            # Only process the resources whose rows changed since the configured revision
+            if self.CHANGES is not None:
+                self.select_changed()
 
-                # Link organisation
-                for organisation_name, organisation in organisations.items():
-                    if dataservice.PUBLISHER == organisation.TITLE:
-                        dataservice.PUBLISHER = organisation.URL # TODO: replace this with the whole blank node
+            # Only process the shard of this worker in a sharded run
+            self.PLAN_DIGEST = None
+            if self.CONFIG.SHARDS > 1:
+                self.select_shard()
 
-                # Create entry
-                dataservice.URL = self.create_resource(dataservice, "dataservice")
+            if self.CONFIG.VOCABULARY_INDEX:
+                self.check_vocabularies()
 
-    def create_resource(self, resource, resource_type):
+            if self.CONFIG.LINK_CHECK != "off":
+                self.check_links()
+
+        # Render every resource once, the parent URLs are filled in per target during the upload. A resource is
+        # exported as soon as it is rendered, and without targets its payload is released right after, so an export
+        # does not keep the payloads of the whole input in memory
+        self.STORE = RDFStore.RDFStore() if config.RDF_STORE else None
+        self.EXPORT = None
+        if config.EXPORT_FILE:
+            # Every worker of a sharded run exports its own shard
+            export_file = config.EXPORT_FILE.replace("{shard}", str(config.SHARD or 1))
+            self.EXPORT = ExportSink.ExportSink(export_file, config.EXPORT_FORMAT, config.CATALOG_URL)
+        with self.PROFILER.phase("render"), self.MEMORY.phase("render"):
+            try:
+                for index, entry in enumerate(self.ENTRIES):
+                    if index % 1000 == 999:
+                        self.MEMORY.checkpoint("%d resources rendered" % index)
+                    entry.render(self.STORE)
+                    if Log.payloads_enabled():
+                        Log.dump_payload(entry.TYPE, entry.KEY, entry.get_payload())
+                    if self.EXPORT is not None:
+                        self.EXPORT.write(entry)
+                        if not self.TARGETS:
+                            entry.release()
+            finally:
+                if self.EXPORT is not None:
+                    self.EXPORT.close()
+
+        with self.PROFILER.phase("upload"), self.MEMORY.phase("upload"):
+            self.upload()
+
+        if config.JOURNAL_FILE:
+            self.write_journal()
+
+    def add_entry(self, resource, resource_type, parent_key, sources=(), references=()):
         """
-        Method to create resource of resource type in FDP
+        Method to add a resource to the resources that are uploaded
 
-        :param dataset: Provide resource object
+        :param resource: Provide resource object
         :param resource_type: Provide the type of resource
-        :return: FDP's dataset URL
+        :param parent_key: Provide the key of the parent resource
+        :param sources: Provide list of (sheet or file, key) tuples of the input rows the resource is made from
+        :param references: Provide list of the keys of other resources the resource links to
+        :return: key of the resource
+        """
+        key = ResourceEntry.resource_key(resource_type, resource.TITLE)
+        # Keep keys unique if the same title is used in both templates
+        number = 1
+        unique_key = key
+        while unique_key in self.KEYS:
+            number += 1
+            unique_key = key + "#" + str(number)
+        self.KEYS.add(unique_key)
+        self.SOURCES[unique_key] = list(sources)
+        self.ENTRIES.append(ResourceEntry.ResourceEntry(resource, resource_type, unique_key, parent_key, references))
+        return unique_key
+
+    def is_type_selected(self, resource_type):
+        """
+        :param resource_type: Provide resource type
+        :return: True if the resources of the type are read in this run
+        """
+        return self.SELECTION is None or self.SELECTION.has_type(resource_type)
+
+    def add_catalogs(self, catalogs, source):
+        """
+        Method to add the catalogs that are created under the root of the FDP, resources are added to the first catalog
+        with their catalog title
+
+        :param catalogs: Provide dict of Catalog objects
+        :param source: Provide sheet or file the catalogs are read from
+        """
+        for catalog in catalogs.values():
+            key = self.add_entry(catalog, "catalog", ResourceEntry.ROOT_KEY, [(source, catalog.TITLE)])
+            self.CATALOG_KEYS.setdefault(catalog.TITLE, key)
+
+    def get_catalog_key(self, resource):
+        """
+        :param resource: Provide resource object of a top-level resource
+        :return: Key of the catalog the resource is added to. A catalog that is not created in the run is looked up by
+                 its title in the FDP during the upload.
+        """
+        if resource.CATALOG is None:
+            return ResourceEntry.CATALOG_KEY
+        if resource.CATALOG not in self.CATALOG_KEYS:
+            return ResourceEntry.resource_key("catalog", resource.CATALOG)
+        return self.CATALOG_KEYS[resource.CATALOG]
+
+    @staticmethod
+    def is_url(value):
+        """
+        :param value: Provide cell value
+        :return: True if the value is a URL instead of a title
+        """
+        return str(value).strip().startswith(("http://", "https://"))
+
+    def get_dataset_key(self, dataset_keys, title, resource_type, resource):
+        """
+        :param dataset_keys: Provide dict of dataset title to key of the datasets of the run
+        :param title: Provide title of a dataset the resource links to
+        :param resource_type: Provide the type of the resource
+        :param resource: Provide resource object of the distribution or data service
+        :return: Key of the dataset, the key in the registry if the dataset is not in the run
+        """
+        if title in dataset_keys:
+            return dataset_keys[title]
+        if self.CONFIG.REGISTRY_FILE is None:
+            raise SystemExit("The dataset <" + str(title) + "> of " + resource_type + " <" + str(resource.TITLE)
+                             + "> is not in the dataset sheet")
+        return ResourceEntry.resource_key("dataset", title)
+
+    def add_fdp_template_resources(self):
+        """
+        Method to read the FDP template CSV files and add their datasets and distributions
+        """
+        # Get dataset and distribution data
+        fdp_template_reader = FDPTemplateReader.FDPTemplateReader(self.CONFIG, self.SELECTION)
+        distributions = fdp_template_reader.get_distributions() if self.is_type_selected("distribution") else {}
+        # A partial run reads the datasets of the selected distributions too, as their parents
+        parents = {distribution.DATASET_NAME for distribution in distributions.values()} \
+            if self.SELECTION is not None else None
+        datasets = fdp_template_reader.get_datasets(parents) if self.is_type_selected("dataset") or parents else {}
+        if self.CHANGES is not None:
+            for path in (self.CONFIG.DATASET_INPUT_FILE, self.CONFIG.DISTRIBUTION_INPUT_FILE):
+                self.CHANGES.add_file(path, fdp_template_reader.get_rows(path), fdp_template_reader.get_rows)
+
+        # Add datasets
+        dataset_keys = {}
+        for dataset_name, dataset in datasets.items():
+            dataset_keys[dataset_name] = self.add_entry(dataset, "dataset", self.get_catalog_key(dataset),
+                                                        [(self.CONFIG.DATASET_INPUT_FILE, dataset.TITLE)])
+
+        # Add distribution(s) as child to dataset
+        for dataset_name, dataset_key in dataset_keys.items():
+            for distribution_name, distribution in distributions.items():
+                if distribution.DATASET_NAME == dataset_name:
+                    # This logic is required since both download and access URLs are captured in same row
+                    sources = [(self.CONFIG.DISTRIBUTION_INPUT_FILE, distribution.TITLE)]
+                    if distribution.ACCESS_URL:
+                        access_distribution = copy.copy(distribution)
+                        access_distribution.TITLE = "Access distribution of : " + distribution.TITLE
+                        access_distribution.DOWNLOAD_URL = None
+                        self.add_entry(access_distribution, "distribution", dataset_key, sources)
+
+                    if distribution.DOWNLOAD_URL:
+                        download_distribution = copy.copy(distribution)
+                        download_distribution.TITLE = "Downloadable distribution of : " + distribution.TITLE
+                        download_distribution.ACCESS_URL = None
+                        self.add_entry(download_distribution, "distribution", dataset_key, sources)
+
+    def add_vp_template_resources(self):
+        """
+        Method to read the EJP RD VP template, link its resources and add them
+        """
+        # Read the excel template
+        vp_template_reader = VPTemplateReader.VPTemplateReader(self.CONFIG, self.MEMORY, self.SELECTION)
+        vp_template_reader.check_template_version()
+        biobanks = vp_template_reader.get_biobanks() if self.is_type_selected("biobank") else {}
+        patientregistries = vp_template_reader.get_patientregistries() \
+            if self.is_type_selected("patientregistry") else {}
+        distributions = vp_template_reader.get_distributions() if self.is_type_selected("distribution") else {}
+        dataservices = vp_template_reader.get_dataservices() if self.is_type_selected("dataservice") else {}
+        # A partial run reads the datasets of the selected distributions and data services too
+        parents = None
+        if self.SELECTION is not None:
+            parents = {distribution.DATASET_TITLE for distribution in distributions.values()}
+            parents.update(title for dataservice in dataservices.values()
+                           for title in dataservice.SERVERSDATASET or [] if not self.is_url(title))
+        datasets = vp_template_reader.get_datasets(parents) if self.is_type_selected("dataset") or parents else {}
+        # and only the organisations that publish the resources it reads
+        publishers = None
+        if self.SELECTION is not None:
+            publishers = {resource.PUBLISHER for resources in (biobanks, patientregistries, datasets, distributions,
+                                                               dataservices) for resource in resources.values()}
+        organisations = vp_template_reader.get_organisations(publishers)
+        if self.DEDUPLICATOR is not None:
+            self.DEDUPLICATOR.check_linked("organisation", organisations)
+        # Without create_catalogs the Catalog column links to catalogs that exist in the FDP
+        if self.CONFIG.CREATE_CATALOGS:
+            self.add_catalogs(vp_template_reader.get_catalogs(), "Catalog")
+        if self.CHANGES is not None:
+            self.CHANGES.add_workbook(self.CONFIG.EJP_VP_INPUT_FILE, vp_template_reader.get_workbook(),
+                                      vp_template_reader.load_workbook)
+
+        Log.warn_once(logger, "Multiple descriptions for a resource are now allowed in the implementation")
+        Log.warn_once(logger, "PopulationCoverage in the dataset sheet is not used")
+
+        # Create biobank entries
+        for biobank_name, biobank in biobanks.items():
+            # Link organisation
+            sources = [("Biobank", biobank.TITLE)]
+            for organisation_name, organisation in organisations.items():
+                if biobank.PUBLISHER == organisation.TITLE:
+                    biobank.PUBLISHER = organisation
+                    sources.append(("Organisation", organisation.TITLE))
+                    break
+
+            self.add_entry(biobank, "biobank", self.get_catalog_key(biobank), sources)
+
+        # Create patient registry entries
+        for patientregistry_name, patientregistry in patientregistries.items():
+            # Link organisation
+            sources = [("PatientRegistry", patientregistry.TITLE)]
+            for organisation_name, organisation in organisations.items():
+                if patientregistry.PUBLISHER == organisation.TITLE:
+                    patientregistry.PUBLISHER = organisation
+                    sources.append(("Organisation", organisation.TITLE))
+                    break
+
+            self.add_entry(patientregistry, "patientregistry", self.get_catalog_key(patientregistry), sources)
+
+        # Create datasets
+        dataset_keys = {}
+        for dataset_name, dataset in datasets.items():
+            # Link organisation
+            sources = [("Dataset", dataset.TITLE)]
+            for organisation_name, organisation in organisations.items():
+                if dataset.PUBLISHER == organisation.TITLE:
+                    dataset.PUBLISHER = organisation
+                    sources.append(("Organisation", organisation.TITLE))
+                    break
+
+            dataset_key = self.add_entry(dataset, "dataset", self.get_catalog_key(dataset), sources)
+            # Distributions are added to the first dataset with their dataset title
+            dataset_keys.setdefault(dataset.TITLE, dataset_key)
+
+        # Create distributions
+        for distribution_name, distribution in distributions.items():
+            # Link organisation
+            sources = [("Distribution", distribution.TITLE)]
+            for organisation_name, organisation in organisations.items():
+                if distribution.PUBLISHER == organisation.TITLE:
+                    distribution.PUBLISHER = organisation
+                    sources.append(("Organisation", organisation.TITLE))
+                    break
+
+            # Link dataset, a dataset of an earlier run is looked up in the registry
+            dataset_key = self.get_dataset_key(dataset_keys, distribution.DATASET_TITLE, "distribution",
+                                               distribution)
+            self.add_entry(distribution, "distribution", dataset_key, sources)
+
+        # Create dataservices
+        for dataservice_name, dataservice in dataservices.items():
+            # Link datasets by title, the placeholders are replaced by the URLs of the datasets during the upload
+            references = []
+            if dataservice.SERVERSDATASET:
+                served = []
+                for value in dataservice.SERVERSDATASET:
+                    if not self.is_url(value):
+                        references.append(self.get_dataset_key(dataset_keys, value, "dataservice", dataservice))
+                        value = ResourceEntry.placeholder(references[-1])
+                    served.append(value)
+                dataservice.SERVERSDATASET = served
+
+            # Link organisation
+            sources = [("DataService", dataservice.TITLE)]
+            for organisation_name, organisation in organisations.items():
+                if dataservice.PUBLISHER == organisation.TITLE:
+                    dataservice.PUBLISHER = organisation
+                    sources.append(("Organisation", organisation.TITLE))
+                    break
+
+            self.add_entry(dataservice, "dataservice", self.get_catalog_key(dataservice), sources, references)
+
+    def select_changed(self):
+        """
+        Method to keep only the resources made from rows that changed since the configured revision, and the parents
+        and referenced resources they need. The resources of changed rows are marked to be updated.
+        """
+        parents = {entry.KEY: entry.PARENT_KEY for entry in self.ENTRIES}
+        references = {entry.KEY: entry.REFERENCES for entry in self.ENTRIES}
+        selected = set()
+        changed = set()
+        for key, sources in self.SOURCES.items():
+            if any(self.CHANGES.is_changed(source, row_key) for source, row_key in sources):
+                changed.add(key)
+                # The resources a selected resource links to are needed like its parents
+                pending = [key]
+                while pending:
+                    key = pending.pop()
+                    while key in parents and key not in selected:
+                        selected.add(key)
+                        pending.extend(references[key])
+                        key = parents[key]
+
+        logger.info("%d of %d input rows changed since %s, processing %d of %d resources", len(self.CHANGES.changed),
+                    self.CHANGES.rows, self.CONFIG.CHANGED_SINCE, len(selected), len(self.ENTRIES))
+        self.ENTRIES = [entry for entry in self.ENTRIES if entry.KEY in selected]
+        # The changed resources that exist in the FDP are updated, their unchanged parents are only looked up
+        for entry in self.ENTRIES:
+            entry.UPDATE = entry.KEY in changed
+
+    def select_shard(self):
+        """
+        Method to partition the resources into shards and keep only the resources of the shard of this worker
+        """
+        plan = Sharding.partition(self.ENTRIES, self.CONFIG.SHARDS)
+        self.PLAN_DIGEST = Sharding.get_plan_digest(plan)
+        sizes = [0] * self.CONFIG.SHARDS
+        for shard in plan.values():
+            sizes[shard - 1] += 1
+        logger.info("Processing shard %d of %d: %d of %d resources (shard sizes: %s)", self.CONFIG.SHARD,
+                    self.CONFIG.SHARDS, sizes[self.CONFIG.SHARD - 1], len(self.ENTRIES),
+                    ", ".join(str(size) for size in sizes))
+        self.ENTRIES = [entry for entry in self.ENTRIES if plan[entry.KEY] == self.CONFIG.SHARD]
+
+    def check_vocabularies(self):
+        """
+        Method to check the theme, language, license and access rights values of the resources against the vocabulary
+        index, and replace compact IRIs and labels by the IRIs of the terms
         """
-        # Check if parent exists
-        parent_url = resource.PARENT_URL
+        start = time.monotonic()
+        index = Vocabulary.VocabularyIndex(self.CONFIG.VOCABULARY_INDEX, self.CONFIG.VOCABULARIES)
+        checked = 0
+        problems = []
+        for entry in self.ENTRIES:
+            values = vars(entry.RESOURCE)
+            for attribute, names in Vocabulary.ATTRIBUTE_VOCABULARIES.items():
+                value = values.get(attribute)
+                if value is None:
+                    continue
+                resolved = []
+                for item in (value if isinstance(value, list) else [value]):
+                    iri = item
+                    if item not in (None, ""):
+                        iri, is_checked = index.resolve(item, names)
+                        checked += is_checked
+                        if iri is None:
+                            problems.append("%s <%s>: %s is not a term of %s" % (entry.TYPE, entry.RESOURCE.TITLE,
+                                                                                item, "/".join(names)))
+                            iri = item
+                    resolved.append(iri)
+                setattr(entry.RESOURCE, attribute, resolved if isinstance(value, list) else resolved[0])
+        index.close()
+        logger.info("Checked %d vocabulary values in %.2f s", checked, time.monotonic() - start)
 
-        if not Config.DRY_RUN and not self.FDP_CLIENT.does_metadata_exists(parent_url):
-            raise SystemExit("The parent metadata <"+parent_url+"> does not exist. Provide valid catalog URL")
+        log = logger.error if self.CONFIG.VOCABULARY_CHECK == "error" else logger.warning
+        for problem in problems:
+            log("%s", problem)
+        if problems and self.CONFIG.VOCABULARY_CHECK == "error":
+            raise SystemExit(str(len(problems)) + " values are not terms of the vocabularies, see the log")
 
-        print("The catalog <"+parent_url+"> exist")
+    def check_links(self):
+        """
+        Method to check that the URLs of the resources resolve
+        """
+        urls = LinkChecker.collect_urls(self.ENTRIES)
+        self.LINK_CHECKER = LinkChecker.LinkChecker(self.CONFIG.LINK_CHECK_CONCURRENCY, self.CONFIG.LINK_CHECK_RATE,
+                                                    self.CONFIG.LINK_CHECK_TIMEOUT, self.CONFIG.LINK_CHECK_CACHE,
+                                                    self.CONFIG.LINK_CHECK_TTL)
+        self.LINK_CHECKER.check(urls)
+
+        broken = self.LINK_CHECKER.get_broken()
+        log = logger.error if self.CONFIG.LINK_CHECK == "error" else logger.warning
+        for url, result in broken.items():
+            for resource_type, title, attribute in urls[url]:
+                log("%s <%s>: %s %s is broken (%s)", resource_type, title, attribute, url, result["error"])
+        if broken and self.CONFIG.LINK_CHECK == "error":
+            raise SystemExit(str(len(broken)) + " links are broken, see the log")
+
+    def get_waves(self):
+        """
+        Method to group the resources into waves of resources whose parents and referenced resources are all in
+        earlier waves
 
-        # Obtain graph that should be sent to FDP
-        graph = resource.get_graph()
+        :return: List of lists of ResourceEntry objects
+        """
+        depths = {ResourceEntry.CATALOG_KEY: -1, ResourceEntry.ROOT_KEY: -1}
+        waves = []
+        for entry in self.ENTRIES:
+            # Resources that are not in the run, e.g. found in the registry, exist before the first wave
+            depth = max([depths.get(key, -1) for key in [entry.PARENT_KEY] + entry.REFERENCES]) + 1
+            depths[entry.KEY] = depth
+            if depth == len(waves):
+                waves.append([])
+            waves[depth].append(entry)
+        return waves
 
-        # Serialize graph and send to FDP
-        post_body = graph.serialize(format='turtle')
-        print("Sending the following " + resource_type + " RDF to FDP:")
-        print(post_body)
-        if Config.DRY_RUN:
-            resource_url = "http://example.org/" + resource_type + "/" + str(uuid.uuid4())
+    def upload(self):
+        """
+        Method to upload the rendered resources to all targets, concurrently if there are multiple targets
+        """
+        waves = self.get_waves()
+        if not self.TARGETS:
+            return
+        if len(self.TARGETS) == 1:
+            self.TARGETS[0].upload(waves)
         else:
-            resource_url = self.FDP_CLIENT.fdp_create_metadata(post_body, resource_type)
-        print("New " + resource_type + " created: " + resource_url)
-        return resource_url
\ No newline at end of file
+            with ThreadPoolExecutor(max_workers=len(self.TARGETS)) as executor:
+                list(executor.map(lambda target: target.upload(waves), self.TARGETS))
+
+        # Duplicates get the FDP URL of the resource they are a duplicate of
+        if self.DEDUPLICATOR is not None:
+            for target in self.TARGETS:
+                for alias, key in self.DEDUPLICATOR.ALIASES.items():
+                    if key in target.URLS:
+                        target.URLS[alias] = target.URLS[key]
+
+        if self.CONFIG.REGISTRY_FILE:
+            resources = [(entry.KEY, entry.TYPE, entry.RESOURCE.TITLE) for entry in self.ENTRIES]
+            if self.DEDUPLICATOR is not None:
+                entries = {entry.KEY: entry for entry in self.ENTRIES}
+                resources += [(alias, entries[key].TYPE, entries[key].RESOURCE.TITLE)
+                              for alias, key in self.DEDUPLICATOR.ALIASES.items() if key in entries]
+            for target in self.TARGETS:
+                target.record_urls(resources)
+
+    def write_journal(self):
+        """
+        Method to write the URL mapping and run report of this worker to its journal
+        """
+        plan_digest = self.PLAN_DIGEST
+        if plan_digest is None:
+            plan_digest = Sharding.get_plan_digest(Sharding.partition(self.ENTRIES, 1))
+        Sharding.write_journal(self.CONFIG.JOURNAL_FILE, self.CONFIG.SHARD or 1, self.CONFIG.SHARDS, plan_digest,
+                               [entry.KEY for entry in self.ENTRIES], self.TARGETS,
+                               time.monotonic() - self.START_TIME)
+
+    def print_summary(self):
+        """
+        Method to log the run report of every target
+        """
+        for target in self.TARGETS:
+            target.REPORT.print_summary()
+        if self.DEDUPLICATOR is not None:
+            logger.info("\n".join(self.DEDUPLICATOR.get_summary()))
+        if self.EXPORT is not None:
+            logger.info("\n".join(self.EXPORT.get_summary()))
+        if self.LINK_CHECKER is not None:
+            logger.info("\n".join(self.LINK_CHECKER.get_summary()))
+        if self.STORE is not None:
+            logger.info("\n".join(self.STORE.get_summary()))
+        if self.MEMORY.ENABLED:
+            logger.info("\n".join(self.MEMORY.get_summary()))
+
+    def check_targets(self):
+        """
+        Method to stop with an error if the upload to a target failed
+        """
+        failed = [target.NAME for target in self.TARGETS if target.ERROR is not None]
+        if failed:
+            raise SystemExit("Upload failed for: " + ", ".join(failed))
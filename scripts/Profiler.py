@@ -0,0 +1,144 @@
+import cProfile
+import contextlib
+import io
+import os
+import pstats
+import sys
+import threading
+import Log
+
+"""
+Profiling of the phases of a run. Every phase gets its own cProfile profiler, including the worker threads it starts,
+and is written as a pstats file and as collapsed stacks, one "a;b;c microseconds" line per stack, that flame graph tools
+such as flamegraph.pl and speedscope read.
+"""
+
+logger = Log.get_logger(__name__)
+
+# Stacks that take less than this share of the phase are left out of the collapsed stacks
+MIN_SHARE = 0.0005
+MAX_DEPTH = 128
+
+
+def get_label(function):
+    """
+    :param function: Provide pstats function tuple of file name, line number and function name
+    :return: Label of the function in a collapsed stack, e.g. Populator.py:24(__init__)
+    """
+    file_name, line, name = function
+    if file_name == "~":
+        return name.replace(";", ",")
+    return "%s:%d(%s)" % (os.path.basename(file_name), line, name)
+
+
+def collapse(stats):
+    """
+    Method to turn the caller and callee times of a profile into collapsed stacks. The time of a function is split
+    over its callers in proportion to the time of each call edge, as profilers only record one level of callers.
+
+    :param stats: Provide pstats.Stats object
+    :return: Dict of collapsed stack to microseconds spent in the last function of the stack
+    """
+    entries = stats.stats
+    callees = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[function] = edge[3]
+    roots = [function for function, entry in entries.items() if not entry[4]]
+    minimum = sum(entries[function][3] for function in roots) * MIN_SHARE
+    stacks = {}
+
+    def walk(function, stack, seconds):
+        _, _, own, total, _ = entries[function]
+        scale = seconds / total if total else 0
+        stack = stack + (function,)
+        key = ";".join(get_label(item) for item in stack)
+        stacks[key] = stacks.get(key, 0) + own * scale * 1e6
+        if len(stack) >= MAX_DEPTH:
+            return
+        for callee, edge_seconds in callees.get(function, {}).items():
+            share = edge_seconds * scale
+            if callee not in stack and callee in entries and share >= minimum:
+                walk(callee, stack, share)
+
+    for function in roots:
+        walk(function, (), entries[function][3])
+    return stacks
+
+
+class Profiler:
+    """
+    Class to profile the phases of a run. A disabled profiler returns a context manager that does nothing, so the
+    phases cost nothing extra when profiling is off.
+    """
+
+    def __init__(self, directory=None, top=20):
+        """
+        :param directory: Provide directory the profiles are written to, or None to disable profiling
+        :param top: Provide number of functions with the most own time that are logged per phase
+        """
+        self.DIRECTORY = directory
+        self.TOP = top
+        self.ENABLED = directory is not None
+        self.lock = threading.Lock()
+        if self.ENABLED:
+            os.makedirs(directory, exist_ok=True)
+
+    def phase(self, name):
+        """
+        :param name: Provide name of the phase, used for the names of the output files
+        :return: Context manager that profiles the code in its block
+        """
+        if not self.ENABLED:
+            return contextlib.nullcontext()
+        return self.profile(name)
+
+    @contextlib.contextmanager
+    def profile(self, name):
+        """
+        Context manager that profiles its block and the threads started in it, and writes the profile of the phase
+        """
+        profiles = [cProfile.Profile()]
+
+        def start_thread_profile(frame, event, arg):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12 and later profile all threads with the profiler of the phase
+                sys.setprofile(None)
+                return
+            with self.lock:
+                profiles.append(profile)
+
+        threading.setprofile(start_thread_profile)
+        profiles[0].enable()
+        try:
+            yield
+        finally:
+            profiles[0].disable()
+            threading.setprofile(None)
+            with self.lock:
+                self.write(name, pstats.Stats(*profiles))
+
+    def write(self, name, stats):
+        """
+        Method to write the pstats file and the collapsed stacks of a phase, and log its hot functions
+
+        :param name: Provide name of the phase
+        :param stats: Provide pstats.Stats object of the phase
+        """
+        stats_path = os.path.join(self.DIRECTORY, name + ".pstats")
+        stats.dump_stats(stats_path)
+
+        stacks_path = os.path.join(self.DIRECTORY, name + ".collapsed")
+        with open(stacks_path, "w", encoding="utf-8") as stacks_file:
+            for stack, microseconds in sorted(collapse(stats).items()):
+                if microseconds >= 1:
+                    stacks_file.write("%s %d\n" % (stack, microseconds))
+
+        report = io.StringIO()
+        stats.stream = report
+        stats.sort_stats("tottime").print_stats(self.TOP)
+        logger.info("Profile of the %s phase (%.3f s), written to %s and %s:\n%s", name, stats.total_tt, stats_path,
+                    stacks_path, report.getvalue().strip())
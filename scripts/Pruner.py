@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+import Log
+from concurrent.futures import ThreadPoolExecutor
+
+logger = Log.get_logger(__name__)
+
+
+class Pruner:
+    """
+    Class to delete the resources of a catalog that are no longer in the input. Stale resources are deleted by a
+    bounded pool of workers, the deepest resources first so children are removed before their parents.
+    """
+    RETRY_DELAY = 0.5
+
+    def __init__(self, fdp_client, index, concurrency=4, retries=3, dry_run=False, log_file=None):
+        """
+        :param fdp_client: Provide FDPClient object of the FDP
+        :param index: Provide CatalogIndex object of the catalog
+        :param concurrency: Provide the number of resources deleted at the same time
+        :param retries: Provide the number of times a failed deletion is retried
+        :param dry_run: Provide True to only list the resources that would be deleted
+        :param log_file: Provide path of a file the result of every resource is written to as JSON lines, or None
+        """
+        self.FDP_CLIENT = fdp_client
+        self.INDEX = index
+        self.CONCURRENCY = max(1, concurrency)
+        self.RETRIES = max(0, retries)
+        self.DRY_RUN = dry_run
+        self.LOG_FILE = log_file
+        self.results = []
+        self.lock = threading.Lock()
+
+    def get_stale(self, used_urls):
+        """
+        Method to find the resources of the catalog that are not used by the input
+
+        :param used_urls: Provide set of URLs of the resources in the input
+        :return: List of lists of index entries, deepest resources first
+        """
+        depths = {}
+
+        def depth(url):
+            if url not in depths:
+                parent = self.INDEX.entries[url]["parent"] if url in self.INDEX.entries else None
+                depths[url] = 0 if parent is None else depth(parent) + 1
+            return depths[url]
+
+        levels = {}
+        for url, entry in self.INDEX.entries.items():
+            if entry["parent"] is None or url in used_urls:
+                continue
+            levels.setdefault(depth(url), []).append(entry)
+        return [levels[level] for level in sorted(levels, reverse=True)]
+
+    def prune(self, used_urls):
+        """
+        Method to delete, or list in a dry run, the resources of the catalog that are not used by the input
+
+        :param used_urls: Provide set of URLs of the resources in the input
+        :return: List of result dicts
+        """
+        levels = self.get_stale(used_urls)
+        if self.DRY_RUN:
+            for level in levels:
+                for entry in level:
+                    self.add_result(entry, "would delete", 0)
+        else:
+            with ThreadPoolExecutor(max_workers=self.CONCURRENCY) as executor:
+                for level in levels:
+                    list(executor.map(self.delete, level))
+
+        if self.LOG_FILE:
+            with open(self.LOG_FILE, "w", encoding="utf-8") as log_file:
+                for result in self.results:
+                    log_file.write(json.dumps(result) + "\n")
+        return self.results
+
+    def delete(self, entry):
+        """
+        Method to delete a resource, with retries and an increasing delay when the FDP fails
+
+        :param entry: Provide index entry of the resource
+        """
+        error = None
+        for attempt in range(1, self.RETRIES + 2):
+            try:
+                response = self.FDP_CLIENT.fdp_delete_metadata(entry["url"])
+                if response.status_code in (200, 204):
+                    self.add_result(entry, "deleted", attempt)
+                    return
+                if response.status_code == 404:
+                    self.add_result(entry, "not found", attempt)
+                    return
+                error = "HTTP %d" % response.status_code
+                if response.status_code < 500:
+                    break
+            except Exception as exception:
+                error = str(exception)
+            if attempt <= self.RETRIES:
+                time.sleep(self.RETRY_DELAY * 2 ** (attempt - 1))
+        self.add_result(entry, "failed", attempt, error)
+
+    def add_result(self, entry, result, attempts, error=None):
+        """
+        Method to log the result of a resource and keep it for the prune log
+
+        :param entry: Provide index entry of the resource
+        :param result: Provide result, e.g. deleted
+        :param attempts: Provide number of deletion requests sent
+        :param error: Provide error of a failed deletion
+        """
+        record = {"url": entry["url"], "type": entry["type"], "title": entry["title"], "result": result,
+                  "attempts": attempts}
+        if error is not None:
+            record["error"] = error
+            logger.error("Prune %s %s <%s>: %s (%s)", result, entry["type"], entry["url"], entry["title"], error)
+        else:
+            logger.info("Prune %s %s <%s>: %s", result, entry["type"], entry["url"], entry["title"])
+        with self.lock:
+            self.results.append(record)
+
+    def get_failed(self):
+        """
+        :return: List of result dicts of the resources that could not be deleted
+        """
+        return [result for result in self.results if result["result"] == "failed"]
+
+    def get_summary(self):
+        """
+        Method to get the prune lines of the run report
+
+        :return: List of summary lines
+        """
+        counts = {}
+        for result in self.results:
+            counts[result["result"]] = counts.get(result["result"], 0) + 1
+        if not counts:
+            return ["prune: no stale resources"]
+        return ["prune: " + ", ".join("%d %s" % (count, result) for result, count in sorted(counts.items()))]
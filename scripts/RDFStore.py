@@ -0,0 +1,70 @@
+import threading
+import ResourceEntry
+from rdflib import Dataset, URIRef
+from rdflib.namespace import DCAT, DCTERMS, FOAF, ODRL2, RDFS, XSD
+
+"""
+One RDF dataset for all resources of a run. Every resource is rendered into its own named graph in the same store, the
+namespace bindings are set up once, and the payload of a resource is only serialized when it is uploaded or exported.
+"""
+
+NAMESPACES = {
+    "dcat": DCAT,
+    "dct": DCTERMS,
+    "foaf": FOAF,
+    "odrl": ODRL2,
+    "rdfs": RDFS,
+    "xsd": XSD,
+    "ejp": "https://w3id.org/ejp-rd/vocabulary#",
+    "sio": "http://semanticscience.org/resource/",
+}
+
+
+class RDFStore:
+    """
+    Class contents an rdflib Dataset with a named graph per resource, the graphs are named by the placeholder IRI of
+    the resource key
+    """
+
+    def __init__(self):
+        self.DATASET = Dataset(default_union=True)
+        for prefix, namespace in NAMESPACES.items():
+            self.DATASET.bind(prefix, namespace)
+        self.graphs = {}
+        # Serializing can add namespace bindings to the shared store, so payloads are serialized one at a time
+        self.lock = threading.Lock()
+
+    def get_graph(self, key):
+        """
+        :param key: Provide resource key
+        :return: Named graph of the resource in the dataset
+        """
+        if key not in self.graphs:
+            self.graphs[key] = self.DATASET.graph(URIRef(ResourceEntry.placeholder(key)))
+        return self.graphs[key]
+
+    def serialize(self, key, rdf_format="turtle"):
+        """
+        :param key: Provide resource key
+        :param rdf_format: Provide rdflib format of the payload
+        :return: Payload of the resource
+        """
+        with self.lock:
+            return self.get_graph(key).serialize(format=rdf_format)
+
+    def objects(self, predicate):
+        """
+        Method to query all resources at once, e.g. objects(DCTERMS.publisher) for all publishers used in the run
+
+        :param predicate: Provide predicate IRI
+        :return: Set of the objects of the predicate in all named graphs
+        """
+        return set(self.DATASET.objects(None, URIRef(predicate)))
+
+    def get_summary(self):
+        """
+        :return: List of summary lines
+        """
+        sizes = [len(graph) for graph in self.graphs.values()]
+        return ["rdf store: %d graphs, %d triples, %d publishers" % (len(sizes), sum(sizes),
+                                                                    len(self.objects(DCTERMS.publisher)))]
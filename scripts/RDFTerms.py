@@ -0,0 +1,124 @@
+import datetime
+import re
+
+"""
+Serialization of RDF terms for the Turtle templates. Values are escaped so that quotes, backslashes, angle brackets
+or white space in a spreadsheet cell cannot break the generated Turtle, and lists are built with a single join.
+"""
+
+# Characters that are not allowed in a Turtle IRIREF, these are percent-encoded
+_IRI_UNSAFE = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+
+# Characters that have to be escaped in a double quoted Turtle string
+_LITERAL_UNSAFE = re.compile(r'[\\"\n\r\t\b\f]')
+_LITERAL_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+def _percent_encode(match):
+    return "%%%02X" % ord(match.group())
+
+
+def _escape_literal(match):
+    return _LITERAL_ESCAPES[match.group()]
+
+
+def _iri_body(value):
+    if not isinstance(value, str):
+        value = str(value)
+    value = value.strip()
+    if _IRI_UNSAFE.search(value):
+        value = _IRI_UNSAFE.sub(_percent_encode, value)
+    return value
+
+
+def _literal_body(value):
+    if not isinstance(value, str):
+        value = str(value)
+    if _LITERAL_UNSAFE.search(value):
+        value = _LITERAL_UNSAFE.sub(_escape_literal, value)
+    return value
+
+
+def iri(value):
+    """
+    Serialize a value as a Turtle IRI
+
+    :param value: Provide IRI string
+    :return: IRI between angle brackets, e.g. <http://example.org/a%20b>
+    """
+    return "<" + _iri_body(value) + ">"
+
+
+def literal(value):
+    """
+    Serialize a value as a Turtle string literal
+
+    :param value: Provide literal value
+    :return: Double quoted and escaped literal, e.g. "say \\"hi\\""
+    """
+    return '"' + _literal_body(value) + '"'
+
+
+def iri_list(values):
+    """
+    Serialize values as a comma separated Turtle object list of IRIs, empty values are skipped
+
+    :param values: Provide list of IRI strings or None
+    :return: Object list string, or an empty string if there are no values
+    """
+    if not values:
+        return ""
+    bodies = [body for body in (_iri_body(value) for value in values if value is not None) if body]
+    if not bodies:
+        return ""
+    return "<" + ">, <".join(bodies) + ">"
+
+
+def literal_list(values):
+    """
+    Serialize values as a comma separated Turtle object list of literals, empty values are skipped
+
+    :param values: Provide list of literal values or None
+    :return: Object list string, or an empty string if there are no values
+    """
+    if not values:
+        return ""
+    bodies = [_literal_body(value) for value in values if value is not None and value != ""]
+    if not bodies:
+        return ""
+    return '"' + '", "'.join(bodies) + '"'
+
+
+def typed_literal(value, datatype):
+    """
+    Serialize a value as a Turtle literal with a datatype
+
+    :param value: Provide lexical value
+    :param datatype: Provide datatype IRI, e.g. http://www.w3.org/2001/XMLSchema#dateTime
+    :return: Typed literal, e.g. "2023-01-01T00:00:00"^^<http://www.w3.org/2001/XMLSchema#dateTime>
+    """
+    return '"' + _literal_body(value) + '"^^<' + datatype + '>'
+
+
+def lexical(value):
+    """
+    :param value: Provide cell value
+    :return: Lexical form of the value, dates and times in ISO 8601
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    return str(value)
+
+
+def values(value):
+    """
+    :param value: Provide a value, a list of values or None
+    :return: List of the values that are not empty
+    """
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [item for item in value if item is not None and not (isinstance(item, str) and not item.strip())]
@@ -0,0 +1,145 @@
+import threading
+import time
+from contextlib import contextmanager
+from RunReport import percentile
+
+
+class TokenBucket:
+    """
+    Token bucket that limits the number of requests per second
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        :param rate: Number of requests per second (0 disables the limit)
+        :param burst: Number of requests that can be sent at once after an idle period
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
+        self.waited = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Method blocks until a request may be sent
+        """
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+            time.sleep(delay)
+
+    def get_summary(self):
+        """
+        Method to get the rate limiter lines of the run report
+
+        :return: List of summary lines
+        """
+        if not self.rate:
+            return ["rate limit: disabled"]
+        return ["rate limit: %.2f requests/s (burst %d), waited %.1f s" % (self.rate, self.burst, self.waited)]
+
+
+class ConcurrencyLimiter:
+    """
+    Limits the number of requests in flight. In adaptive mode the limit is tuned with additive increase and
+    multiplicative decrease (AIMD): it grows by one after every window of requests with a low p95 latency and error
+    rate, and is halved as soon as the p95 latency or the error rate exceeds its threshold.
+    """
+
+    def __init__(self, maximum, adaptive=False, latency_target=2.0, error_threshold=0.05, window=20):
+        """
+        :param maximum: Maximum number of requests in flight
+        :param adaptive: Whether to tune the limit between 1 and maximum
+        :param latency_target: p95 latency in seconds above which the limit is decreased
+        :param error_threshold: Fraction of failed requests above which the limit is decreased
+        :param window: Number of requests between two adjustments of the limit
+        """
+        self.maximum = max(1, maximum)
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.error_threshold = error_threshold
+        self.window = window
+        self.limit = 1 if adaptive else self.maximum
+        self.peak_limit = self.limit
+        self.increases = 0
+        self.decreases = 0
+        self.in_flight = 0
+        self.samples = []
+        self.condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """
+        Context manager that waits for a free slot and measures the request. The wrapped block should set
+        result["error"] to True when the request failed; exceptions are counted as failures.
+
+        :return: Dict in which the caller reports the outcome of the request
+        """
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+        result = {"error": False}
+        start = time.monotonic()
+        try:
+            yield result
+        except BaseException:
+            result["error"] = True
+            raise
+        finally:
+            self.release(time.monotonic() - start, result["error"])
+
+    def release(self, seconds, error):
+        """
+        Method to free a slot and, in adaptive mode, adjust the limit
+
+        :param seconds: Duration of the finished request
+        :param error: Whether the finished request failed
+        """
+        with self.condition:
+            self.in_flight -= 1
+            if self.adaptive:
+                self.samples.append((seconds, error))
+                if len(self.samples) >= self.window:
+                    self.adjust()
+            self.condition.notify_all()
+
+    def adjust(self):
+        """
+        Method to apply one AIMD step based on the collected samples
+        """
+        latencies = sorted(seconds for seconds, error in self.samples)
+        error_rate = sum(1 for seconds, error in self.samples if error) / len(self.samples)
+        self.samples = []
+
+        if percentile(latencies, 95) > self.latency_target or error_rate > self.error_threshold:
+            if self.limit > 1:
+                self.limit = max(1, self.limit // 2)
+                self.decreases += 1
+        elif self.limit < self.maximum:
+            self.limit += 1
+            self.increases += 1
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def get_summary(self):
+        """
+        Method to get the concurrency limiter lines of the run report
+
+        :return: List of summary lines
+        """
+        if not self.adaptive:
+            return ["concurrency: %d" % self.limit]
+        return ["adaptive concurrency: final %d, peak %d, max %d (%d increases, %d decreases)"
+                % (self.limit, self.peak_limit, self.maximum, self.increases, self.decreases)]
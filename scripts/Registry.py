@@ -0,0 +1,96 @@
+import contextlib
+import sqlite3
+import time
+
+"""
+Persistent registry of the FDP URLs of resources, in an SQLite file. Every run records the URLs of the resources it
+uploaded and the resources it found while crawling, so later runs can link to them by resource key without uploading
+them again or crawling the FDP. One registry can hold the resources of several FDPs.
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    fdp TEXT NOT NULL,
+    key TEXT NOT NULL,
+    url TEXT NOT NULL,
+    type TEXT,
+    title TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (fdp, key)
+);
+CREATE INDEX IF NOT EXISTS resources_url ON resources (fdp, url);
+"""
+
+# Maximum number of keys in one lookup query, below the SQLite limit of variables in a statement
+LOOKUP_BATCH = 500
+
+
+class Registry:
+    """
+    Class contents the registry file. Every operation uses its own connection, so the registry can be used by the
+    threads of concurrent targets and by the processes of a sharded run.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Provide path of the SQLite file, it is created if it does not exist
+        """
+        self.PATH = path
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def connect(self):
+        """
+        Context manager with an SQLite connection that waits for the locks of other writers, and commits and closes
+        at the end of its block
+        """
+        connection = sqlite3.connect(self.PATH, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def lookup(self, fdp, keys):
+        """
+        Method to find the URLs of resources by their keys
+
+        :param fdp: Provide URL of the root of the FDP
+        :param keys: Provide list of resource keys
+        :return: Dict of resource key to URL of the keys in the registry
+        """
+        keys = list(keys)
+        urls = {}
+        with self.connect() as connection:
+            for start in range(0, len(keys), LOOKUP_BATCH):
+                batch = keys[start:start + LOOKUP_BATCH]
+                query = "SELECT key, url FROM resources WHERE fdp = ? AND key IN (%s)" % ", ".join("?" * len(batch))
+                urls.update(connection.execute(query, [fdp] + batch).fetchall())
+        return urls
+
+    def record(self, fdp, resources):
+        """
+        Method to record the URLs of resources, replacing the earlier URLs of their keys
+
+        :param fdp: Provide URL of the root of the FDP
+        :param resources: Provide list of (key, url, type, title) tuples
+        :return: Number of recorded resources
+        """
+        now = time.time()
+        rows = [(fdp, key, url, resource_type, None if title is None else str(title), now)
+                for key, url, resource_type, title in resources]
+        with self.connect() as connection:
+            connection.executemany("INSERT OR REPLACE INTO resources (fdp, key, url, type, title, updated) "
+                                   "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def forget(self, fdp, urls):
+        """
+        Method to remove resources that no longer exist, e.g. after they are pruned
+
+        :param fdp: Provide URL of the root of the FDP
+        :param urls: Provide list of URLs of the resources
+        """
+        with self.connect() as connection:
+            connection.executemany("DELETE FROM resources WHERE fdp = ? AND url = ?", [(fdp, url) for url in urls])
@@ -0,0 +1,149 @@
+import re
+from urllib.parse import quote, unquote
+import Canonical
+import Serializers
+from rdflib import Graph, URIRef
+
+
+"""
+Resources are rendered once with placeholder IRIs for their parents, which are replaced by the FDP URLs of a target
+when the resource is uploaded
+"""
+
+CATALOG_KEY = "catalog"
+# Parent of the catalogs that are created, the root of the FDP
+ROOT_KEY = "fdp"
+PLACEHOLDER_PREFIX = "urn:fdp-populator:"
+PLACEHOLDER_PATTERN = re.compile(r"<urn:fdp-populator:([^>]*)>")
+
+# Subject of the resource in a payload, the FDP replaces it by the URL of the new resource
+NEW_RESOURCE_URL = "http://localhost/new"
+
+
+def resource_key(resource_type, title):
+    """
+    :param resource_type: Provide the type of resource
+    :param title: Provide the title of the resource
+    :return: Stable key of a resource, e.g. dataset/My dataset
+    """
+    return resource_type + "/" + str(title)
+
+
+def placeholder(key):
+    """
+    :param key: Provide resource key
+    :return: Placeholder IRI that is replaced by the FDP URL of the resource during upload
+    """
+    return PLACEHOLDER_PREFIX + quote(key, safe="")
+
+
+def resolve(payload, urls):
+    """
+    Replace the placeholder IRIs in a payload
+
+    :param payload: Provide serialized RDF
+    :param urls: Provide dict of resource key to FDP URL
+    :return: Payload with FDP URLs
+    """
+    def replace(match):
+        key = unquote(match.group(1))
+        if key not in urls:
+            raise SystemError("The resource <" + key + "> has not been created in the FDP")
+        return "<" + urls[key] + ">"
+
+    return PLACEHOLDER_PATTERN.sub(replace, payload)
+
+
+def set_subject(payload, url):
+    """
+    Replace the subject of a new resource in a payload, to update a resource that exists in the FDP
+
+    :param payload: Provide resolved Turtle payload
+    :param url: Provide FDP URL of the resource
+    :return: Turtle payload about the resource at the URL
+    """
+    graph = Graph()
+    graph.parse(data=payload, format="turtle")
+    for triple in list(graph.triples((URIRef(NEW_RESOURCE_URL), None, None))):
+        graph.remove(triple)
+        graph.add((URIRef(url), triple[1], triple[2]))
+    return graph.serialize(format="turtle")
+
+
+class ResourceEntry:
+    """
+    Class contents a resource from the input together with its type, key, parent key and rendered payload
+    """
+
+    def __init__(self, resource, resource_type, key, parent_key, references=()):
+        """
+        :param resource: Provide resource object
+        :param resource_type: Provide the type of resource (e.g. dataset)
+        :param key: Provide the stable key of the resource
+        :param parent_key: Provide the key of the parent resource, CATALOG_KEY for the target catalog
+        :param references: Provide list of the keys of other resources the payload links to, e.g. served datasets
+        """
+        self.RESOURCE = resource
+        self.TYPE = resource_type
+        self.KEY = key
+        self.PARENT_KEY = parent_key
+        self.REFERENCES = list(references)
+        self.PAYLOAD = None
+        self.STORE = None
+        # Set for resources made from changed rows, they update the resource that already exists in the FDP
+        self.UPDATE = False
+
+    def render(self, store=None):
+        """
+        Method to render the payload of the resource with a placeholder for its parent. Resources with a generated
+        serializer are written as N-Triples, which are valid Turtle. With a store the resource is rendered into its
+        named graph in the store instead, and the payload is serialized when it is needed.
+
+        :param store: Provide RDFStore object, or None to render a payload
+        :return: Turtle payload, or None if the resource is rendered into a store
+        """
+        self.RESOURCE.PARENT_URL = placeholder(self.PARENT_KEY)
+        if store is not None:
+            self.STORE = store
+            graph = store.get_graph(self.KEY)
+            if Serializers.has_serializer(self.RESOURCE):
+                graph.parse(data=Serializers.serialize(self.RESOURCE, NEW_RESOURCE_URL), format="nt")
+            else:
+                self.RESOURCE.get_graph(graph)
+            return None
+        if Serializers.has_serializer(self.RESOURCE):
+            self.PAYLOAD = Serializers.serialize(self.RESOURCE, NEW_RESOURCE_URL)
+        else:
+            self.PAYLOAD = self.RESOURCE.get_graph().serialize(format='turtle')
+        return self.PAYLOAD
+
+    def release(self):
+        """
+        Method to free the rendered payload once it is no longer needed, e.g. after it is exported in a run without
+        upload. A resource rendered into a store keeps its graph, the store holds all resources by design.
+        """
+        self.PAYLOAD = None
+
+    def get_payload(self):
+        """
+        :return: Turtle payload of the rendered resource
+        """
+        if self.STORE is not None:
+            return self.STORE.serialize(self.KEY)
+        return self.PAYLOAD
+
+    def get_graph(self):
+        """
+        :return: rdflib Graph of the rendered resource, its named graph if it is in a store
+        """
+        if self.STORE is not None:
+            return self.STORE.get_graph(self.KEY)
+        graph = Graph()
+        graph.parse(data=self.PAYLOAD, format="turtle")
+        return graph
+
+    def get_digest(self):
+        """
+        :return: SHA-256 hex digest of the canonical N-Triples of the rendered resource, equal for equal metadata
+        """
+        return Canonical.digest(self.get_graph())
@@ -0,0 +1,119 @@
+import math
+import threading
+import time
+import Log
+
+logger = Log.get_logger(__name__)
+
+
+class RunReport:
+    """
+    Class collects statistics about the requests sent to the FDP during a run
+    """
+
+    def __init__(self, name=None):
+        """
+        :param name: Name of the FDP target the report is about
+        """
+        self.name = name
+        self.operations = {}
+        self.sources = []
+        self.lock = threading.Lock()
+        self.start_time = time.monotonic()
+
+    def record(self, operation, bytes_sent=0, bytes_received=0, seconds=None, error=False):
+        """
+        Method to record a single request
+
+        :param operation: Name of the operation (e.g. create, publish, exists)
+        :param bytes_sent: Number of body bytes sent to the FDP
+        :param bytes_received: Number of body bytes received from the FDP
+        :param seconds: Duration of the request in seconds
+        :param error: Whether the request failed
+        """
+        with self.lock:
+            stats = self.operations.setdefault(operation, {"count": 0, "errors": 0, "bytes_sent": 0,
+                                                           "bytes_received": 0, "latencies": []})
+            stats["count"] += 1
+            stats["bytes_sent"] += bytes_sent
+            stats["bytes_received"] += bytes_received
+            if error:
+                stats["errors"] += 1
+            if seconds is not None:
+                stats["latencies"].append(seconds)
+
+    def get_operations(self):
+        """
+        :return: Dict of operation to its statistics, e.g. to write them to a journal
+        """
+        with self.lock:
+            return {operation: dict(stats, latencies=list(stats["latencies"]))
+                    for operation, stats in self.operations.items()}
+
+    def add_operations(self, operations):
+        """
+        Method to add the statistics of another report, e.g. of another worker of a sharded run
+
+        :param operations: Provide dict of operation to its statistics, as returned by get_operations
+        """
+        with self.lock:
+            for operation, other in operations.items():
+                stats = self.operations.setdefault(operation, {"count": 0, "errors": 0, "bytes_sent": 0,
+                                                               "bytes_received": 0, "latencies": []})
+                for name in ("count", "errors", "bytes_sent", "bytes_received"):
+                    stats[name] += other[name]
+                stats["latencies"].extend(other["latencies"])
+
+    def add_source(self, source):
+        """
+        Method to add an object whose get_summary() lines are appended to the report, e.g. a rate limiter
+
+        :param source: Provide object with a get_summary method
+        """
+        self.sources.append(source)
+
+    def get_summary(self):
+        """
+        Method to get a human readable summary of the run
+
+        :return: List of summary lines
+        """
+        title = "Run report" if self.name is None else "Run report for " + self.name
+        lines = ["%s (%.2f s):" % (title, time.monotonic() - self.start_time)]
+        total_sent = 0
+        total_received = 0
+        with self.lock:
+            for operation, stats in sorted(self.operations.items()):
+                line = ("  %-10s requests: %6d  errors: %4d  sent: %10d B  received: %10d B"
+                        % (operation, stats["count"], stats["errors"], stats["bytes_sent"], stats["bytes_received"]))
+                if stats["latencies"]:
+                    latencies = sorted(stats["latencies"])
+                    line += ("  p50: %7.1f ms  p95: %7.1f ms"
+                             % (percentile(latencies, 50) * 1000, percentile(latencies, 95) * 1000))
+                lines.append(line)
+                total_sent += stats["bytes_sent"]
+                total_received += stats["bytes_received"]
+        lines.append("  %-10s sent: %10d B  received: %10d B" % ("total", total_sent, total_received))
+        for source in self.sources:
+            lines.extend("  " + line for line in source.get_summary())
+        return lines
+
+    def print_summary(self):
+        """
+        Method to log the summary of the run
+        """
+        logger.info("\n".join(self.get_summary()))
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of a sorted list
+
+    :param sorted_values: Provide sorted list of numbers
+    :param percent: Provide percentile between 0 and 100
+    :return: value at the percentile
+    """
+    if not sorted_values:
+        return 0
+    index = max(0, math.ceil(percent / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
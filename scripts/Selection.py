@@ -0,0 +1,125 @@
+import re
+import Log
+
+"""
+Selection of the resources of a partial run. Resources are selected by type, by a regular expression on their title or
+identifier and by the row numbers of the input sheets; rows that are not selected are skipped before a resource is made
+from them.
+"""
+
+logger = Log.get_logger(__name__)
+
+TYPES = ("biobank", "patientregistry", "dataset", "distribution", "dataservice")
+
+
+def parse_rows(text):
+    """
+    :param text: Provide row ranges, e.g. "2-50,80,100-", with the row numbers of the sheet or CSV file
+    :return: List of (first, last) tuples, last is None for an open range
+    """
+    ranges = []
+    for part in str(text).split(","):
+        part = part.strip()
+        match = re.fullmatch(r"(\d*)\s*(-?)\s*(\d*)", part)
+        if match is None or not (match.group(1) or match.group(3)) or (match.group(3) and not match.group(2)):
+            raise SystemExit("Row range <" + part + "> is invalid, use e.g. 2-50,80,100-")
+        first = int(match.group(1)) if match.group(1) else 1
+        last = first if not match.group(2) else int(match.group(3)) if match.group(3) else None
+        if last is not None and last < first:
+            raise SystemExit("Row range <" + part + "> ends before it starts")
+        ranges.append((first, last))
+    return ranges
+
+
+def compile_pattern(pattern, name):
+    """
+    :param pattern: Provide regular expression, or None
+    :param name: Provide name of the setting, used in the error
+    :return: Compiled regular expression, or None
+    """
+    if pattern is None:
+        return None
+    try:
+        return re.compile(str(pattern))
+    except re.error as error:
+        raise SystemExit("The " + name + " pattern <" + str(pattern) + "> is invalid: " + str(error))
+
+
+class Selection:
+    """
+    Class to select the rows of the input files a partial run processes. A row is selected if its resource type is
+    selected, its row number is in one of the row ranges and its title and identifier match the patterns; a resource
+    without an identifier does not match an identifier pattern.
+    """
+
+    def __init__(self, types=None, title=None, identifier=None, rows=None):
+        """
+        :param types: Provide list of resource types, or None for all types
+        :param title: Provide regular expression that is searched in the titles, or None
+        :param identifier: Provide regular expression that is searched in the identifiers, or None
+        :param rows: Provide row ranges, e.g. "2-50,80,100-", or None for all rows
+        """
+        self.TYPES = set(TYPES)
+        if types:
+            self.TYPES = {str(resource_type).strip().lower() for resource_type in types}
+            unknown = self.TYPES - set(TYPES)
+            if unknown:
+                raise SystemExit("Unknown resource types to select: " + ", ".join(sorted(unknown))
+                                 + ", use " + ", ".join(TYPES))
+        self.TITLE = compile_pattern(title, "title")
+        self.IDENTIFIER = compile_pattern(identifier, "identifier")
+        self.ROWS = parse_rows(rows) if rows else None
+        self.selected = {}
+        self.skipped = {}
+        self.parents = {}
+
+    def has_type(self, resource_type):
+        """
+        :param resource_type: Provide resource type
+        :return: True if resources of the type are selected
+        """
+        return resource_type in self.TYPES
+
+    def is_selected(self, resource_type, row_number, title, identifier=None, parent=False):
+        """
+        :param resource_type: Provide resource type of the row
+        :param row_number: Provide number of the row in its sheet or CSV file, the header is row 1
+        :param title: Provide title in the row
+        :param identifier: Provide identifier in the row, or None
+        :param parent: Provide True if the row is the parent of a selected resource, it is then read and counted as a
+                       parent if it is not selected itself
+        :return: True if the row is read
+        """
+        if not self.has_type(resource_type):
+            if parent:
+                self.parents[resource_type] = self.parents.get(resource_type, 0) + 1
+            return parent
+        selected = True
+        if self.ROWS is not None:
+            selected = any(first <= row_number and (last is None or row_number <= last) for first, last in self.ROWS)
+        if selected and self.TITLE is not None:
+            selected = self.TITLE.search(str(title)) is not None
+        if selected and self.IDENTIFIER is not None:
+            selected = identifier is not None and self.IDENTIFIER.search(str(identifier)) is not None
+        counts = self.selected if selected else self.parents if parent else self.skipped
+        counts[resource_type] = counts.get(resource_type, 0) + 1
+        return selected or parent
+
+    def log_summary(self):
+        """
+        Method to log the number of selected and skipped rows per resource type, and the rows that are only read as
+        parents of selected resources
+        """
+        for resource_type in TYPES:
+            counts = [self.selected.get(resource_type, 0), self.skipped.get(resource_type, 0),
+                      self.parents.get(resource_type, 0)]
+            if resource_type in self.selected or resource_type in self.skipped:
+                message = "Selected %d of %d %s rows" % (counts[0], sum(counts), resource_type)
+                if counts[2]:
+                    message += ", %d more read as parents of selected resources" % counts[2]
+                logger.info(message)
+            elif counts[2]:
+                logger.info("Read %d %s rows as parents of selected resources", counts[2], resource_type)
+        skipped = [resource_type for resource_type in TYPES if not self.has_type(resource_type)]
+        if skipped:
+            logger.info("Not selected: the %s rows, only parents of selected resources are read", ", ".join(skipped))
@@ -0,0 +1,472 @@
+import hashlib
+import os
+from rdflib import Graph
+from rdflib.collection import Collection
+from rdflib.namespace import RDF, SH
+
+"""
+Generator of the serializers of the EJP RD VP resource classes. The constraints of every property are read from the
+SHACL shapes, the attributes the values come from are described in RESOURCE_TYPES, and for every resource class a
+Python function is written that emits its N-Triples directly and checks the cardinality, datatype and allowed values
+of every property. Run generate_serializers.py after changing the shapes or RESOURCE_TYPES.
+"""
+
+RDF_TYPE = str(RDF.type)
+DCT = "http://purl.org/dc/terms/"
+DCAT = "http://www.w3.org/ns/dcat#"
+FOAF = "http://xmlns.com/foaf/0.1/"
+ODRL = "http://www.w3.org/ns/odrl/2/"
+EJP = "https://w3id.org/ejp-rd/vocabulary#"
+SIO = "http://semanticscience.org/resource/"
+RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+SH_NS = str(SH)
+
+PREFIXES = {"dct": DCT, "dcat": DCAT, "foaf": FOAF, "odrl": ODRL, "ejp": EJP, "sio": SIO, "rdfs": RDFS}
+
+# The shapes use an older namespace of the EJP RD vocabulary than the FDP
+NAMESPACE_ALIASES = {"http://purl.org/ejp-rd/vocabulary/": EJP}
+
+# Lexical forms of the datatypes that can be checked
+DATATYPE_PATTERNS = {
+    XSD + "dateTime": r"-?\d{4,}-\d\d-\d\dT\d\d:\d\d:\d\d(\.\d+)?(Z|[+-]\d\d:\d\d)?",
+    XSD + "date": r"-?\d{4,}-\d\d-\d\d(Z|[+-]\d\d:\d\d)?",
+    XSD + "integer": r"[+-]?\d+",
+    XSD + "boolean": r"true|false|1|0",
+}
+
+# Properties of every resource: predicate, attribute, kind and options. Kinds are iri, literal, typed (a literal with
+# the datatype of the shape or the datatype option), agent (an IRI, the node of an organisation or a foaf:Agent with
+# a name) and node (a blank node with the value as the path option). Option first uses only the first value, option
+# default is used if the attribute has no value.
+RESOURCE_PROPERTIES = [
+    (DCT + "isPartOf", "PARENT_URL", "iri", {}),
+    (DCT + "license", "LICENSE", "iri", {}),
+    (DCT + "title", "TITLE", "literal", {}),
+    (DCT + "description", "DESCRIPTION", "literal", {}),
+    (DCAT + "theme", "THEME", "iri", {}),
+    (DCT + "publisher", "PUBLISHER", "agent", {}),
+    (DCT + "language", "LANGUAGE", "iri", {}),
+    (EJP + "personalData", "PERSONALDATA", "literal", {}),
+    (DCT + "hasVersion", "VERSION", "literal", {"default": [1]}),
+    (DCAT + "version", "VERSION", "literal", {"default": [1]}),
+    (DCT + "conformsTo", "CONFORMSTO", "iri", {}),
+    (DCAT + "keyword", "KEYWORD", "literal", {"default": ["resource"]}),
+    (FOAF + "logo", "LOGO", "iri", {}),
+    (ODRL + "hasPolicy", "HASPOLICY", "iri", {"first": True}),
+    (DCT + "identifier", "IDENTIFIER", "literal", {}),
+    (DCT + "issued", "ISSUED", "typed", {"datatype": XSD + "dateTime"}),
+    (DCT + "modified", "MODIFIED", "typed", {"datatype": XSD + "dateTime"}),
+    (DCT + "accessRights", "ACCESSRIGHTS", "iri", {"first": True}),
+    (DCAT + "landingPage", "LANDINGPAGE", "iri", {"first": True}),
+]
+
+DISTRIBUTION = (DCAT + "distribution", "DISTRIBUTION", "iri", {})
+
+POPULATION_COVERAGE = (EJP + "populationCoverage", "POPULATIONCOVERAGE", "node",
+                       {"type": SIO + "SIO_001166", "path": RDFS + "label"})
+
+# Resource classes: the shape files that apply, the classes of the resource and its properties
+RESOURCE_TYPES = {
+    "VPBiobank": {
+        "shapes": ["resource", "biobank"],
+        "types": [DCAT + "Resource", DCAT + "Dataset", EJP + "Biobank"],
+        "properties": RESOURCE_PROPERTIES + [DISTRIBUTION, POPULATION_COVERAGE],
+    },
+    "VPPatientRegistry": {
+        "shapes": ["resource", "patientregistry"],
+        "types": [DCAT + "Resource", DCAT + "Dataset", EJP + "PatientRegistry"],
+        "properties": RESOURCE_PROPERTIES + [DISTRIBUTION, POPULATION_COVERAGE],
+    },
+    "VPDataset": {
+        "shapes": ["resource", "dataset"],
+        "types": [DCAT + "Resource", DCAT + "Dataset"],
+        "properties": RESOURCE_PROPERTIES + [DISTRIBUTION],
+    },
+    "VPDataService": {
+        "shapes": ["resource", "dataservice"],
+        "types": [DCAT + "Resource", DCAT + "DataService"],
+        "properties": RESOURCE_PROPERTIES + [
+            (DCT + "type", "OTYPE", "iri", {}),
+            (DCAT + "servesDataset", "SERVERSDATASET", "iri", {}),
+            (DCAT + "endpointURL", "ENDPOINTURL", "iri", {}),
+            (DCAT + "endpointDescription", "ENDPOINTDESCRIPTION", "iri", {}),
+        ],
+    },
+    "VPDistribution": {
+        "shapes": ["resource", "distribution"],
+        "types": [DCAT + "Distribution"],
+        "properties": [
+            (DCT + "isPartOf", "ISPARTOF", "iri", {}),
+            (DCT + "isPartOf", "PARENT_URL", "iri", {}),
+            (DCT + "license", "LICENSE", "iri", {}),
+            (DCT + "title", "TITLE", "literal", {}),
+            (DCT + "description", "DESCRIPTION", "literal", {}),
+            (DCT + "publisher", "PUBLISHER", "agent", {}),
+            (DCAT + "version", "VERSION", "literal", {"default": [1]}),
+            (DCT + "hasVersion", "VERSION", "literal", {"default": [1]}),
+            (DCT + "accessRights", "ACCESSRIGHTS", "iri", {"first": True}),
+            (ODRL + "hasPolicy", "HASPOLICY", "iri", {"first": True}),
+            (DCAT + "mediaType", "MEDIATYPE", "literal", {}),
+            (DCAT + "accessURL", "ACCESSURL", "iri", {}),
+            (DCAT + "downloadURL", "DOWNLOADURL", "iri", {}),
+            (DCAT + "accessService", "ACCESSSERVICE", "iri", {}),
+            (DCT + "conformsTo", "CONFORMSTO", "iri", {}),
+        ],
+    },
+    "VPOrganisation": {
+        "shapes": ["organisation"],
+        "types": [FOAF + "Organisation"],
+        "properties": [
+            (DCT + "title", "TITLE", "literal", {}),
+            (FOAF + "name", "TITLE", "literal", {}),
+            (DCT + "description", "DESCRIPTION", "literal", {}),
+            (FOAF + "logo", "LOGO", "iri", {}),
+            (DCT + "spatial", "LOCATION", "node", {"path": DCT + "title"}),
+            (DCT + "identifier", "IDENTIFIER", "literal", {}),
+            (FOAF + "page", "LANDING_PAGES", "iri", {}),
+        ],
+    },
+}
+
+HEADER = '''import re
+import RDFTerms
+
+"""
+Serializers of the EJP RD VP resource classes, generated by generate_serializers.py from the shapes in SHACL and the
+properties in SerializerGenerator.RESOURCE_TYPES. Do not edit this file, run generate_serializers.py instead.
+"""
+
+SHAPES_DIGEST = "%s"
+
+PATTERNS = {%s}
+
+SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+def serialize(resource, subject):
+    """
+    Serialize a resource as N-Triples
+
+    :param resource: Provide resource object of a class with a serializer
+    :param subject: Provide IRI of the resource
+    :return: N-Triples
+    """
+    errors = []
+    lines = SERIALIZERS[type(resource).__name__](resource, "<" + subject + ">", errors)
+    if errors:
+        raise SystemError(type(resource).__name__ + " <" + str(resource.TITLE) + "> does not conform to the shapes: "
+                          + "; ".join(errors))
+    return "".join(lines)
+
+
+def has_serializer(resource):
+    """
+    :param resource: Provide resource object
+    :return: True if the class of the resource has a generated serializer
+    """
+    return type(resource).__name__ in SERIALIZERS
+
+
+def blank_node(subject, lines):
+    """
+    :param subject: Provide subject the blank node is an object of
+    :param lines: Provide list of N-Triples lines of the subject
+    :return: Label of a new blank node, the label of a nested node starts with the label of its subject to keep it
+             unique in the payload
+    """
+    return (subject + "_" if subject.startswith("_:") else "_:b") + str(len(lines))
+
+
+def agent(value, subject, lines, errors):
+    """
+    :param value: Provide publisher value: a resource object, an IRI (optionally between angle brackets) or a name
+    :param subject: Provide subject of the publisher
+    :param lines: Provide list of N-Triples lines the triples of a node are added to
+    :param errors: Provide list the constraint violations are added to
+    :return: Term of the publisher
+    """
+    if has_serializer(value):
+        label = blank_node(subject, lines)
+        lines.extend(SERIALIZERS[type(value).__name__](value, label, errors))
+        return label
+    text = RDFTerms.lexical(value)
+    if text.startswith("<") and text.endswith(">"):
+        text = text[1:-1]
+    if SCHEME.match(text):
+        return RDFTerms.iri(text)
+    label = blank_node(subject, lines)
+    lines.append(label + " <%s> <%s> .\\n")
+    lines.append(label + " <%s> " + RDFTerms.literal(text) + " .\\n")
+    return label
+'''
+
+
+def compact(iri):
+    """
+    :param iri: Provide IRI
+    :return: Prefixed name of the IRI if its namespace is known, e.g. dct:title
+    """
+    for prefix, namespace in PREFIXES.items():
+        if iri.startswith(namespace):
+            return prefix + ":" + iri[len(namespace):]
+    return iri
+
+
+def alias(iri):
+    """
+    :param iri: Provide IRI from the shapes
+    :return: IRI with the namespace the FDP uses
+    """
+    for old, new in NAMESPACE_ALIASES.items():
+        if iri.startswith(old):
+            return new + iri[len(old):]
+    return iri
+
+
+def read_shapes(directory, name):
+    """
+    Read a shapes file. The xsd prefix is added if a file uses it without declaring it.
+
+    :param directory: Provide directory of the shapes files
+    :param name: Provide name of the shapes file
+    :return: Tuple of the rdflib Graph and the file content
+    """
+    with open(os.path.join(directory, name), encoding="utf-8") as shape_file:
+        text = shape_file.read()
+    data = text
+    if "xsd:" in data and "@prefix xsd:" not in data:
+        data = "@prefix xsd: <" + XSD + "> .\n" + data
+    graph = Graph()
+    graph.parse(data=data, format="turtle")
+    return graph, text
+
+
+def get_constraint(graph, property_shape):
+    """
+    :param graph: Provide graph of the shapes
+    :param property_shape: Provide node of a property shape
+    :return: Dict of constraint name to value, e.g. {"path": ..., "minCount": 1}
+    """
+    constraint = {}
+    for predicate, value in graph.predicate_objects(property_shape):
+        name = str(predicate)
+        if not name.startswith(SH_NS):
+            continue
+        # Some shapes have a colon after the constraint name, e.g. sh:minCount:
+        name = name[len(SH_NS):].rstrip(":")
+        if name in ("minCount", "maxCount"):
+            constraint[name] = int(value)
+        elif name == "in":
+            constraint[name] = [str(item) for item in Collection(graph, value)]
+        elif name == "or":
+            constraint[name] = [get_constraint(graph, item) for item in Collection(graph, value)]
+        else:
+            constraint[name] = alias(str(value))
+    return constraint
+
+
+def merge(constraints, other):
+    """
+    Merge the constraints of the same path in two shapes, the strictest counts are kept
+
+    :return: Merged constraint dict
+    """
+    merged = dict(constraints)
+    for name, value in other.items():
+        if name == "minCount":
+            merged[name] = max(merged.get(name, 0), value)
+        elif name == "maxCount":
+            merged[name] = min(merged.get(name, value), value)
+        else:
+            merged[name] = value
+    return merged
+
+
+def get_shapes(directory, names):
+    """
+    :param directory: Provide directory of the shapes files
+    :param names: Provide names of the shapes files
+    :return: Tuple of dict of path to merged constraints of the shapes, and dict of node shape to its constraints
+    """
+    properties = {}
+    node_shapes = {}
+    for name in names:
+        graph, _ = read_shapes(directory, name)
+        referenced = set(graph.objects(None, SH.node))
+        for shape in graph.subjects(RDF.type, SH.NodeShape):
+            shape_properties = {}
+            for property_shape in graph.objects(shape, SH.property):
+                constraint = get_constraint(graph, property_shape)
+                shape_properties[constraint["path"]] = constraint
+            node_shapes[alias(str(shape))] = shape_properties
+            if shape in referenced:
+                continue
+            for path, constraint in shape_properties.items():
+                properties[path] = merge(properties.get(path, {}), constraint)
+    return properties, node_shapes
+
+
+def check_kind(class_name, predicate, kind, constraint):
+    """
+    Method to stop the generation if the kind of a property does not match its shape
+    """
+    node_kind = constraint.get("nodeKind", "").replace(SH_NS, "")
+    allowed = {"iri": ("", "IRI", "BlankNodeOrIRI", "IRIOrLiteral"),
+               "literal": ("", "Literal", "IRIOrLiteral", "BlankNodeOrLiteral"),
+               "typed": ("", "Literal", "IRIOrLiteral", "BlankNodeOrLiteral"),
+               "agent": ("", "IRI", "BlankNodeOrIRI"),
+               "node": ("", "BlankNode", "BlankNodeOrIRI", "BlankNodeOrLiteral")}[kind]
+    if node_kind not in allowed:
+        raise SystemExit("%s %s is a %s, but the shape requires node kind %s" % (class_name, compact(predicate), kind,
+                                                                               node_kind))
+
+
+def generate_values(properties):
+    """
+    :param properties: Provide property specs of the same predicate
+    :return: Python expression of the list of values of the properties
+    """
+    expressions = []
+    for _, attribute, _, options in properties:
+        expression = "RDFTerms.values(resource.%s)" % attribute
+        if options.get("first"):
+            expression += "[:1]"
+        if "default" in options:
+            expression = "(%s or %r)" % (expression, options["default"])
+        expressions.append(expression)
+    return " + ".join(expressions)
+
+
+def generate_checks(predicate, constraint, indent, value="value"):
+    """
+    :return: Lines of Python that check the allowed values of one value
+    """
+    lines = []
+    if "in" in constraint:
+        lines.append(indent + "if RDFTerms.lexical(%s) not in %r:" % (value, tuple(constraint["in"])))
+        lines.append(indent + "    errors.append(\"%s value %%s is not one of %s\" %% RDFTerms.lexical(%s))"
+                     % (compact(predicate), ", ".join(constraint["in"]), value))
+    return lines
+
+
+def generate_property(class_name, properties, constraint, node_shapes):
+    """
+    :param class_name: Provide name of the resource class
+    :param properties: Provide property specs of the same predicate
+    :param constraint: Provide merged constraints of the predicate
+    :param node_shapes: Provide dict of node shape to its constraints
+    :return: Lines of Python that serialize and check the property
+    """
+    predicate, _, kind, options = properties[0]
+    if any(spec[2] != kind for spec in properties):
+        raise SystemExit("%s %s has values of different kinds" % (class_name, compact(predicate)))
+    check_kind(class_name, predicate, kind, constraint)
+
+    summary = ", ".join("%s %s" % (name, constraint[name]) for name in ("minCount", "maxCount") if name in constraint)
+    lines = ["", "    # " + compact(predicate) + (": " + summary if summary else ""),
+             "    values = " + generate_values(properties)]
+    if constraint.get("minCount", 0) > 0:
+        lines.append("    if len(values) < %d:" % constraint["minCount"])
+        lines.append("        errors.append(\"%s needs at least %d value(s)\")" % (compact(predicate),
+                                                                                 constraint["minCount"]))
+    if "maxCount" in constraint:
+        lines.append("    if len(values) > %d:" % constraint["maxCount"])
+        lines.append("        errors.append(\"%s allows at most %d value(s), found %%d\" %% len(values))"
+                     % (compact(predicate), constraint["maxCount"]))
+
+    lines.append("    for value in values:")
+    line = "        lines.append(subject + \" <%s> \" + %s + \" .\\n\")"
+    if kind == "iri":
+        lines.append(line % (predicate, "RDFTerms.iri(value)"))
+    elif kind == "literal" and "datatype" not in constraint:
+        lines += generate_checks(predicate, constraint, "        ")
+        lines.append(line % (predicate, "RDFTerms.literal(RDFTerms.lexical(value))"))
+    elif kind in ("literal", "typed"):
+        datatype = constraint.get("datatype", options.get("datatype"))
+        if datatype is None:
+            raise SystemExit("%s %s has no datatype" % (class_name, compact(predicate)))
+        lines.append("        text = RDFTerms.lexical(value)")
+        if datatype in DATATYPE_PATTERNS:
+            lines.append("        if not PATTERNS[%r].fullmatch(text):" % datatype)
+            lines.append("            errors.append(\"%s value %%s is not a %s\" %% text)"
+                         % (compact(predicate), datatype.replace(XSD, "xsd:")))
+        lines += generate_checks(predicate, constraint, "        ", "text")
+        lines.append(line % (predicate, "RDFTerms.typed_literal(text, %r)" % datatype))
+    elif kind == "agent":
+        lines.append(line % (predicate, "agent(value, subject, lines, errors)"))
+    elif kind == "node":
+        nested = node_shapes.get(constraint.get("node"), {}).get(options["path"], {})
+        lines.append("        label = blank_node(subject, lines)")
+        lines.append(line % (predicate, "label"))
+        if "type" in options:
+            lines.append("        lines.append(label + \" <%s> <%s> .\\n\")" % (RDF_TYPE, options["type"]))
+        lines += generate_checks(options["path"], nested, "        ")
+        lines.append("        lines.append(label + \" <%s> \" + RDFTerms.literal(RDFTerms.lexical(value)) + \" .\\n\")"
+                     % options["path"])
+    return lines
+
+
+def generate_function(class_name, spec, directory):
+    """
+    :param class_name: Provide name of the resource class
+    :param spec: Provide resource type dict of RESOURCE_TYPES
+    :param directory: Provide directory of the shapes files
+    :return: Lines of Python of the serializer function of the class
+    """
+    constraints, node_shapes = get_shapes(directory, spec["shapes"])
+    predicates = {}
+    for prop in spec["properties"]:
+        predicates.setdefault(prop[0], []).append(prop)
+    for path, constraint in constraints.items():
+        if constraint.get("minCount", 0) > 0 and path not in predicates:
+            raise SystemExit("The shapes require %s for %s, but no attribute provides it" % (compact(path),
+                                                                                            class_name))
+
+    lines = ["", "", "def serialize_%s(resource, subject, errors):" % class_name.lower(),
+             "    \"\"\"",
+             "    Serialize a %s, generated from the shapes %s" % (class_name, ", ".join(spec["shapes"])),
+             "",
+             "    :param resource: Provide %s object" % class_name,
+             "    :param subject: Provide IRI between angle brackets or blank node label of the resource",
+             "    :param errors: Provide list the constraint violations are added to",
+             "    :return: List of N-Triples lines",
+             "    \"\"\"",
+             "    lines = ["]
+    for rdf_type in spec["types"]:
+        lines.append("        subject + \" <%s> <%s> .\\n\"," % (RDF_TYPE, rdf_type))
+    lines.append("    ]")
+    for predicate, properties in predicates.items():
+        lines += generate_property(class_name, properties, constraints.get(predicate, {}), node_shapes)
+    lines += ["    return lines"]
+    return lines
+
+
+def get_digest(directory):
+    """
+    :param directory: Provide directory of the shapes files
+    :return: SHA-256 hex digest of the shapes files the serializers are generated from
+    """
+    digest = hashlib.sha256()
+    names = sorted({name for spec in RESOURCE_TYPES.values() for name in spec["shapes"]})
+    for name in names:
+        _, text = read_shapes(directory, name)
+        digest.update(name.encode("utf-8") + b"\0" + text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def generate(directory):
+    """
+    Generate the serializers module
+
+    :param directory: Provide directory of the shapes files
+    :return: Python source of the serializers module
+    """
+    datatypes = "\n" + "".join("    %r: re.compile(%r),\n" % item for item in DATATYPE_PATTERNS.items())
+    lines = [HEADER.rstrip("\n") % (get_digest(directory), datatypes, RDF_TYPE, FOAF + "Agent", FOAF + "name")]
+    for class_name, spec in RESOURCE_TYPES.items():
+        lines += generate_function(class_name, spec, directory)
+    lines += ["", "", "SERIALIZERS = {"]
+    lines += ["    %r: serialize_%s," % (class_name, class_name.lower()) for class_name in RESOURCE_TYPES]
+    lines += ["}", ""]
+    return "\n".join(lines)
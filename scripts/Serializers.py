@@ -0,0 +1,861 @@
+import re
+import RDFTerms
+
+"""
+Serializers of the EJP RD VP resource classes, generated by generate_serializers.py from the shapes in SHACL and the
+properties in SerializerGenerator.RESOURCE_TYPES. Do not edit this file, run generate_serializers.py instead.
+"""
+
+SHAPES_DIGEST = "3da02c7fb4f35b90296a9eb715c77611132dffb0a5b9638e4023be0bb43841cb"
+
+PATTERNS = {
+    'http://www.w3.org/2001/XMLSchema#dateTime': re.compile('-?\\d{4,}-\\d\\d-\\d\\dT\\d\\d:\\d\\d:\\d\\d(\\.\\d+)?(Z|[+-]\\d\\d:\\d\\d)?'),
+    'http://www.w3.org/2001/XMLSchema#date': re.compile('-?\\d{4,}-\\d\\d-\\d\\d(Z|[+-]\\d\\d:\\d\\d)?'),
+    'http://www.w3.org/2001/XMLSchema#integer': re.compile('[+-]?\\d+'),
+    'http://www.w3.org/2001/XMLSchema#boolean': re.compile('true|false|1|0'),
+}
+
+SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+def serialize(resource, subject):
+    """
+    Serialize a resource as N-Triples
+
+    :param resource: Provide resource object of a class with a serializer
+    :param subject: Provide IRI of the resource
+    :return: N-Triples
+    """
+    errors = []
+    lines = SERIALIZERS[type(resource).__name__](resource, "<" + subject + ">", errors)
+    if errors:
+        raise SystemError(type(resource).__name__ + " <" + str(resource.TITLE) + "> does not conform to the shapes: "
+                          + "; ".join(errors))
+    return "".join(lines)
+
+
+def has_serializer(resource):
+    """
+    :param resource: Provide resource object
+    :return: True if the class of the resource has a generated serializer
+    """
+    return type(resource).__name__ in SERIALIZERS
+
+
+def blank_node(subject, lines):
+    """
+    :param subject: Provide subject the blank node is an object of
+    :param lines: Provide list of N-Triples lines of the subject
+    :return: Label of a new blank node, the label of a nested node starts with the label of its subject to keep it
+             unique in the payload
+    """
+    return (subject + "_" if subject.startswith("_:") else "_:b") + str(len(lines))
+
+
+def agent(value, subject, lines, errors):
+    """
+    :param value: Provide publisher value: a resource object, an IRI (optionally between angle brackets) or a name
+    :param subject: Provide subject of the publisher
+    :param lines: Provide list of N-Triples lines the triples of a node are added to
+    :param errors: Provide list the constraint violations are added to
+    :return: Term of the publisher
+    """
+    if has_serializer(value):
+        label = blank_node(subject, lines)
+        lines.extend(SERIALIZERS[type(value).__name__](value, label, errors))
+        return label
+    text = RDFTerms.lexical(value)
+    if text.startswith("<") and text.endswith(">"):
+        text = text[1:-1]
+    if SCHEME.match(text):
+        return RDFTerms.iri(text)
+    label = blank_node(subject, lines)
+    lines.append(label + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://xmlns.com/foaf/0.1/Agent> .\n")
+    lines.append(label + " <http://xmlns.com/foaf/0.1/name> " + RDFTerms.literal(text) + " .\n")
+    return label
+
+
+def serialize_vpbiobank(resource, subject, errors):
+    """
+    Serialize a VPBiobank, generated from the shapes resource, biobank
+
+    :param resource: Provide VPBiobank object
+    :param subject: Provide IRI between angle brackets or blank node label of the resource
+    :param errors: Provide list the constraint violations are added to
+    :return: List of N-Triples lines
+    """
+    lines = [
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Resource> .\n",
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Dataset> .\n",
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <https://w3id.org/ejp-rd/vocabulary#Biobank> .\n",
+    ]
+
+    # dct:isPartOf
+    values = RDFTerms.values(resource.PARENT_URL)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/isPartOf> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:license: maxCount 1
+    values = RDFTerms.values(resource.LICENSE)
+    if len(values) > 1:
+        errors.append("dct:license allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/license> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:title: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.TITLE)
+    if len(values) < 1:
+        errors.append("dct:title needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:title allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:description: maxCount 1
+    values = RDFTerms.values(resource.DESCRIPTION)
+    if len(values) > 1:
+        errors.append("dct:description allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/description> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:theme: minCount 1
+    values = RDFTerms.values(resource.THEME)
+    if len(values) < 1:
+        errors.append("dcat:theme needs at least 1 value(s)")
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#theme> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:publisher: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.PUBLISHER)
+    if len(values) < 1:
+        errors.append("dct:publisher needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:publisher allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/publisher> " + agent(value, subject, lines, errors) + " .\n")
+
+    # dct:language: maxCount 1
+    values = RDFTerms.values(resource.LANGUAGE)
+    if len(values) > 1:
+        errors.append("dct:language allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/language> " + RDFTerms.iri(value) + " .\n")
+
+    # ejp:personalData
+    values = RDFTerms.values(resource.PERSONALDATA)
+    for value in values:
+        lines.append(subject + " <https://w3id.org/ejp-rd/vocabulary#personalData> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:hasVersion: minCount 1, maxCount 1
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    if len(values) < 1:
+        errors.append("dct:hasVersion needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:hasVersion allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/hasVersion> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:version
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#version> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:conformsTo
+    values = RDFTerms.values(resource.CONFORMSTO)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/conformsTo> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:keyword
+    values = (RDFTerms.values(resource.KEYWORD) or ['resource'])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#keyword> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:logo
+    values = RDFTerms.values(resource.LOGO)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/logo> " + RDFTerms.iri(value) + " .\n")
+
+    # odrl:hasPolicy
+    values = RDFTerms.values(resource.HASPOLICY)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/odrl/2/hasPolicy> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:identifier
+    values = RDFTerms.values(resource.IDENTIFIER)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/identifier> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:issued
+    values = RDFTerms.values(resource.ISSUED)
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:issued value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/issued> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:modified
+    values = RDFTerms.values(resource.MODIFIED)
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:modified value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/modified> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:accessRights
+    values = RDFTerms.values(resource.ACCESSRIGHTS)[:1]
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/accessRights> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:landingPage
+    values = RDFTerms.values(resource.LANDINGPAGE)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#landingPage> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:distribution
+    values = RDFTerms.values(resource.DISTRIBUTION)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#distribution> " + RDFTerms.iri(value) + " .\n")
+
+    # ejp:populationCoverage
+    values = RDFTerms.values(resource.POPULATIONCOVERAGE)
+    for value in values:
+        label = blank_node(subject, lines)
+        lines.append(subject + " <https://w3id.org/ejp-rd/vocabulary#populationCoverage> " + label + " .\n")
+        lines.append(label + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://semanticscience.org/resource/SIO_001166> .\n")
+        if RDFTerms.lexical(value) not in ('National', 'International', 'Regional', 'European'):
+            errors.append("rdfs:label value %s is not one of National, International, Regional, European" % RDFTerms.lexical(value))
+        lines.append(label + " <http://www.w3.org/2000/01/rdf-schema#label> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+    return lines
+
+
+def serialize_vppatientregistry(resource, subject, errors):
+    """
+    Serialize a VPPatientRegistry, generated from the shapes resource, patientregistry
+
+    :param resource: Provide VPPatientRegistry object
+    :param subject: Provide IRI between angle brackets or blank node label of the resource
+    :param errors: Provide list the constraint violations are added to
+    :return: List of N-Triples lines
+    """
+    lines = [
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Resource> .\n",
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Dataset> .\n",
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <https://w3id.org/ejp-rd/vocabulary#PatientRegistry> .\n",
+    ]
+
+    # dct:isPartOf
+    values = RDFTerms.values(resource.PARENT_URL)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/isPartOf> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:license: maxCount 1
+    values = RDFTerms.values(resource.LICENSE)
+    if len(values) > 1:
+        errors.append("dct:license allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/license> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:title: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.TITLE)
+    if len(values) < 1:
+        errors.append("dct:title needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:title allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:description: maxCount 1
+    values = RDFTerms.values(resource.DESCRIPTION)
+    if len(values) > 1:
+        errors.append("dct:description allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/description> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:theme: minCount 1
+    values = RDFTerms.values(resource.THEME)
+    if len(values) < 1:
+        errors.append("dcat:theme needs at least 1 value(s)")
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#theme> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:publisher: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.PUBLISHER)
+    if len(values) < 1:
+        errors.append("dct:publisher needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:publisher allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/publisher> " + agent(value, subject, lines, errors) + " .\n")
+
+    # dct:language: maxCount 1
+    values = RDFTerms.values(resource.LANGUAGE)
+    if len(values) > 1:
+        errors.append("dct:language allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/language> " + RDFTerms.iri(value) + " .\n")
+
+    # ejp:personalData
+    values = RDFTerms.values(resource.PERSONALDATA)
+    for value in values:
+        lines.append(subject + " <https://w3id.org/ejp-rd/vocabulary#personalData> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:hasVersion: minCount 1, maxCount 1
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    if len(values) < 1:
+        errors.append("dct:hasVersion needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:hasVersion allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/hasVersion> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:version
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#version> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:conformsTo
+    values = RDFTerms.values(resource.CONFORMSTO)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/conformsTo> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:keyword
+    values = (RDFTerms.values(resource.KEYWORD) or ['resource'])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#keyword> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:logo
+    values = RDFTerms.values(resource.LOGO)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/logo> " + RDFTerms.iri(value) + " .\n")
+
+    # odrl:hasPolicy
+    values = RDFTerms.values(resource.HASPOLICY)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/odrl/2/hasPolicy> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:identifier
+    values = RDFTerms.values(resource.IDENTIFIER)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/identifier> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:issued
+    values = RDFTerms.values(resource.ISSUED)
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:issued value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/issued> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:modified
+    values = RDFTerms.values(resource.MODIFIED)
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:modified value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/modified> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:accessRights
+    values = RDFTerms.values(resource.ACCESSRIGHTS)[:1]
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/accessRights> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:landingPage
+    values = RDFTerms.values(resource.LANDINGPAGE)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#landingPage> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:distribution
+    values = RDFTerms.values(resource.DISTRIBUTION)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#distribution> " + RDFTerms.iri(value) + " .\n")
+
+    # ejp:populationCoverage
+    values = RDFTerms.values(resource.POPULATIONCOVERAGE)
+    for value in values:
+        label = blank_node(subject, lines)
+        lines.append(subject + " <https://w3id.org/ejp-rd/vocabulary#populationCoverage> " + label + " .\n")
+        lines.append(label + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://semanticscience.org/resource/SIO_001166> .\n")
+        if RDFTerms.lexical(value) not in ('National', 'International', 'Regional', 'European'):
+            errors.append("rdfs:label value %s is not one of National, International, Regional, European" % RDFTerms.lexical(value))
+        lines.append(label + " <http://www.w3.org/2000/01/rdf-schema#label> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+    return lines
+
+
+def serialize_vpdataset(resource, subject, errors):
+    """
+    Serialize a VPDataset, generated from the shapes resource, dataset
+
+    :param resource: Provide VPDataset object
+    :param subject: Provide IRI between angle brackets or blank node label of the resource
+    :param errors: Provide list the constraint violations are added to
+    :return: List of N-Triples lines
+    """
+    lines = [
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Resource> .\n",
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Dataset> .\n",
+    ]
+
+    # dct:isPartOf
+    values = RDFTerms.values(resource.PARENT_URL)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/isPartOf> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:license: maxCount 1
+    values = RDFTerms.values(resource.LICENSE)
+    if len(values) > 1:
+        errors.append("dct:license allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/license> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:title: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.TITLE)
+    if len(values) < 1:
+        errors.append("dct:title needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:title allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:description: maxCount 1
+    values = RDFTerms.values(resource.DESCRIPTION)
+    if len(values) > 1:
+        errors.append("dct:description allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/description> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:theme
+    values = RDFTerms.values(resource.THEME)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#theme> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:publisher: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.PUBLISHER)
+    if len(values) < 1:
+        errors.append("dct:publisher needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:publisher allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/publisher> " + agent(value, subject, lines, errors) + " .\n")
+
+    # dct:language: maxCount 1
+    values = RDFTerms.values(resource.LANGUAGE)
+    if len(values) > 1:
+        errors.append("dct:language allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/language> " + RDFTerms.iri(value) + " .\n")
+
+    # ejp:personalData
+    values = RDFTerms.values(resource.PERSONALDATA)
+    for value in values:
+        lines.append(subject + " <https://w3id.org/ejp-rd/vocabulary#personalData> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:hasVersion: minCount 1, maxCount 1
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    if len(values) < 1:
+        errors.append("dct:hasVersion needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:hasVersion allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/hasVersion> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:version
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#version> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:conformsTo
+    values = RDFTerms.values(resource.CONFORMSTO)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/conformsTo> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:keyword
+    values = (RDFTerms.values(resource.KEYWORD) or ['resource'])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#keyword> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:logo
+    values = RDFTerms.values(resource.LOGO)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/logo> " + RDFTerms.iri(value) + " .\n")
+
+    # odrl:hasPolicy
+    values = RDFTerms.values(resource.HASPOLICY)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/odrl/2/hasPolicy> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:identifier
+    values = RDFTerms.values(resource.IDENTIFIER)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/identifier> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:issued: maxCount 1
+    values = RDFTerms.values(resource.ISSUED)
+    if len(values) > 1:
+        errors.append("dct:issued allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:issued value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/issued> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:modified: maxCount 1
+    values = RDFTerms.values(resource.MODIFIED)
+    if len(values) > 1:
+        errors.append("dct:modified allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:modified value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/modified> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:accessRights
+    values = RDFTerms.values(resource.ACCESSRIGHTS)[:1]
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/accessRights> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:landingPage: maxCount 1
+    values = RDFTerms.values(resource.LANDINGPAGE)[:1]
+    if len(values) > 1:
+        errors.append("dcat:landingPage allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#landingPage> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:distribution
+    values = RDFTerms.values(resource.DISTRIBUTION)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#distribution> " + RDFTerms.iri(value) + " .\n")
+    return lines
+
+
+def serialize_vpdataservice(resource, subject, errors):
+    """
+    Serialize a VPDataService, generated from the shapes resource, dataservice
+
+    :param resource: Provide VPDataService object
+    :param subject: Provide IRI between angle brackets or blank node label of the resource
+    :param errors: Provide list the constraint violations are added to
+    :return: List of N-Triples lines
+    """
+    lines = [
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Resource> .\n",
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#DataService> .\n",
+    ]
+
+    # dct:isPartOf
+    values = RDFTerms.values(resource.PARENT_URL)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/isPartOf> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:license: maxCount 1
+    values = RDFTerms.values(resource.LICENSE)
+    if len(values) > 1:
+        errors.append("dct:license allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/license> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:title: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.TITLE)
+    if len(values) < 1:
+        errors.append("dct:title needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:title allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:description: maxCount 1
+    values = RDFTerms.values(resource.DESCRIPTION)
+    if len(values) > 1:
+        errors.append("dct:description allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/description> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:theme
+    values = RDFTerms.values(resource.THEME)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#theme> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:publisher: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.PUBLISHER)
+    if len(values) < 1:
+        errors.append("dct:publisher needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:publisher allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/publisher> " + agent(value, subject, lines, errors) + " .\n")
+
+    # dct:language: maxCount 1
+    values = RDFTerms.values(resource.LANGUAGE)
+    if len(values) > 1:
+        errors.append("dct:language allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/language> " + RDFTerms.iri(value) + " .\n")
+
+    # ejp:personalData
+    values = RDFTerms.values(resource.PERSONALDATA)
+    for value in values:
+        lines.append(subject + " <https://w3id.org/ejp-rd/vocabulary#personalData> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:hasVersion: minCount 1, maxCount 1
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    if len(values) < 1:
+        errors.append("dct:hasVersion needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:hasVersion allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/hasVersion> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:version
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#version> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:conformsTo
+    values = RDFTerms.values(resource.CONFORMSTO)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/conformsTo> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:keyword
+    values = (RDFTerms.values(resource.KEYWORD) or ['resource'])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#keyword> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:logo
+    values = RDFTerms.values(resource.LOGO)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/logo> " + RDFTerms.iri(value) + " .\n")
+
+    # odrl:hasPolicy
+    values = RDFTerms.values(resource.HASPOLICY)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/odrl/2/hasPolicy> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:identifier
+    values = RDFTerms.values(resource.IDENTIFIER)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/identifier> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:issued
+    values = RDFTerms.values(resource.ISSUED)
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:issued value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/issued> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:modified
+    values = RDFTerms.values(resource.MODIFIED)
+    for value in values:
+        text = RDFTerms.lexical(value)
+        if not PATTERNS['http://www.w3.org/2001/XMLSchema#dateTime'].fullmatch(text):
+            errors.append("dct:modified value %s is not a xsd:dateTime" % text)
+        lines.append(subject + " <http://purl.org/dc/terms/modified> " + RDFTerms.typed_literal(text, 'http://www.w3.org/2001/XMLSchema#dateTime') + " .\n")
+
+    # dct:accessRights
+    values = RDFTerms.values(resource.ACCESSRIGHTS)[:1]
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/accessRights> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:landingPage
+    values = RDFTerms.values(resource.LANDINGPAGE)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#landingPage> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:type
+    values = RDFTerms.values(resource.OTYPE)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/type> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:servesDataset
+    values = RDFTerms.values(resource.SERVERSDATASET)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#servesDataset> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:endpointURL: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.ENDPOINTURL)
+    if len(values) < 1:
+        errors.append("dcat:endpointURL needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dcat:endpointURL allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#endpointURL> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:endpointDescription
+    values = RDFTerms.values(resource.ENDPOINTDESCRIPTION)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#endpointDescription> " + RDFTerms.iri(value) + " .\n")
+    return lines
+
+
+def serialize_vpdistribution(resource, subject, errors):
+    """
+    Serialize a VPDistribution, generated from the shapes resource, distribution
+
+    :param resource: Provide VPDistribution object
+    :param subject: Provide IRI between angle brackets or blank node label of the resource
+    :param errors: Provide list the constraint violations are added to
+    :return: List of N-Triples lines
+    """
+    lines = [
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/ns/dcat#Distribution> .\n",
+    ]
+
+    # dct:isPartOf
+    values = RDFTerms.values(resource.ISPARTOF) + RDFTerms.values(resource.PARENT_URL)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/isPartOf> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:license: maxCount 1
+    values = RDFTerms.values(resource.LICENSE)
+    if len(values) > 1:
+        errors.append("dct:license allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/license> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:title: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.TITLE)
+    if len(values) < 1:
+        errors.append("dct:title needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:title allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:description: maxCount 1
+    values = RDFTerms.values(resource.DESCRIPTION)
+    if len(values) > 1:
+        errors.append("dct:description allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/description> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:publisher: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.PUBLISHER)
+    if len(values) < 1:
+        errors.append("dct:publisher needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:publisher allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/publisher> " + agent(value, subject, lines, errors) + " .\n")
+
+    # dcat:version
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#version> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:hasVersion: minCount 1, maxCount 1
+    values = (RDFTerms.values(resource.VERSION) or [1])
+    if len(values) < 1:
+        errors.append("dct:hasVersion needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:hasVersion allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/hasVersion> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:accessRights
+    values = RDFTerms.values(resource.ACCESSRIGHTS)[:1]
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/accessRights> " + RDFTerms.iri(value) + " .\n")
+
+    # odrl:hasPolicy
+    values = RDFTerms.values(resource.HASPOLICY)[:1]
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/odrl/2/hasPolicy> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:mediaType: maxCount 1
+    values = RDFTerms.values(resource.MEDIATYPE)
+    if len(values) > 1:
+        errors.append("dcat:mediaType allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#mediaType> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dcat:accessURL: maxCount 1
+    values = RDFTerms.values(resource.ACCESSURL)
+    if len(values) > 1:
+        errors.append("dcat:accessURL allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#accessURL> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:downloadURL: maxCount 1
+    values = RDFTerms.values(resource.DOWNLOADURL)
+    if len(values) > 1:
+        errors.append("dcat:downloadURL allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#downloadURL> " + RDFTerms.iri(value) + " .\n")
+
+    # dcat:accessService
+    values = RDFTerms.values(resource.ACCESSSERVICE)
+    for value in values:
+        lines.append(subject + " <http://www.w3.org/ns/dcat#accessService> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:conformsTo
+    values = RDFTerms.values(resource.CONFORMSTO)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/conformsTo> " + RDFTerms.iri(value) + " .\n")
+    return lines
+
+
+def serialize_vporganisation(resource, subject, errors):
+    """
+    Serialize a VPOrganisation, generated from the shapes organisation
+
+    :param resource: Provide VPOrganisation object
+    :param subject: Provide IRI between angle brackets or blank node label of the resource
+    :param errors: Provide list the constraint violations are added to
+    :return: List of N-Triples lines
+    """
+    lines = [
+        subject + " <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://xmlns.com/foaf/0.1/Organisation> .\n",
+    ]
+
+    # dct:title: minCount 1, maxCount 1
+    values = RDFTerms.values(resource.TITLE)
+    if len(values) < 1:
+        errors.append("dct:title needs at least 1 value(s)")
+    if len(values) > 1:
+        errors.append("dct:title allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:name
+    values = RDFTerms.values(resource.TITLE)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/name> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:description: maxCount 1
+    values = RDFTerms.values(resource.DESCRIPTION)
+    if len(values) > 1:
+        errors.append("dct:description allows at most 1 value(s), found %d" % len(values))
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/description> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:logo
+    values = RDFTerms.values(resource.LOGO)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/logo> " + RDFTerms.iri(value) + " .\n")
+
+    # dct:spatial
+    values = RDFTerms.values(resource.LOCATION)
+    for value in values:
+        label = blank_node(subject, lines)
+        lines.append(subject + " <http://purl.org/dc/terms/spatial> " + label + " .\n")
+        lines.append(label + " <http://purl.org/dc/terms/title> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # dct:identifier
+    values = RDFTerms.values(resource.IDENTIFIER)
+    for value in values:
+        lines.append(subject + " <http://purl.org/dc/terms/identifier> " + RDFTerms.literal(RDFTerms.lexical(value)) + " .\n")
+
+    # foaf:page
+    values = RDFTerms.values(resource.LANDING_PAGES)
+    for value in values:
+        lines.append(subject + " <http://xmlns.com/foaf/0.1/page> " + RDFTerms.iri(value) + " .\n")
+    return lines
+
+
+SERIALIZERS = {
+    'VPBiobank': serialize_vpbiobank,
+    'VPPatientRegistry': serialize_vppatientregistry,
+    'VPDataset': serialize_vpdataset,
+    'VPDataService': serialize_vpdataservice,
+    'VPDistribution': serialize_vpdistribution,
+    'VPOrganisation': serialize_vporganisation,
+}
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import time
+import Log
+import ResourceEntry
+import RunReport
+
+"""
+Sharded runs. The resources of a run are partitioned into shards that can be uploaded by separate processes, e.g. the
+jobs of a CI matrix. Every worker computes the same partition from the same input, uploads its own shard and writes a
+journal with the FDP URLs of its resources and its run report; the journals are merged into one URL mapping and report.
+"""
+
+logger = Log.get_logger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+def partition(entries, shards):
+    """
+    Method to split resources into shards. A top-level resource and all its descendants, e.g. a dataset with its
+    distributions, are in the same shard, so every parent is created by the worker that creates its children; a
+    resource that links to other resources, e.g. a data service and the datasets it serves, joins their group. The
+    largest groups are assigned first, each to the shard with the fewest resources so far.
+
+    :param entries: Provide list of ResourceEntry objects, parents before their children
+    :param shards: Provide number of shards
+    :return: Dict of resource key to shard number, from 1 to shards
+    """
+    roots = {}
+    groups = {}
+    for entry in entries:
+        # Resources whose parent is not in the run, e.g. the catalog or the root of the FDP, start a group
+        root = roots.get(entry.PARENT_KEY, entry.KEY)
+        for reference in entry.REFERENCES:
+            other = roots.get(reference, root)
+            if other == root:
+                continue
+            if root not in groups:
+                root = other
+            else:
+                for key in groups[other]:
+                    roots[key] = root
+                groups[root].extend(groups.pop(other))
+        roots[entry.KEY] = root
+        groups.setdefault(root, []).append(entry.KEY)
+
+    sizes = [0] * shards
+    plan = {}
+    for root in sorted(groups, key=lambda key: (-len(groups[key]), key)):
+        shard = min(range(shards), key=lambda index: (sizes[index], index))
+        sizes[shard] += len(groups[root])
+        for key in groups[root]:
+            plan[key] = shard + 1
+    return plan
+
+
+def get_plan_digest(plan):
+    """
+    :param plan: Provide dict of resource key to shard number
+    :return: SHA-256 hex digest of the plan, equal in all workers that read the same input
+    """
+    lines = "".join("%s\t%d\n" % (key, shard) for key, shard in sorted(plan.items()))
+    return hashlib.sha256(lines.encode("utf-8")).hexdigest()
+
+
+def write_journal(path, shard, shards, plan_digest, keys, targets, seconds):
+    """
+    Method to write the journal of a worker, through a temporary file so a partly written journal is never merged
+
+    :param path: Provide path of the journal, {shard} is replaced by the shard number
+    :param shard: Provide number of the shard of the worker
+    :param shards: Provide number of shards
+    :param plan_digest: Provide digest of the plan of the worker
+    :param keys: Provide list of the keys of the resources in the shard
+    :param targets: Provide list of UploadTarget objects
+    :param seconds: Provide duration of the run of the worker
+    :return: Path of the journal
+    """
+    path = path.replace("{shard}", str(shard))
+    journal = {"version": JOURNAL_VERSION, "shard": shard, "shards": shards, "plan": plan_digest,
+               "seconds": seconds, "resources": list(keys), "targets": []}
+    for target in targets:
+        journal["targets"].append({
+            "name": target.NAME,
+            "catalog_url": target.URLS[ResourceEntry.CATALOG_KEY],
+            "urls": {key: url for key, url in target.URLS.items()
+                     if key not in (ResourceEntry.CATALOG_KEY, ResourceEntry.ROOT_KEY)},
+            "created": target.CREATED,
+            "existing": target.EXISTING,
+            "changed": target.CHANGED,
+            "updated": target.UPDATED,
+            "error": None if target.ERROR is None else str(target.ERROR),
+            "operations": target.REPORT.get_operations()})
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as journal_file:
+        json.dump(journal, journal_file, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+    logger.info("Journal of shard %d of %d written to %s", shard, shards, path)
+    return path
+
+
+class MergedTarget:
+    """
+    Class contents the merged results of the workers for one FDP target
+    """
+
+    def __init__(self, name, catalog_url):
+        """
+        :param name: Name of the target
+        :param catalog_url: URL of the catalog of the target
+        """
+        self.NAME = name
+        self.CATALOG_URL = catalog_url
+        self.URLS = {}
+        self.CREATED = 0
+        self.EXISTING = 0
+        self.CHANGED = 0
+        self.UPDATED = 0
+        self.ERRORS = []
+        self.REPORT = RunReport.RunReport(name)
+        self.REPORT.add_source(self)
+
+    def get_summary(self):
+        """
+        Method to get the target lines of the merged run report
+
+        :return: List of summary lines
+        """
+        line = "created: %d resources, %d existing (%d differ from the input, %d updated)" % (
+            self.CREATED, self.EXISTING, self.CHANGED, self.UPDATED)
+        return [line + (", FAILED: " + "; ".join(self.ERRORS) if self.ERRORS else ", succeeded")]
+
+
+class JournalMerge:
+    """
+    Class to merge the journals of the workers of a sharded run into one URL mapping and run report per target
+    """
+
+    def __init__(self, paths, shards=None):
+        """
+        :param paths: Provide list of journal paths
+        :param shards: Provide number of shards of the run, or None to take it from the journals
+        """
+        self.PATHS = paths
+        self.SHARDS = shards
+        self.SECONDS = 0
+        self.RESOURCES = 0
+        self.TARGETS = {}
+        self.ERRORS = []
+
+    def merge(self):
+        """
+        Method to read and merge the journals
+        """
+        journals = {}
+        plans = set()
+        for path in self.PATHS:
+            with open(path, encoding="utf-8") as journal_file:
+                journal = json.load(journal_file)
+            if journal.get("version") != JOURNAL_VERSION:
+                raise SystemExit("Journal " + path + " has version " + str(journal.get("version")) + ", expected "
+                                 + str(JOURNAL_VERSION))
+            if self.SHARDS is None:
+                self.SHARDS = journal["shards"]
+            if journal["shards"] != self.SHARDS:
+                raise SystemExit("Journal " + path + " is of a run with " + str(journal["shards"]) + " shards, not "
+                                 + str(self.SHARDS))
+            if journal["shard"] in journals:
+                raise SystemExit("Shard " + str(journal["shard"]) + " has two journals: " + path + " and "
+                                 + journals[journal["shard"]][0])
+            journals[journal["shard"]] = (path, journal)
+            plans.add(journal["plan"])
+
+        if self.SHARDS is None:
+            raise SystemExit("There are no journals to merge")
+        if len(plans) > 1:
+            self.ERRORS.append("the workers partitioned different input, the journals are of different runs")
+        missing = [str(shard) for shard in range(1, self.SHARDS + 1) if shard not in journals]
+        if missing:
+            self.ERRORS.append("no journal of shard " + ", ".join(missing))
+
+        for shard, (path, journal) in sorted(journals.items()):
+            self.SECONDS = max(self.SECONDS, journal["seconds"])
+            self.RESOURCES += len(journal["resources"])
+            for result in journal["targets"]:
+                self.add_target_result(shard, journal["resources"], result)
+
+    def add_target_result(self, shard, keys, result):
+        """
+        Method to merge the result of one worker for one target
+
+        :param shard: Provide number of the shard
+        :param keys: Provide list of the keys of the resources in the shard
+        :param result: Provide target result of the journal
+        """
+        target = self.TARGETS.get(result["name"])
+        if target is None:
+            target = self.TARGETS[result["name"]] = MergedTarget(result["name"], result["catalog_url"])
+        for key, url in result["urls"].items():
+            if target.URLS.get(key, url) != url:
+                target.ERRORS.append("shard %d has another URL for %s" % (shard, key))
+            target.URLS[key] = url
+        target.CREATED += result["created"]
+        target.EXISTING += result["existing"]
+        target.CHANGED += result["changed"]
+        target.UPDATED += result.get("updated", 0)
+        target.REPORT.add_operations(result["operations"])
+        if result["error"] is not None:
+            target.ERRORS.append("shard %d: %s" % (shard, result["error"]))
+        else:
+            unmapped = [key for key in keys if key not in result["urls"]]
+            if unmapped:
+                target.ERRORS.append("shard %d has no URL for %d resources" % (shard, len(unmapped)))
+
+    def write(self, path):
+        """
+        Method to write the merged URL mapping of every target
+
+        :param path: Provide path of the JSON file
+        """
+        mapping = {"shards": self.SHARDS,
+                   "targets": {name: {"catalog_url": target.CATALOG_URL, "urls": target.URLS}
+                               for name, target in sorted(self.TARGETS.items())}}
+        with open(path, "w", encoding="utf-8") as mapping_file:
+            json.dump(mapping, mapping_file, indent=1, sort_keys=True)
+        logger.info("URL mapping of %d targets written to %s", len(self.TARGETS), path)
+
+    def print_summary(self):
+        """
+        Method to log the merged run report of every target
+        """
+        logger.info("Merged %d journals of %s shards: %d resources, longest shard %.2f s", len(self.PATHS),
+                    self.SHARDS, self.RESOURCES, self.SECONDS)
+        for target in self.TARGETS.values():
+            # The shards ran at the same time, so the report covers the duration of the longest one
+            target.REPORT.start_time = time.monotonic() - self.SECONDS
+            target.REPORT.print_summary()
+
+    def check(self):
+        """
+        Method to stop with an error if a shard is missing or failed
+        """
+        errors = self.ERRORS + [target.NAME + ": " + error for target in self.TARGETS.values()
+                                for error in target.ERRORS]
+        if errors:
+            raise SystemExit("Sharded run failed: " + "; ".join(errors))
+
+
+def merge(paths, output=None, shards=None):
+    """
+    Method to merge journals, log the merged report and stop with an error if the sharded run failed
+
+    :param paths: Provide list of journal paths
+    :param output: Provide path of the merged URL mapping, or None
+    :param shards: Provide number of shards of the run, or None to take it from the journals
+    """
+    journal_merge = JournalMerge(paths, shards)
+    journal_merge.merge()
+    if output:
+        journal_merge.write(output)
+    journal_merge.print_summary()
+    journal_merge.check()
@@ -0,0 +1,39 @@
+import os
+import threading
+import chevron
+
+
+"""
+Cache of the mustache templates. Every template is read and tokenized once per process and reused for all resources
+and workbooks.
+"""
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "templates")
+
+_tokens = {}
+_lock = threading.Lock()
+
+
+def get_tokens(name):
+    """
+    :param name: Provide template name without extension, e.g. dataset
+    :return: List of chevron tokens of the template
+    """
+    tokens = _tokens.get(name)
+    if tokens is None:
+        with open(os.path.join(TEMPLATE_DIR, name + ".mustache"), 'r') as f:
+            tokens = list(chevron.tokenizer.tokenize(f.read()))
+        with _lock:
+            _tokens[name] = tokens
+    return tokens
+
+
+def render(name, data):
+    """
+    Render a cached mustache template
+
+    :param name: Provide template name without extension, e.g. dataset
+    :param data: Provide dict of template variables
+    :return: Rendered template
+    """
+    return chevron.render(get_tokens(name), data)
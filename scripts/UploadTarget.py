@@ -0,0 +1,382 @@
+import Log
+import CatalogIndex
+import Pruner
+import Registry
+import FDPClient
+import FakeFDP
+import ResourceEntry
+import RunReport
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = Log.get_logger(__name__)
+
+
+class UploadTarget:
+    """
+    Class contents a FAIR Data Point the resources are uploaded to, with its own client, catalog and mapping of
+    resource keys to FDP URLs
+    """
+
+    def __init__(self, name, fdp_url, username, password, persistent_url, catalog_url, config, session=None):
+        """
+        :param name: Name of the target in the logs and run report
+        :param fdp_url: URL of the FDP
+        :param username: Username in the FDP
+        :param password: Password in the FDP
+        :param persistent_url: Persistent URL of the FDP
+        :param catalog_url: URL of the catalog the resources are added to
+        :param config: Settings object of the run
+        :param session: Shared requests session, a new session is created if it is not provided
+        """
+        if config.SIMULATE:
+            # Send all requests to an in-process fake FDP in which only the root and the catalog exist
+            session = FakeFDP.FakeFDP(fdp_url, [fdp_url, catalog_url], config.SIMULATION_LATENCY,
+                                      config.SIMULATION_LATENCY_STDDEV, config.SIMULATION_BANDWIDTH,
+                                      config.SIMULATION_ERROR_RATE, config.SIMULATION_SEED)
+
+        self.NAME = name
+        self.CONFIG = config
+        self.REPORT = RunReport.RunReport(name)
+        self.FDP_CLIENT = FDPClient.FDPClient(fdp_url, username, password, persistent_url, config, self.REPORT,
+                                              session)
+        self.URLS = {ResourceEntry.CATALOG_KEY: catalog_url, ResourceEntry.ROOT_KEY: persistent_url or fdp_url}
+        self.CREATED = 0
+        self.EXISTING = 0
+        self.CHANGED = 0
+        self.UPDATED = 0
+        self.FAILED = set()
+        self.INDEX = None
+        self.CATALOGS = {}
+        self.REGISTRY = Registry.Registry(config.REGISTRY_FILE) if config.REGISTRY_FILE else None
+        self.REGISTERED = 0
+        self.PRUNER = None
+        self.ERROR = None
+        self.lock = threading.Lock()
+        self.REPORT.add_source(self)
+
+    def upload(self, waves):
+        """
+        Method to upload rendered resources, wave by wave so parents exist before their children
+
+        :param waves: Provide list of lists of ResourceEntry objects
+        :return: True if all resources were created
+        """
+        try:
+            catalog_titles = [entry.RESOURCE.TITLE for wave in waves for entry in wave if entry.TYPE == "catalog"]
+            linked_catalogs = self.get_linked_catalogs(waves)
+            if catalog_titles or linked_catalogs:
+                self.find_catalogs(catalog_titles + sorted(set(linked_catalogs.values())))
+            if linked_catalogs:
+                self.link_catalogs(linked_catalogs)
+            # Pruning compares the catalog with the input, which requires reconciling existing resources
+            if self.CONFIG.RECONCILE or self.CONFIG.PRUNE:
+                self.crawl()
+            if self.REGISTRY is not None:
+                self.find_registered(waves)
+            for wave in waves:
+                self.create_resources(wave)
+            if self.CONFIG.PRUNE:
+                self.prune()
+            if (catalog_titles or linked_catalogs) and self.CONFIG.CATALOG_CACHE and not self.CONFIG.DRY_RUN:
+                self.save_catalogs()
+        except (Exception, SystemExit) as error:
+            self.ERROR = error
+            logger.error("Upload to %s failed: %s", self.NAME, error)
+        return self.ERROR is None
+
+    def find_catalogs(self, titles):
+        """
+        Method to find the catalogs of the input that already exist under the root of the FDP. The URLs in the catalog
+        cache are checked first, the catalogs that are not in the cache are looked up by title in the root.
+
+        :param titles: Provide list of catalog titles
+        """
+        cache = self.CONFIG.CATALOG_CACHE.replace("{target}", self.NAME) if self.CONFIG.CATALOG_CACHE else None
+        cached = {}
+        if cache and os.path.exists(cache):
+            with open(cache, encoding="utf-8") as cache_file:
+                cached = {title: url for title, url in json.load(cache_file).items() if title in titles}
+        if cached:
+            with ThreadPoolExecutor(max_workers=max(1, self.CONFIG.CRAWL_CONCURRENCY)) as executor:
+                exists = list(executor.map(self.FDP_CLIENT.does_metadata_exists, cached.values()))
+            self.CATALOGS.update({title: url for (title, url), found in zip(cached.items(), exists) if found})
+
+        missing = [title for title in titles if title not in self.CATALOGS]
+        if missing:
+            root_url = self.URLS[ResourceEntry.ROOT_KEY]
+            crawler = CatalogIndex.CatalogCrawler(self.FDP_CLIENT, self.CONFIG.CRAWL_CONCURRENCY)
+            root = crawler.crawl(root_url, depth=1)
+            for title in missing:
+                existing = root.find("catalog", root_url, title)
+                if existing is not None:
+                    self.CATALOGS[title] = existing["url"]
+        logger.info("%d of %d catalogs exist in %s (%d from the cache)", len(self.CATALOGS), len(titles), self.NAME,
+                    len(set(cached.values()) & set(self.CATALOGS.values())))
+
+    @staticmethod
+    def get_linked_catalogs(waves):
+        """
+        :param waves: Provide list of lists of ResourceEntry objects
+        :return: Dict of key to title of the catalogs the resources are added to that are not created in the run
+        """
+        keys = {entry.KEY for wave in waves for entry in wave}
+        return {entry.PARENT_KEY: entry.PARENT_KEY.split("/", 1)[1] for wave in waves for entry in wave
+                if entry.PARENT_KEY.startswith("catalog/") and entry.PARENT_KEY not in keys}
+
+    def link_catalogs(self, linked_catalogs):
+        """
+        Method to add the resources to existing catalogs that are not created in the run
+
+        :param linked_catalogs: Provide dict of key to title of the catalogs
+        """
+        missing = sorted(title for title in linked_catalogs.values() if title not in self.CATALOGS)
+        if missing:
+            raise SystemExit("The catalogs <" + ">, <".join(missing) + "> do not exist in " + self.NAME + ", add them "
+                             "to catalog_file or set create_catalogs to create the catalogs of the Catalog sheet")
+        with self.lock:
+            self.URLS.update({key: self.CATALOGS[title] for key, title in linked_catalogs.items()})
+
+    def can_record(self):
+        """
+        :return: True if the URLs of the run are real FDP URLs that can be recorded in the registry
+        """
+        return self.REGISTRY is not None and not self.CONFIG.DRY_RUN and not self.CONFIG.SIMULATE
+
+    def find_registered(self, waves):
+        """
+        Method to look up the resources the run links to but does not upload, e.g. the datasets of an earlier run, in
+        the registry
+
+        :param waves: Provide list of lists of ResourceEntry objects
+        """
+        keys = {entry.KEY for wave in waves for entry in wave}
+        linked = {key for wave in waves for entry in wave for key in [entry.PARENT_KEY] + entry.REFERENCES}
+        missing = sorted(linked - keys - set(self.URLS))
+        if not missing:
+            return
+        found = self.REGISTRY.lookup(self.URLS[ResourceEntry.ROOT_KEY], missing)
+        self.URLS.update(found)
+        logger.info("Found %d of %d linked resources in the registry for %s", len(found), len(missing), self.NAME)
+        unknown = [key for key in missing if key not in found]
+        if unknown:
+            raise SystemExit("The linked resources <" + ">, <".join(unknown) + "> are not in the input or the registry")
+
+    def record_urls(self, resources):
+        """
+        Method to record the URLs of the resources of the run in the registry
+
+        :param resources: Provide list of (key, type, title) tuples of the resources of the run
+        """
+        if not self.can_record():
+            return
+        self.REGISTERED = self.REGISTRY.record(self.URLS[ResourceEntry.ROOT_KEY],
+                                               [(key, self.URLS[key], resource_type, title)
+                                                for key, resource_type, title in resources if key in self.URLS])
+
+    def save_catalogs(self):
+        """
+        Method to write the URLs of the catalogs to the catalog cache, the catalogs of earlier runs are kept
+        """
+        cache = self.CONFIG.CATALOG_CACHE.replace("{target}", self.NAME)
+        catalogs = {}
+        if os.path.exists(cache):
+            with open(cache, encoding="utf-8") as cache_file:
+                catalogs = json.load(cache_file)
+        catalogs.update(self.CATALOGS)
+        with open(cache, "w", encoding="utf-8") as cache_file:
+            json.dump(catalogs, cache_file, indent=1, sort_keys=True)
+
+    def crawl(self):
+        """
+        Method to index the resources that already exist in the catalog and in the existing catalogs of the input, and
+        write the index if configured
+        """
+        crawler = CatalogIndex.CatalogCrawler(self.FDP_CLIENT, self.CONFIG.CRAWL_CONCURRENCY)
+        self.REPORT.add_source(crawler)
+        self.INDEX = crawler.crawl(self.URLS[ResourceEntry.CATALOG_KEY])
+        for catalog_url in sorted(set(self.CATALOGS.values())):
+            crawler.crawl(catalog_url, self.INDEX)
+        if self.can_record():
+            # The crawled resources are recorded by type and title, the resources of the run replace them later
+            crawled = [entry for entry in self.INDEX.entries.values()
+                       if entry["title"] is not None and entry["parent"] is not None]
+            self.REGISTRY.record(self.URLS[ResourceEntry.ROOT_KEY],
+                                 [(ResourceEntry.resource_key(entry["type"], entry["title"]), entry["url"],
+                                   entry["type"], entry["title"]) for entry in crawled])
+        if self.CONFIG.INDEX_FILE:
+            self.INDEX.save(self.CONFIG.INDEX_FILE.replace("{target}", self.NAME))
+
+    def prune(self):
+        """
+        Method to delete the resources of the catalog that are not in the input, or list them in a dry run
+        """
+        prune_log = self.CONFIG.PRUNE_LOG.replace("{target}", self.NAME) if self.CONFIG.PRUNE_LOG else None
+        self.PRUNER = Pruner.Pruner(self.FDP_CLIENT, self.INDEX, self.CONFIG.PRUNE_CONCURRENCY,
+                                    self.CONFIG.PRUNE_RETRIES, self.CONFIG.DRY_RUN, prune_log)
+        self.REPORT.add_source(self.PRUNER)
+        self.PRUNER.prune(set(self.URLS.values()))
+        if self.can_record():
+            self.REGISTRY.forget(self.URLS[ResourceEntry.ROOT_KEY], [result["url"] for result in self.PRUNER.results
+                                                                      if result["result"] in ("deleted", "not found")])
+        failed = self.PRUNER.get_failed()
+        if failed:
+            raise SystemError("Could not delete " + str(len(failed)) + " stale resources")
+
+    def create_resources(self, entries):
+        """
+        Method to create independent resources, concurrently if max_concurrency is larger than one
+
+        :param entries: Provide list of ResourceEntry objects
+        :return: List of FDP URLs in the order of the entries
+        """
+        create = self.create_simulated if self.CONFIG.SIMULATE else self.create_resource
+        if self.CONFIG.MAX_CONCURRENCY <= 1 or len(entries) <= 1:
+            return [create(entry) for entry in entries]
+
+        with ThreadPoolExecutor(max_workers=self.CONFIG.MAX_CONCURRENCY) as executor:
+            futures = [executor.submit(create, entry) for entry in entries]
+            return [future.result() for future in futures]
+
+    def create_simulated(self, entry):
+        """
+        Method to create a resource in a simulation. A resource that still fails after its retries does not stop the
+        upload but is counted, like the resources that need it, so the run report covers the whole input.
+
+        :param entry: Provide ResourceEntry object
+        :return: FDP URL of the resource, or None if it failed
+        """
+        failed = [key for key in [entry.PARENT_KEY] + entry.REFERENCES if key in self.FAILED]
+        try:
+            if failed:
+                raise SystemError("it needs the failed resource <" + failed[0] + ">")
+            return self.create_resource(entry)
+        except SystemError as error:
+            with self.lock:
+                self.FAILED.add(entry.KEY)
+            logger.warning("Simulated upload of %s to %s failed: %s", entry.KEY, self.NAME, error)
+            return None
+
+    def create_resource(self, entry):
+        """
+        Method to create a rendered resource in the FDP
+
+        :param entry: Provide ResourceEntry object
+        :return: FDP URL of the resource
+        """
+        # Check if parent exists
+        parent_url = self.URLS.get(entry.PARENT_KEY)
+        if parent_url is None:
+            raise SystemExit("The parent <" + entry.PARENT_KEY + "> of " + entry.KEY + " has not been created")
+
+        # Parents in the index of the catalog are known to exist
+        known_parent = self.INDEX is not None and self.INDEX.contains(parent_url)
+        if not self.CONFIG.DRY_RUN and not known_parent and not self.FDP_CLIENT.does_metadata_exists(parent_url):
+            raise SystemExit("The parent metadata <"+parent_url+"> does not exist. Provide valid catalog URL")
+
+        logger.debug("The parent <%s> exists", parent_url)
+
+        # Replace placeholders by the URLs in this FDP
+        post_body = ResourceEntry.resolve(entry.get_payload(), self.URLS)
+
+        identifier = getattr(entry.RESOURCE, "IDENTIFIER", None)
+        if entry.TYPE == "catalog" and entry.RESOURCE.TITLE in self.CATALOGS:
+            return self.use_existing(entry, {"url": self.CATALOGS[entry.RESOURCE.TITLE], "hash": None}, post_body)
+        if self.INDEX is not None:
+            existing = self.INDEX.find(entry.TYPE, parent_url, entry.RESOURCE.TITLE, identifier)
+            if existing is not None:
+                return self.use_existing(entry, existing, post_body)
+
+        # Send to FDP
+        if self.CONFIG.DRY_RUN:
+            resource_url = "http://example.org/" + entry.TYPE + "/" + str(uuid.uuid4())
+        else:
+            resource_url = self.FDP_CLIENT.fdp_create_metadata(
+                post_body, entry.TYPE, lambda: self.find_created(entry, parent_url, identifier))
+
+        with self.lock:
+            self.URLS[entry.KEY] = resource_url
+            self.CREATED += 1
+            if entry.TYPE == "catalog":
+                self.CATALOGS[entry.RESOURCE.TITLE] = resource_url
+        if self.INDEX is not None:
+            self.INDEX.add(resource_url, entry.TYPE, entry.RESOURCE.TITLE, identifier, parent_url)
+        logger.info("New %s created in %s: %s", entry.TYPE, self.NAME, resource_url)
+        return resource_url
+
+    def find_created(self, entry, parent_url, identifier):
+        """
+        Method to look for the resource a failed create request may have created, before the request is sent again.
+        Only the children of the parent that are not known resources of the run or the index are fetched.
+
+        :param entry: Provide ResourceEntry object
+        :param parent_url: Provide FDP URL of the parent
+        :param identifier: Provide identifier of the resource, or None
+        :return: FDP URL of the resource, or None if it was not created
+        """
+        crawler = CatalogIndex.CatalogCrawler(self.FDP_CLIENT, self.CONFIG.CRAWL_CONCURRENCY)
+        parent = crawler.fetch(parent_url)
+        if parent is None:
+            return None
+        with self.lock:
+            known = set(self.URLS.values())
+        children = [url for url in crawler.get_child_urls(parent, parent_url)
+                    if url not in known and (self.INDEX is None or not self.INDEX.contains(url))]
+        index = CatalogIndex.CatalogIndex(parent_url)
+        for url in children:
+            graph = crawler.fetch(url)
+            if graph is not None:
+                crawler.add_to_index(index, graph, url, parent_url)
+        created = index.find(entry.TYPE, parent_url, entry.RESOURCE.TITLE, identifier)
+        return created["url"] if created is not None else None
+
+    def use_existing(self, entry, existing, post_body):
+        """
+        Method to use a resource that already exists in the catalog instead of creating it again. The resource is
+        updated with the payload if it is made from a changed row.
+
+        :param entry: Provide ResourceEntry object
+        :param existing: Provide index entry of the existing resource
+        :param post_body: Provide resolved payload of the resource
+        :return: FDP URL of the existing resource
+        """
+        content_hash = CatalogIndex.payload_hash(post_body)
+        changed = existing["hash"] is not None and existing["hash"] != content_hash
+        # A resource of a changed row is updated unless it is known to have the same content
+        update = entry.UPDATE and existing["hash"] != content_hash
+        if update and not self.CONFIG.DRY_RUN:
+            self.FDP_CLIENT.fdp_update_metadata(existing["url"], ResourceEntry.set_subject(post_body, existing["url"]))
+            existing["hash"] = content_hash
+        with self.lock:
+            self.URLS[entry.KEY] = existing["url"]
+            self.EXISTING += 1
+            if changed:
+                self.CHANGED += 1
+            if update:
+                self.UPDATED += 1
+        if update:
+            logger.info("Existing %s in %s updated: %s", entry.TYPE, self.NAME, existing["url"])
+        else:
+            logger.info("Existing %s in %s%s: %s", entry.TYPE, self.NAME, " differs from the input" if changed else "",
+                        existing["url"])
+        return existing["url"]
+
+    def get_summary(self):
+        """
+        Method to get the target lines of the run report
+
+        :return: List of summary lines
+        """
+        created = "created: %d resources" % self.CREATED
+        if self.FAILED:
+            created += ", %d failed" % len(self.FAILED)
+        if self.INDEX is not None or self.EXISTING:
+            created += ", %d existing (%d differ from the input, %d updated)" % (self.EXISTING, self.CHANGED,
+                                                                                 self.UPDATED)
+        lines = [created + (", FAILED: %s" % self.ERROR if self.ERROR is not None else ", succeeded")]
+        if self.REGISTERED:
+            lines.append("registry: %d resources recorded in %s" % (self.REGISTERED, self.REGISTRY.PATH))
+        return lines
@@ -1,4 +1,5 @@
-import chevron
+import RDFTerms
+import Templates
 
 class Utils:
     """
@@ -12,12 +13,11 @@ class Utils:
         :param resource: Provide resource object
         :param graph: Provide RDF graph
         """
-        with open('../templates/resource.mustache', 'r') as f:
-            turtle_string = chevron.render(f, {'description': resource.DESCRIPTION, 'title': resource.TITLE,
-                                      'parent_url': resource.PARENT_URL,
-                                      'publisher_url': resource.PUBLISHER_URL,
-                                      'publisher_name': resource.PUBLISHER_URL})
-            graph.parse(data=turtle_string, format="turtle")
+        turtle_string = Templates.render('resource', {'description': resource.DESCRIPTION, 'title': resource.TITLE,
+                                                      'parent_url': resource.PARENT_URL,
+                                                      'publisher_url': resource.PUBLISHER_URL,
+                                                      'publisher_name': resource.PUBLISHER_URL})
+        graph.parse(data=turtle_string, format="turtle")
 
     def add_language_triples(self, resource, graph):
         """
@@ -27,9 +27,8 @@ class Utils:
         :param graph: Provide RDF graph
         """
         if resource.LANGUAGE_URL:
-            with open('../templates/language.mustache', 'r') as f:
-                turtle_string = chevron.render(f, {'language_url': resource.LANGUAGE_URL})
-                graph.parse(data=turtle_string, format="turtle")
+            turtle_string = Templates.render('language', {'language_url': resource.LANGUAGE_URL})
+            graph.parse(data=turtle_string, format="turtle")
 
     def add_licence_triples(self, resource, graph):
         """
@@ -39,32 +38,23 @@ class Utils:
         :param graph: Provide RDF graph
         """
         if resource.LICENSE_URL:
-            with open('../templates/license.mustache', 'r') as f:
-                turtle_string = chevron.render(f, {'license_url': resource.LICENSE_URL})
-                graph.parse(data=turtle_string, format="turtle")
+            turtle_string = Templates.render('license', {'license_url': resource.LICENSE_URL})
+            graph.parse(data=turtle_string, format="turtle")
     
     def list_to_rdf_literals(self, literal_list):
-        # Return empty string if None
-        if literal_list == None:
-            return ""
-
-        # Create literal list
-        literal_str = ""
-        for literal in literal_list:
-            literal_str = literal_str + ' "' + literal + '",'
-        literal_str = literal_str[:-1]
+        """
+        This method serializes a list of values as Turtle literals
 
-        return literal_str
+        :param literal_list: Provide list of values or None
+        :return: Comma separated literals, or an empty string
+        """
+        return RDFTerms.literal_list(literal_list)
 
     def list_to_rdf_URIs(self, URI_list):
-        # Return empty string if None
-        if URI_list == None:
-            return ""
-
-        # Create URI list
-        URI_str = ""
-        for URI in URI_list:
-            URI_str = URI_str + " <" + URI + ">,"
-        URI_str = URI_str[:-1]
+        """
+        This method serializes a list of URIs as Turtle IRIs
 
-        return URI_str
\ No newline at end of file
+        :param URI_list: Provide list of URIs or None
+        :return: Comma separated IRIs, or an empty string
+        """
+        return RDFTerms.iri_list(URI_list)
@@ -0,0 +1,333 @@
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from urllib.parse import unquote
+import Log
+from rdflib import Graph, URIRef, Literal
+from rdflib.namespace import RDFS, SKOS
+from rdflib.util import guess_format
+
+"""
+Local index of the terms of the vocabularies the metadata uses, to check and resolve theme, language, license and
+access rights values without network access. The IRIs and labels of the vocabulary snapshots are written once to an
+index file with an open addressing hash table, which is memory-mapped, so a lookup reads a few bytes of the file.
+"""
+
+logger = Log.get_logger(__name__)
+
+# Known vocabularies by name: the namespaces of their IRIs and the prefix of their compact IRIs, e.g. DOID:1234
+VOCABULARIES = {
+    "edam": (("http://edamontology.org/",), None),
+    "doid": (("http://purl.obolibrary.org/obo/DOID_",), "DOID"),
+    "ordo": (("http://www.orpha.net/ORDO/Orphanet_",), "Orphanet"),
+    "ncit": (("http://purl.obolibrary.org/obo/NCIT_", "http://ncicb.nci.nih.gov/xml/owl/EVS/Thesaurus.owl#"), "NCIT"),
+    "iso639-1": (("http://id.loc.gov/vocabulary/iso639-1/",), None),
+    "license": (("http://spdx.org/licenses/", "https://spdx.org/licenses/", "http://creativecommons.org/licenses/",
+                 "https://creativecommons.org/licenses/", "http://rdflicense.appspot.com/rdflicense/"), "SPDX"),
+    "access-right": (("http://publications.europa.eu/resource/authority/access-right/",), None),
+}
+
+# Vocabularies the values of a resource attribute are checked against
+ATTRIBUTE_VOCABULARIES = {
+    "THEME": ("edam", "doid", "ordo", "ncit"),
+    "THEMES": ("edam", "doid", "ordo", "ncit"),
+    "LANGUAGE": ("iso639-1",),
+    "LANGUAGE_URL": ("iso639-1",),
+    "LICENSE": ("license",),
+    "LICENSE_URL": ("license",),
+    "ACCESSRIGHTS": ("access-right",),
+}
+
+# Predicates of the labels that are indexed for label resolution
+LABEL_PREDICATES = (RDFS.label, SKOS.prefLabel, SKOS.altLabel, SKOS.notation,
+                    URIRef("http://www.geneontology.org/formats/oboInOwl#hasExactSynonym"),
+                    URIRef("http://www.loc.gov/mads/rdf/v1#authoritativeLabel"))
+
+MAGIC = b"FDPVOC01"
+HEADER = struct.Struct("<8sIIQQ")
+SLOT = struct.Struct("<QI")
+RECORD = struct.Struct("<BBH")
+TARGET = struct.Struct("<I")
+EMPTY = 0xFFFFFFFF
+IRI_RECORD = 0
+LABEL_RECORD = 1
+
+
+def normalize_label(label):
+    """
+    :param label: Provide label
+    :return: Label without case and repeated white space
+    """
+    return " ".join(str(label).split()).casefold()
+
+
+def hash_key(key):
+    """
+    :param key: Provide key bytes
+    :return: 64 bit hash that is the same in every process
+    """
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def iri_key(iri):
+    """
+    :param iri: Provide IRI
+    :return: Index key of the IRI
+    """
+    return b"i\0" + iri.encode("utf-8")
+
+
+def label_key(vocabulary_id, label):
+    """
+    :param vocabulary_id: Provide number of the vocabulary in the index
+    :param label: Provide label
+    :return: Index key of the label in the vocabulary
+    """
+    return b"l" + bytes((vocabulary_id,)) + normalize_label(label).encode("utf-8")
+
+
+def in_namespaces(name, iri):
+    """
+    :param name: Provide vocabulary name
+    :param iri: Provide IRI of a term
+    :return: True if the IRI is in one of the namespaces of the vocabulary, or the vocabulary is not a known one
+    """
+    if name not in VOCABULARIES:
+        return True
+    return iri.startswith(VOCABULARIES[name][0])
+
+
+def read_source(name, path):
+    """
+    Read the terms of a vocabulary snapshot. A .tsv or .csv file has an IRI and its labels on every row,
+    other files are parsed as RDF, e.g. an OWL or SKOS file.
+
+    :param name: Provide vocabulary name
+    :param path: Provide path of the snapshot
+    :return: Dict of IRI to list of labels
+    """
+    terms = {}
+    if path.endswith((".tsv", ".csv")):
+        with open(path, newline="", encoding="utf-8") as source:
+            for row in csv.reader(source, delimiter="\t" if path.endswith(".tsv") else ","):
+                if row and row[0].startswith("http") and in_namespaces(name, row[0]):
+                    terms.setdefault(row[0], []).extend(label for label in row[1:] if label)
+        return terms
+
+    graph = Graph()
+    graph.parse(path, format=guess_format(path) or "xml")
+    for predicate in LABEL_PREDICATES:
+        for subject, label in graph.subject_objects(predicate):
+            if isinstance(subject, URIRef) and isinstance(label, Literal) and in_namespaces(name, str(subject)):
+                terms.setdefault(str(subject), []).append(str(label))
+    return terms
+
+
+def build(index_path, sources):
+    """
+    Write the index file of vocabulary snapshots
+
+    :param index_path: Provide path of the index file
+    :param sources: Provide dict of vocabulary name to path of its snapshot
+    """
+    names = sorted(sources)
+    records = bytearray()
+    keys = []
+    for vocabulary_id, name in enumerate(names):
+        terms = read_source(name, sources[name])
+        logger.info("Indexing %d terms of %s from %s", len(terms), name, sources[name])
+        for iri, labels in terms.items():
+            key = iri_key(iri)
+            iri_offset = len(records)
+            records += RECORD.pack(IRI_RECORD, vocabulary_id, len(key)) + key
+            keys.append((key, iri_offset))
+            # The local name of an IRI is also a label, e.g. en for the English language
+            local_name = unquote(iri.rstrip("/").rsplit("/", 1)[-1].rsplit("#", 1)[-1])
+            for label in set(labels + [local_name]):
+                key = label_key(vocabulary_id, label)
+                keys.append((key, len(records)))
+                records += RECORD.pack(LABEL_RECORD, vocabulary_id, len(key)) + key + TARGET.pack(iri_offset)
+
+    slot_count = 1
+    while slot_count < 2 * len(keys) + 1:
+        slot_count *= 2
+    slots = [(0, EMPTY)] * slot_count
+    hashes = set()
+    for key, offset in keys:
+        key_hash = hash_key(key)
+        if key_hash in hashes:
+            # The first IRI with a label keeps it
+            continue
+        hashes.add(key_hash)
+        position = key_hash & (slot_count - 1)
+        while slots[position][1] != EMPTY:
+            position = (position + 1) & (slot_count - 1)
+        slots[position] = (key_hash, offset)
+
+    meta = json.dumps({"vocabularies": names,
+                       "sources": {name: [sources[name], os.path.getmtime(sources[name])] for name in names}})
+    meta = meta.encode("utf-8")
+    slots_offset = HEADER.size + len(meta)
+    records_offset = slots_offset + slot_count * SLOT.size
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=directory)
+    with os.fdopen(handle, "wb") as index_file:
+        index_file.write(HEADER.pack(MAGIC, len(meta), slot_count, slots_offset, records_offset))
+        index_file.write(meta)
+        index_file.write(b"".join(SLOT.pack(*slot) for slot in slots))
+        index_file.write(records)
+    os.replace(temp_path, index_path)
+    logger.info("Wrote vocabulary index %s with %d keys", index_path, len(hashes))
+
+
+class VocabularyIndex:
+    """
+    Class to look up IRIs and labels in a memory-mapped vocabulary index. Every lookup hashes the key once and reads
+    the slots and record it points to, results are kept so repeated cell values are only looked up once.
+    """
+
+    def __init__(self, index_path, sources=None):
+        """
+        :param index_path: Provide path of the index file
+        :param sources: Provide dict of vocabulary name to path of its snapshot, the index is built again if it is
+        missing or older than a snapshot
+        """
+        self.PATH = index_path
+        if sources and self.is_stale(index_path, sources):
+            build(index_path, sources)
+        if not os.path.isfile(index_path):
+            raise SystemExit("Vocabulary index does not exist and no vocabularies are configured: " + index_path)
+
+        with open(index_path, "rb") as index_file:
+            self.data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, meta_size, self.slot_count, self.slots_offset, self.records_offset = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise SystemExit("Not a vocabulary index: " + index_path)
+        meta = json.loads(self.data[HEADER.size:HEADER.size + meta_size].decode("utf-8"))
+        self.VOCABULARIES = meta["vocabularies"]
+        self.cache = {}
+
+    @staticmethod
+    def is_stale(index_path, sources):
+        """
+        :return: True if the index does not exist, was built from other snapshots or a snapshot changed
+        """
+        try:
+            with open(index_path, "rb") as index_file:
+                magic, meta_size = HEADER.unpack(index_file.read(HEADER.size))[:2]
+                meta = json.loads(index_file.read(meta_size).decode("utf-8"))
+        except (OSError, ValueError, struct.error):
+            return True
+        if magic != MAGIC or sorted(meta["sources"]) != sorted(sources):
+            return True
+        return any(meta["sources"][name] != [path, os.path.getmtime(path)] for name, path in sources.items())
+
+    def find(self, key):
+        """
+        :param key: Provide key bytes
+        :return: Offset of the record of the key, or None
+        """
+        key_hash = hash_key(key)
+        mask = self.slot_count - 1
+        position = key_hash & mask
+        while True:
+            slot_hash, offset = SLOT.unpack_from(self.data, self.slots_offset + position * SLOT.size)
+            if offset == EMPTY:
+                return None
+            if slot_hash == key_hash:
+                start = self.records_offset + offset
+                _, _, size = RECORD.unpack_from(self.data, start)
+                if self.data[start + RECORD.size:start + RECORD.size + size] == key:
+                    return offset
+            position = (position + 1) & mask
+
+    def get_iri(self, offset):
+        """
+        :param offset: Provide offset of an IRI record
+        :return: IRI
+        """
+        start = self.records_offset + offset
+        _, _, size = RECORD.unpack_from(self.data, start)
+        return self.data[start + RECORD.size + 2:start + RECORD.size + size].decode("utf-8")
+
+    def contains(self, iri):
+        """
+        :param iri: Provide IRI
+        :return: True if the IRI is a term of an indexed vocabulary
+        """
+        return self.find(iri_key(iri)) is not None
+
+    def find_label(self, name, label):
+        """
+        :param name: Provide vocabulary name
+        :param label: Provide label, or the local name of an IRI
+        :return: IRI of the term with the label, or None
+        """
+        if name not in self.VOCABULARIES:
+            return None
+        offset = self.find(label_key(self.VOCABULARIES.index(name), label))
+        if offset is None:
+            return None
+        start = self.records_offset + offset
+        _, _, size = RECORD.unpack_from(self.data, start)
+        return self.get_iri(TARGET.unpack_from(self.data, start + RECORD.size + size)[0])
+
+    def resolve(self, value, names):
+        """
+        Method to check a value against vocabularies and resolve it to a term IRI. A value can be an IRI, a compact
+        IRI like DOID:1234, or a label. IRIs in namespaces of vocabularies that are not indexed are not checked.
+
+        :param value: Provide cell value
+        :param names: Provide names of the vocabularies the value should be from
+        :return: Tuple of the IRI, or None if the value is not a term, and whether the value could be checked
+        """
+        cache_key = (value, names)
+        if cache_key not in self.cache:
+            self.cache[cache_key] = self.lookup(str(value).strip(), names)
+        return self.cache[cache_key]
+
+    def lookup(self, value, names):
+        """
+        :return: Tuple of the IRI of the value, or None if it is not a term, and whether the value could be checked
+        """
+        indexed = [name for name in names if name in self.VOCABULARIES]
+        if not indexed:
+            return value, False
+        if self.contains(value):
+            return value, True
+
+        for name in indexed:
+            namespaces, prefix = VOCABULARIES.get(name, ((), None))
+            # A compact IRI, e.g. DOID:1234 or DOID_1234
+            if prefix is not None:
+                for separator in (":", "_"):
+                    if value.upper().startswith(prefix.upper() + separator):
+                        for namespace in namespaces:
+                            iri = namespace + value[len(prefix) + 1:]
+                            if self.contains(iri):
+                                return iri, True
+            # An IRI with a label as local name, e.g. http://id.loc.gov/vocabulary/iso639-1/English
+            for namespace in namespaces:
+                if value.startswith(namespace):
+                    iri = self.find_label(name, unquote(value[len(namespace):]))
+                    return iri, True
+
+        if value.startswith(("http://", "https://")):
+            # IRIs of other vocabularies can not be checked
+            return value, False
+        for name in indexed:
+            iri = self.find_label(name, value)
+            if iri is not None:
+                return iri, True
+        return None, True
+
+    def close(self):
+        """
+        Method to unmap the index file
+        """
+        self.data.close()
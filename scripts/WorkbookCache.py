@@ -0,0 +1,93 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import zlib
+import Log
+
+logger = Log.get_logger(__name__)
+
+
+class WorkbookCache:
+    """
+    Class contents a directory with the records extracted from input files, keyed by the hash of the file content and
+    the version of the reader. Records are stored as compressed pickles, and the least recently used entries are
+    removed when the directory is larger than the size limit.
+    """
+    SUFFIX = ".records"
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        """
+        :param directory: Provide cache directory, it is created if it does not exist
+        :param max_bytes: Provide maximum total size of the cache entries in bytes
+        """
+        self.DIRECTORY = directory
+        self.MAX_BYTES = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_file_hash(path):
+        """
+        :param path: Provide path of an input file
+        :return: SHA-256 hex digest of the file content
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def load(self, path, version, parse):
+        """
+        Method to get the records of an input file from the cache, or parse and cache them
+
+        :param path: Provide path of the input file
+        :param version: Provide version of the reader, records of other versions are not used
+        :param parse: Provide function that extracts the records from the file path
+        :return: Records
+        """
+        entry_path = os.path.join(self.DIRECTORY, self.get_file_hash(path) + "-" + str(version) + self.SUFFIX)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                records = pickle.loads(zlib.decompress(entry_file.read()))
+            os.utime(entry_path)
+            logger.debug("Loaded %s from the workbook cache", path)
+            return records
+        except FileNotFoundError:
+            pass
+        except Exception as error:
+            logger.warning("Ignoring unreadable workbook cache entry %s: %s", entry_path, error)
+
+        records = parse(path)
+        data = zlib.compress(pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL))
+        # Write to a temporary file first so parallel runs never read a partial entry
+        handle, temp_path = tempfile.mkstemp(dir=self.DIRECTORY)
+        with os.fdopen(handle, "wb") as entry_file:
+            entry_file.write(data)
+        os.replace(temp_path, entry_path)
+        logger.debug("Stored %s in the workbook cache (%d bytes)", path, len(data))
+        self.evict()
+        return records
+
+    def evict(self):
+        """
+        Method to remove the least recently used entries until the cache is within its size limit
+        """
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.DIRECTORY):
+                if name.endswith(self.SUFFIX):
+                    stat = os.stat(os.path.join(self.DIRECTORY, name))
+                    entries.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.MAX_BYTES:
+                    break
+                try:
+                    os.remove(os.path.join(self.DIRECTORY, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+                logger.debug("Evicted %s from the workbook cache", name)
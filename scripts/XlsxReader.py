@@ -0,0 +1,268 @@
+"""
+Reader that extracts cell values from the XML in an xlsx file, without building a workbook model with a cell object
+per value. Only the requested sheets are parsed, and the values are the same as the values openpyxl reads with
+load_workbook(path), except that array and data table formulas are returned as their formula text.
+"""
+import posixpath
+import zipfile
+from xml.etree.ElementTree import iterparse, fromstring
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
+from openpyxl.utils.datetime import from_excel, from_ISO8601, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def read_workbook(path, sheet_names=None):
+    """
+    Read the values of the sheets of a workbook
+
+    :param path: Provide path of the xlsx file
+    :param sheet_names: Provide names of the sheets to read, or None to read all sheets
+    :return: Dict with the sheet names and the rows of values of every read sheet
+    """
+    with zipfile.ZipFile(path) as archive:
+        workbook_path = get_workbook_path(archive)
+        relations = read_relations(archive, workbook_path)
+        workbook = fromstring(archive.read(workbook_path))
+
+        properties = workbook.find(NS + "workbookPr")
+        date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+        epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        sheets = [(sheet.get("name"), relations.get(sheet.get(REL_NS + "id"), (None, None))[0])
+                  for sheet in workbook.iter(NS + "sheet")]
+        result = {"sheetnames": [name for name, _ in sheets], "sheets": {}}
+        wanted = [(name, member) for name, member in sheets
+                  if member is not None and (sheet_names is None or name in sheet_names)]
+        if not wanted:
+            return result
+
+        strings = read_shared_strings(archive, get_related(relations, "/sharedStrings"))
+        date_styles, timedelta_styles = read_date_styles(archive, get_related(relations, "/styles"))
+        for name, member in wanted:
+            result["sheets"][name] = read_sheet(archive, member, strings, date_styles, timedelta_styles, epoch)
+    return result
+
+
+def get_workbook_path(archive):
+    """
+    :param archive: Provide opened xlsx ZipFile
+    :return: Path of the workbook part in the archive
+    """
+    try:
+        root = fromstring(archive.read("_rels/.rels"))
+        for relation in root.iter(PACKAGE_REL_NS + "Relationship"):
+            if relation.get("Type", "").endswith("/officeDocument"):
+                return relation.get("Target").lstrip("/")
+    except KeyError:
+        pass
+    return "xl/workbook.xml"
+
+
+def read_relations(archive, part_path):
+    """
+    :param archive: Provide opened xlsx ZipFile
+    :param part_path: Provide path of a part in the archive
+    :return: Dict of relation id to tuple of path in the archive and relation type
+    """
+    directory, name = posixpath.split(part_path)
+    try:
+        root = fromstring(archive.read(posixpath.join(directory, "_rels", name + ".rels")))
+    except KeyError:
+        return {}
+    relations = {}
+    for relation in root.iter(PACKAGE_REL_NS + "Relationship"):
+        target = relation.get("Target")
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(directory, target))
+        relations[relation.get("Id")] = (target, relation.get("Type", ""))
+    return relations
+
+
+def get_related(relations, type_suffix):
+    """
+    :param relations: Provide relations from read_relations
+    :param type_suffix: Provide end of the relation type, e.g. /styles
+    :return: Path of the related part, or None
+    """
+    for target, relation_type in relations.values():
+        if relation_type.endswith(type_suffix):
+            return target
+    return None
+
+
+def get_text(element):
+    """
+    :param element: Provide si or is element
+    :return: Text of the element without formatting and phonetic runs
+    """
+    snippets = []
+    plain = element.find(NS + "t")
+    if plain is not None and plain.text is not None:
+        snippets.append(plain.text)
+    for run in element.findall(NS + "r"):
+        text = run.find(NS + "t")
+        if text is not None and text.text is not None:
+            snippets.append(text.text)
+    return "".join(snippets)
+
+
+def read_shared_strings(archive, member):
+    """
+    :param archive: Provide opened xlsx ZipFile
+    :param member: Provide path of the shared strings part, or None
+    :return: List of shared strings
+    """
+    if member is None or member not in archive.namelist():
+        return []
+    strings = []
+    with archive.open(member) as source:
+        for _, element in iterparse(source):
+            if element.tag == NS + "si":
+                strings.append(get_text(element).replace("x005F_", ""))
+                element.clear()
+    return strings
+
+
+def read_date_styles(archive, member):
+    """
+    :param archive: Provide opened xlsx ZipFile
+    :param member: Provide path of the styles part, or None
+    :return: Sets of the style indexes with a date format and with a time interval format
+    """
+    date_styles = set()
+    timedelta_styles = set()
+    if member is None or member not in archive.namelist():
+        return date_styles, timedelta_styles
+
+    root = fromstring(archive.read(member))
+    custom = {int(number_format.get("numFmtId")): number_format.get("formatCode")
+              for number_format in root.iter(NS + "numFmt")}
+    cell_formats = root.find(NS + "cellXfs")
+    if cell_formats is None:
+        return date_styles, timedelta_styles
+    for index, cell_format in enumerate(cell_formats.findall(NS + "xf")):
+        format_id = int(cell_format.get("numFmtId", 0))
+        format_code = custom.get(format_id, BUILTIN_FORMATS.get(format_id))
+        if format_code is None:
+            continue
+        if is_date_format(format_code):
+            date_styles.add(index)
+        if is_timedelta_format(format_code):
+            timedelta_styles.add(index)
+    return date_styles, timedelta_styles
+
+
+def cast_number(value):
+    """
+    :param value: Provide number as string
+    :return: int or float
+    """
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def read_sheet(archive, member, strings, date_styles, timedelta_styles, epoch):
+    """
+    Read the values of a sheet in the same layout as openpyxl iter_rows(values_only=True): every row from the first
+    row and column to the last row and column that contain a cell
+
+    :return: List of tuples of values
+    """
+    cells = {}
+    shared_formulas = {}
+    merged_ranges = []
+    row_counter = 0
+    column_counter = 0
+
+    with archive.open(member) as source:
+        for event, element in iterparse(source, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == NS + "row":
+                    row_number = element.get("r")
+                    row_counter = int(float(row_number)) if row_number else row_counter + 1
+                    column_counter = 0
+                continue
+
+            if tag == NS + "c":
+                coordinate = element.get("r")
+                if coordinate:
+                    row, column = coordinate_to_tuple(coordinate)
+                    column_counter = column
+                else:
+                    column_counter += 1
+                    row, column = row_counter, column_counter
+                cells[row, column] = read_cell(element, coordinate, strings, date_styles, timedelta_styles, epoch,
+                                               shared_formulas)
+            elif tag == NS + "mergeCell":
+                merged_ranges.append(element.get("ref"))
+            elif tag == NS + "row":
+                element.clear()
+
+    # Only the top left cell of merged cells keeps its value
+    for merged_range in merged_ranges:
+        min_column, min_row, max_column, max_row = range_boundaries(merged_range)
+        for row in range(min_row, max_row + 1):
+            for column in range(min_column, max_column + 1):
+                if (row, column) != (min_row, min_column):
+                    cells[row, column] = None
+
+    if not cells:
+        return []
+    max_row = max(row for row, _ in cells)
+    max_column = max(column for _, column in cells)
+    rows = [[None] * max_column for _ in range(max_row)]
+    for (row, column), value in cells.items():
+        rows[row - 1][column - 1] = value
+    return [tuple(row) for row in rows]
+
+
+def read_cell(element, coordinate, strings, date_styles, timedelta_styles, epoch, shared_formulas):
+    """
+    :return: Value of a c element
+    """
+    data_type = element.get("t", "n")
+    style_id = int(element.get("s", 0))
+
+    formula = element.find(NS + "f")
+    if formula is not None:
+        value = "=" + (formula.text or "")
+        if formula.get("t") == "shared":
+            index = formula.get("si")
+            if index in shared_formulas:
+                return shared_formulas[index].translate_formula(coordinate)
+            if value != "=":
+                shared_formulas[index] = Translator(value, coordinate)
+        return value
+
+    if data_type == "inlineStr":
+        inline = element.find(NS + "is")
+        return get_text(inline) if inline is not None else None
+
+    value = element.findtext(NS + "v") or None
+    if value is None:
+        return None
+    if data_type == "n":
+        value = cast_number(value)
+        if style_id in date_styles:
+            try:
+                return from_excel(value, epoch, timedelta=style_id in timedelta_styles)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return value
+    if data_type == "s":
+        return strings[int(value)]
+    if data_type == "b":
+        return bool(int(value))
+    if data_type == "d":
+        return from_ISO8601(value)
+    return value
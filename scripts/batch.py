@@ -0,0 +1,12 @@
+import argparse
+import BatchRunner
+
+PARSER = argparse.ArgumentParser(description="Populate FAIR Data Points from many config files in one process")
+PARSER.add_argument("path", help="directory in which every config.yml is a job, or a batch manifest file")
+PARSER.add_argument("--parallelism", type=int, default=None, help="number of jobs that run at the same time")
+ARGS = PARSER.parse_args()
+
+BATCH_RUNNER = BatchRunner.BatchRunner(ARGS.path, ARGS.parallelism)
+BATCH_RUNNER.run()
+BATCH_RUNNER.print_summary()
+BATCH_RUNNER.check_jobs()
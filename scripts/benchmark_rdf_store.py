@@ -0,0 +1,100 @@
+import argparse
+import time
+import tracemalloc
+import RDFStore
+import ResourceEntry
+from resource_classes import Dataset
+
+"""
+Benchmark of the rdf_store mode: rendering datasets into one shared rdflib Dataset against a payload and a parsed Graph
+per resource, as the export of a run without rdf_store does, with the time, the tracemalloc peak and the memory that
+is still allocated when every resource is rendered and exported. The store keeps every resource until the end of the
+run, the per-resource graphs are released after the export.
+"""
+
+PARSER = argparse.ArgumentParser(description="Benchmark the shared rdf_store against per-resource graphs")
+PARSER.add_argument("--sizes", default="100,500,2000", help="comma separated numbers of resources")
+PARSER.add_argument("--repeat", type=int, default=3, help="number of measurements, the fastest is reported")
+ARGS = PARSER.parse_args()
+
+
+def make_entries(size):
+    """
+    :param size: Provide number of resources
+    :return: List of ResourceEntry objects of datasets with a few keywords and themes
+    """
+    entries = []
+    for index in range(size):
+        title = "Dataset %d" % index
+        dataset = Dataset.Dataset("http://example.org/catalog/1", title, "Description of dataset %d" % index,
+                                  ["keyword %d" % index, "rare disease"],
+                                  ["http://www.orpha.net/ORDO/Orphanet_%d" % index], "http://example.org/publisher",
+                                  "http://id.loc.gov/vocabulary/iso639-1/en",
+                                  "http://rdflicense.appspot.com/rdflicense/cc-by-nc-nd3.0", None, None)
+        entries.append(ResourceEntry.ResourceEntry(dataset, "dataset", ResourceEntry.resource_key("dataset", title),
+                                                   ResourceEntry.CATALOG_KEY))
+    return entries
+
+
+def render_graphs(entries):
+    """
+    Method to render every resource to its own payload and parse it into a Graph for the export, the payload is
+    released after the export like in a run without targets
+    """
+    triples = 0
+    for entry in entries:
+        entry.render()
+        triples += len(entry.get_graph())
+        entry.release()
+    return triples
+
+
+def render_store(entries):
+    """
+    Method to render every resource into its named graph in one RDFStore
+    """
+    store = RDFStore.RDFStore()
+    for entry in entries:
+        entry.render(store)
+        entry.get_graph()
+    return store
+
+
+def measure(function, size, repeat):
+    """
+    :param function: Provide function that renders a list of entries
+    :param size: Provide number of resources
+    :param repeat: Provide number of measurements
+    :return: Fastest time in seconds, tracemalloc peak and memory still allocated after the render in bytes
+    """
+    times = []
+    for _ in range(repeat):
+        entries = make_entries(size)
+        start = time.perf_counter()
+        result = function(entries)
+        times.append(time.perf_counter() - start)
+        del entries, result
+
+    # Memory is measured in a separate run, tracemalloc slows the render down
+    entries = make_entries(size)
+    tracemalloc.start()
+    result = function(entries)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries, result
+    return min(times), peak, current
+
+
+def format_size(size):
+    """
+    :param size: Provide number of bytes
+    :return: Size in MB
+    """
+    return "%7.1f MB" % (size / 1e6)
+
+
+print("%9s  %-20s  %9s  %10s  %10s" % ("resources", "mode", "time", "peak", "retained"))
+for size in [int(size) for size in ARGS.sizes.split(",")]:
+    for name, function in (("per-resource graphs", render_graphs), ("rdf_store", render_store)):
+        seconds, peak, current = measure(function, size, ARGS.repeat)
+        print("%9d  %-20s  %7.2f s  %10s  %10s" % (size, name, seconds, format_size(peak), format_size(current)))
@@ -0,0 +1,70 @@
+import argparse
+import timeit
+import RDFTerms
+from resource_classes import Dataset
+
+"""
+Benchmark of the RDF term serialization on resources with many keywords and themes: the object lists of RDFTerms
+against the string concatenation loops they replaced, and the rendering of a whole dataset with those lists
+"""
+
+PARSER = argparse.ArgumentParser(description="Benchmark the RDF term serialization of keyword and theme lists")
+PARSER.add_argument("--sizes", default="10,100,500,2000", help="comma separated numbers of keywords and themes")
+PARSER.add_argument("--repeat", type=int, default=5, help="number of measurements, the fastest is reported")
+ARGS = PARSER.parse_args()
+
+
+def concatenate_literals(literal_list):
+    """
+    The keyword loop before RDFTerms, which copies the string for every value and does not escape
+    """
+    literal_str = ""
+    for literal in literal_list:
+        literal_str = literal_str + ' "' + literal + '",'
+    return literal_str[:-1]
+
+
+def concatenate_iris(iri_list):
+    """
+    The theme loop before RDFTerms
+    """
+    iri_str = ""
+    for iri in iri_list:
+        iri_str = iri_str + " <" + iri + ">,"
+    return iri_str[:-1]
+
+
+def measure(function, repeat):
+    """
+    :param function: Provide function without arguments
+    :param repeat: Provide number of measurements
+    :return: Fastest time of one call in seconds
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def format_time(seconds):
+    """
+    :param seconds: Provide duration in seconds
+    :return: Duration in the unit that fits it
+    """
+    if seconds < 1e-3:
+        return "%7.1f us" % (seconds * 1e6)
+    if seconds < 1:
+        return "%7.1f ms" % (seconds * 1e3)
+    return "%7.2f s " % seconds
+
+
+print("%7s  %10s  %10s  %14s" % ("items", "+= loop", "RDFTerms", "dataset graph"))
+for size in [int(size) for size in ARGS.sizes.split(",")]:
+    keywords = ["keyword %d about a rare disease" % index for index in range(size)]
+    themes = ["http://www.orpha.net/ORDO/Orphanet_%d" % index for index in range(size)]
+    dataset = Dataset.Dataset("http://example.org/catalog/1", "Dataset", "Description", keywords, themes,
+                              "http://example.org/publisher", "http://id.loc.gov/vocabulary/iso639-1/en",
+                              "http://rdflicense.appspot.com/rdflicense/cc-by-nc-nd3.0", None, None)
+    loop = measure(lambda: (concatenate_literals(keywords), concatenate_iris(themes)), ARGS.repeat)
+    terms = measure(lambda: (RDFTerms.literal_list(keywords), RDFTerms.iri_list(themes)), ARGS.repeat)
+    graph = measure(dataset.get_graph, min(ARGS.repeat, 3))
+    print("%7d  %10s  %10s  %14s" % (size, format_time(loop), format_time(terms), format_time(graph)))
@@ -0,0 +1,25 @@
+import argparse
+import os
+import sys
+import SerializerGenerator
+
+PARSER = argparse.ArgumentParser(description="Generate the RDF serializers of the VP resource classes from the SHACL "
+                                             "shapes")
+PARSER.add_argument("--shapes", default=os.path.join("..", "SHACL"), help="directory of the SHACL shapes files")
+PARSER.add_argument("--output", default="Serializers.py", help="path of the generated module")
+PARSER.add_argument("--check", action="store_true", help="only check that the generated module is up to date")
+ARGS = PARSER.parse_args()
+
+SOURCE = SerializerGenerator.generate(ARGS.shapes)
+if ARGS.check:
+    CURRENT = None
+    if os.path.isfile(ARGS.output):
+        with open(ARGS.output, encoding="utf-8") as output_file:
+            CURRENT = output_file.read()
+    if CURRENT != SOURCE:
+        sys.exit(ARGS.output + " is out of date, run generate_serializers.py")
+    print(ARGS.output + " is up to date")
+else:
+    with open(ARGS.output, "w", encoding="utf-8") as output_file:
+        output_file.write(SOURCE)
+    print("Generated " + ARGS.output)
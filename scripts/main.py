@@ -1,3 +1,37 @@
+import argparse
+import glob
+import os
+import Config
+import Log
 import Populator
+import Profiler
+import Selection
 
-FDP_POPULATOR = Populator.Populator()
\ No newline at end of file
+PARSER = argparse.ArgumentParser(description="Populate a FAIR Data Point from the configured input files")
+PARSER.add_argument("--profile", nargs="?", const="profile", default=None, metavar="DIRECTORY",
+                    help="profile every phase of the run and write the pstats files and collapsed stacks for flame "
+                         "graphs to this directory (default: profile)")
+PARSER.add_argument("--profile-top", type=int, default=20, metavar="N",
+                    help="number of functions with the most own time that are logged per phase")
+PARSER.add_argument("--select-type", action="append", choices=Selection.TYPES, metavar="TYPE",
+                    help="only process resources of this type, can be repeated (%s)" % ", ".join(Selection.TYPES))
+PARSER.add_argument("--select-title", metavar="REGEX", help="only process resources whose title matches")
+PARSER.add_argument("--select-identifier", metavar="REGEX", help="only process resources whose identifier matches")
+PARSER.add_argument("--select-rows", metavar="RANGES",
+                    help="only process these rows of the sheets and CSV files, e.g. 2-50,80,100-")
+PARSER.add_argument("--shards", type=int, metavar="K", help="number of shards of a sharded run")
+PARSER.add_argument("--shard", type=int, metavar="I", help="only upload shard I (from 1 to K) of a sharded run")
+PARSER.add_argument("--journal", metavar="FILE",
+                    help="write the URL mapping and run report to this journal, {shard} is replaced by the shard")
+ARGS = PARSER.parse_args()
+
+CONFIG = Config.from_environment({'select_types': ARGS.select_type, 'select_title': ARGS.select_title,
+                                  'select_identifier': ARGS.select_identifier, 'select_rows': ARGS.select_rows,
+                                  'shards': ARGS.shards, 'shard': ARGS.shard,
+                                  'journal_file': os.path.abspath(ARGS.journal) if ARGS.journal else None})
+Log.setup(CONFIG.LOG_LEVEL, CONFIG.LOG_FORMAT, CONFIG.PAYLOAD_FILE)
+Log.get_logger("main").debug("Files from the parent dir : %s", glob.glob("*"))
+
+FDP_POPULATOR = Populator.Populator(CONFIG, profiler=Profiler.Profiler(ARGS.profile, ARGS.profile_top))
+FDP_POPULATOR.print_summary()
+FDP_POPULATOR.check_targets()
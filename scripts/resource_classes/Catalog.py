@@ -0,0 +1,41 @@
+from resource_classes import Resource
+import RDFTerms
+import Templates
+from rdflib import Graph
+
+class Catalog(Resource.Resource):
+    """
+    This class extends Resource class with catalog specific properties
+    """
+    PUBLISHER_NAME = None
+
+    def __init__(self, parent_url, title, description, publisher_name):
+        """
+
+        :param parent_url: URL of the FDP the catalog is part of
+        :param title: Title of a catalog
+        :param description: Description of a catalog
+        :param publisher_name: Name of the publisher of a catalog
+        """
+        # Pass core properties to parent class
+        super().__init__(parent_url, title, description, None, None, None)
+        self.PUBLISHER_NAME = publisher_name
+
+    def get_graph(self, graph=None):
+        """
+        Method to get catalog RDF
+
+        :param graph: Provide graph to add the triples to, or None to create one
+        :return: catalog RDF
+        """
+        if graph is None:
+            graph = Graph()
+
+        # Literals are escaped for Turtle, empty values leave their section out
+        description = RDFTerms.literal(self.DESCRIPTION) if self.DESCRIPTION else None
+        publisher = RDFTerms.literal(self.PUBLISHER_NAME) if self.PUBLISHER_NAME else None
+        body = Templates.render('catalog', {'fdp_url': self.PARENT_URL, 'title': RDFTerms.literal(self.TITLE),
+                                            'description': description, 'publisher': publisher})
+        graph.parse(data=body, format="turtle")
+
+        return graph
@@ -1,6 +1,7 @@
 from resource_classes import Resource
 import Utils
-import chevron
+import RDFTerms
+import Templates
 from rdflib import Graph
 
 class Dataset(Resource.Resource):
@@ -35,14 +36,16 @@ class Dataset(Resource.Resource):
         self.LANDING_PAGE = page
         self.CONTACT_POINT = contact_point
     
-    def get_graph(self):
+    def get_graph(self, graph=None):
         """
         Method to get dataset RDF
 
+        :param graph: Provide graph to add the triples to, or None to create one
         :return: dataset RDF
         """
         self.UTILS = Utils.Utils()
-        graph = Graph()
+        if graph is None:
+            graph = Graph()
 
         # create resource triples
         self.UTILS.add_resource_triples(self, graph)
@@ -53,31 +56,22 @@ class Dataset(Resource.Resource):
 
         # Create landing page triples
         if self.LANDING_PAGE:
-            with open('../templates/landingpage.mustache', 'r') as f:
-                body = chevron.render(f, {'page_url': self.LANDING_PAGE})
-                graph.parse(data=body, format="turtle")
+            body = Templates.render('landingpage', {'page_url': self.LANDING_PAGE})
+            graph.parse(data=body, format="turtle")
 
         # Create contact point triples
         if self.CONTACT_POINT:
-            with open('../templates/contact.mustache', 'r') as f:
-                body = chevron.render(f, {'contact_url': self.CONTACT_POINT})
-                graph.parse(data=body, format="turtle")
+            body = Templates.render('contact', {'contact_url': self.CONTACT_POINT})
+            graph.parse(data=body, format="turtle")
 
         # Create keywords list
-        keyword_str = ""
-        for keyword in self.KEYWORDS:
-            keyword_str = keyword_str + ' "' + keyword + '",'
-        keyword_str = keyword_str[:-1]
+        keyword_str = RDFTerms.literal_list(self.KEYWORDS)
 
         # Create themes list
-        theme_str = ""
-        for theme in self.THEMES:
-            theme_str = theme_str + " <" + theme + ">,"
-        theme_str = theme_str[:-1]
+        theme_str = RDFTerms.iri_list(self.THEMES)
 
         # create dataset triples
-        with open('../templates/dataset.mustache', 'r') as f:
-            body = chevron.render(f, {'keyword': keyword_str, 'theme': theme_str})
-            graph.parse(data=body, format="turtle")
+        body = Templates.render('dataset', {'keyword': keyword_str, 'theme': theme_str})
+        graph.parse(data=body, format="turtle")
 
         return graph
\ No newline at end of file
@@ -1,6 +1,6 @@
 from resource_classes import Resource
 import Utils
-import chevron
+import Templates
 from rdflib import Graph
 
 class Distribution(Resource.Resource):
@@ -44,14 +44,16 @@ class Distribution(Resource.Resource):
         self.BYTE_SIZE = byte_size
         self.DATASET_NAME = dataset_name
     
-    def get_graph(self):
+    def get_graph(self, graph=None):
         """
         Method to get distribution RDF
 
+        :param graph: Provide graph to add the triples to, or None to create one
         :return: distribution RDF
         """
         self.UTILS = Utils.Utils()
-        graph = Graph()
+        if graph is None:
+            graph = Graph()
 
         # create resource triples
         self.UTILS.add_resource_triples(self, graph)
@@ -62,15 +64,13 @@ class Distribution(Resource.Resource):
 
         # Create byte size triples
         if self.BYTE_SIZE:
-            with open('../templates/bytesize.mustache', 'r') as f:
-                body = chevron.render(f, {'byte_size': self.BYTE_SIZE})
-                graph.parse(data=body, format="turtle")
+            body = Templates.render('bytesize', {'byte_size': self.BYTE_SIZE})
+            graph.parse(data=body, format="turtle")
 
         # Create format triples
         if self.FORMAT:
-            with open('../templates/format.mustache', 'r') as f:
-                body = chevron.render(f, {'format': self.FORMAT})
-                graph.parse(data=body, format="turtle")
+            body = Templates.render('format', {'format': self.FORMAT})
+            graph.parse(data=body, format="turtle")
 
         distribution_url = None
         distribution_type = None
@@ -83,9 +83,9 @@ class Distribution(Resource.Resource):
             distribution_url = self.DOWNLOAD_URL
 
         # create distribution triples
-        with open('../templates/distribution.mustache', 'r') as f:
-            body = chevron.render(f, {'distribution_type': distribution_type, 'distribution_url': distribution_url,
-                                      'media_type': self.MEDIA_TYPE})
-            graph.parse(data=body, format="turtle")
+        body = Templates.render('distribution', {'distribution_type': distribution_type,
+                                                 'distribution_url': distribution_url,
+                                                 'media_type': self.MEDIA_TYPE})
+        graph.parse(data=body, format="turtle")
 
         return graph
\ No newline at end of file
@@ -8,6 +8,8 @@ class Resource:
     PUBLISHER_URL = None
     LANGUAGE_URL = None
     LICENSE_URL = None
+    # Title of the catalog the resource is added to, None for the catalog of the config
+    CATALOG = None
 
     def __init__(self, parent_url, title, description, publisher, language, license):
         """
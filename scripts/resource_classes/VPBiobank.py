@@ -1,6 +1,3 @@
-import Config
-import chevron
-from rdflib import Graph
 from resource_classes import VPDataset
 
 
@@ -60,21 +57,3 @@ class VPBiobank(VPDataset.VPDataset):
                         distribution=distribution)
 
         self.POPULATIONCOVERAGE = populationcoverage
-
-    def get_graph(self):
-        """
-        Method to get biobank RDF
-
-        :return: biobank RDF
-        """
-        graph = super().get_graph()
-
-        # Render RDF
-        with open('../templates/vpbiobank.mustache', 'r') as f:
-            body = chevron.render(f, {'populationcoverage': self.POPULATIONCOVERAGE})
-            if Config.DEBUG:
-                print("RDF created with Mustache template:")
-                print(body)
-            graph.parse(data=body, format="turtle")
-
-        return graph
\ No newline at end of file
@@ -1,7 +1,3 @@
-import Utils
-import Config
-import chevron
-from rdflib import Graph
 from resource_classes import VPResource
 
 class VPDataService(VPResource.VPResource):
@@ -62,26 +58,3 @@ class VPDataService(VPResource.VPResource):
         self.SERVERSDATASET = servesdataset
         self.ENDPOINTURL = endpointurl
         self.ENDPOINTDESCRIPTION = endpointdescription
-
-    def get_graph(self):
-        """
-        Method to get dataservice RDF
-
-        :return: dataservice RDF
-        """
-        utils = Utils.Utils()
-        graph = super().get_graph()
-
-        servesdataset_str = utils.list_to_rdf_URIs(self.SERVERSDATASET)
-        endpointdescription_str = utils.list_to_rdf_URIs(self.ENDPOINTDESCRIPTION)
-
-        with open('../templates/vpdataservice.mustache', 'r') as f:
-            body = chevron.render(f, {'type': self.OTYPE, 'serversdataset_str': servesdataset_str,
-                                      'endpointurl': self.ENDPOINTURL,
-                                      'endpointdescription_str': endpointdescription_str})
-            if Config.DEBUG:
-                print("RDF created with Mustache template:")
-                print(body)
-            graph.parse(data=body, format="turtle")
-
-        return graph
\ No newline at end of file
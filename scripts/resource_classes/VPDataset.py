@@ -1,7 +1,3 @@
-import Utils
-import Config
-import chevron
-from rdflib import Graph
 from resource_classes import VPResource
 
 class VPDataset(VPResource.VPResource):
@@ -53,21 +49,3 @@ class VPDataset(VPResource.VPResource):
                  landingpage)
 
         self.DISTRIBUTION = distribution
-    
-    def get_graph(self):
-        """
-        Method to get dataset RDF
-
-        :return: dataset RDF
-        """
-        utils = Utils.Utils()
-        graph = super().get_graph()
-
-        with open('../templates/vpdataset.mustache', 'r') as f:
-            body = chevron.render(f, {'distribution': self.DISTRIBUTION})
-            if Config.DEBUG:
-                print("RDF created with Mustache template:")
-                print(body)
-            graph.parse(data=body, format="turtle")
-
-        return graph
\ No newline at end of file
@@ -1,8 +1,6 @@
-import Utils
-import Config
-import chevron
-from warnings import warn
 from rdflib import Graph
+import ResourceEntry
+import Serializers
 
 class VPDistribution():
     """
@@ -65,33 +63,14 @@ class VPDistribution():
         self.CONFORMSTO = conformsto
         self.DATASET_TITLE = dataset_title
 
-    
-    def get_graph(self):
+    def get_graph(self, graph=None):
         """
-        Method to get dataset RDF
+        Method to get distribution RDF, written by the serializer generated from the SHACL shapes
 
-        :return: dataset RDF
+        :param graph: Provide graph to add the triples to, or None to create one
+        :return: distribution RDF
         """
-        utils = Utils.Utils()
-        graph = Graph()
-
-        self.ISPARTOF.append(self.PARENT_URL)
-        ispartof_str = utils.list_to_rdf_URIs(self.ISPARTOF)
-        haspolicy_str = utils.list_to_rdf_URIs([self.HASPOLICY[0]])
-        warn("Only first ODRL policy is used due to metadata schema discrepancy", Warning)
-
-        with open('../templates/vpdistribution.mustache', 'r') as f:
-            body = chevron.render(f, {'license': self.LICENSE, 'title': self.TITLE,
-                                      'description': self.DESCRIPTION, 'publisher': self.PUBLISHER,
-                                      'version': self.VERSION, 'accessrights': self.ACCESSRIGHTS,
-                                      'haspolicy_str': self.HASPOLICY, 'mediatype': self.MEDIATYPE,
-                                      'ispartof': ispartof_str, 'accessurl': self.ACCESSURL,
-                                      'downloadurl': self.DOWNLOADURL, 'accessservice': self.ACCESSSERVICE,
-                                      'conformsto': self.CONFORMSTO})
-            if Config.DEBUG:
-                print("RDF created with Mustache template:")
-                print(body)            
-            graph.parse(data=body, format="turtle")
-
+        if graph is None:
+            graph = Graph()
+        graph.parse(data=Serializers.serialize(self, ResourceEntry.NEW_RESOURCE_URL), format="nt")
         return graph
-    
\ No newline at end of file
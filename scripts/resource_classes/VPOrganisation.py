@@ -1,7 +1,3 @@
-import Config
-import chevron
-from rdflib import Graph
-
 class VPOrganisation():
     """
     This class describes the organisation class
@@ -34,32 +30,3 @@ class VPOrganisation():
         self.LOGO = logo
         self.LOCATION = location
         self.IDENTIFIER = identifier
-    
-    def get_blank_node(self):
-        """
-        Method to get organisation RDF
-
-        :return: organisation RDF
-        """
-        # Create pages list
-        page_str = ""
-        for page in self.LANDING_PAGES:
-            page_str = page_str + " <" + page + ">,"
-        page_str = page_str[:-1]
-
-        # Render RDF
-        graph = Graph()
-
-        with open('../templates/vporganisationblank.mustache', 'r') as f:
-            body = chevron.render(f, {'parent_url': self.PARENT_URL,
-                                      'title': self.TITLE,
-                                      'description': self.DESCRIPTION,
-                                      'pages': page_str,
-                                      'logo': self.LOGO,
-                                      'location': self.LOCATION,
-                                      'identifier': self.IDENTIFIER})
-            if Config.DEBUG:
-                print("RDF created with Mustache template:")
-                print(body)
-
-        return body
\ No newline at end of file
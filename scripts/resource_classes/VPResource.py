@@ -1,8 +1,6 @@
-import Config
-import Utils
-import chevron
-from warnings import warn
 from rdflib import Graph
+import ResourceEntry
+import Serializers
 
 class VPResource:
     """
@@ -26,6 +24,8 @@ class VPResource:
     LOGO = None
     HASPOLICY = None
     IDENTIFIER = None
+    # Title of the catalog the resource is added to, None for the catalog of the config
+    CATALOG = None
     ISSUED = None
     MODIFIED = None
     VERSION = None
@@ -89,44 +89,14 @@ class VPResource:
         self.ACCESSRIGHTS = accessrights
         self.LANDINGPAGE = landingpage
 
-    def get_graph(self):
-        utils = Utils.Utils()
-
-        graph = Graph()
-
-        theme_str = utils.list_to_rdf_URIs(self.THEME)
-        if len(self.KEYWORD) == 0:
-            self.KEYWORD = ["resource"]
-        keyword_str = utils.list_to_rdf_literals(self.KEYWORD)
-        accessrights_str = utils.list_to_rdf_URIs([self.ACCESSRIGHTS[0]])
-        landingpage_str = utils.list_to_rdf_URIs([self.LANDINGPAGE[0]])
-        vpconnection_str = utils.list_to_rdf_URIs(self.VPCONNECTION)
-        vpconnection_str = None
-        haspolicy_str = utils.list_to_rdf_URIs([self.HASPOLICY[0]])
-        warn("Only first access right URI is used due to metadata schema discrepancy", Warning)
-        warn("Only first landing page URI is used due to metadata schema discrepancy", Warning)
-        warn("Placeholder publisher is added due to metadata schema discrepancy", Warning)
-        warn("VP connection is dropped because the SHACL implementation is out of date", Warning)
-        warn("Only first ODRL policy is used due to metadata schema discrepancy", Warning)
-        warn("Keyword is added if there are no keywords to conform to implementation", Warning)
-        warn("vcard is incompatible with some FDP configurations, including the WP13 configuration", Warning)
-        if self.VERSION is None or len(str(self.VERSION)) == 0:
-            self.VERSION = 1
-
-        with open('../templates/vpresource.mustache', 'r') as f:
-            body = chevron.render(f, {'parent_url': self.PARENT_URL, 'license': self.LICENSE,
-                                      'title': self.TITLE, 'description': self.DESCRIPTION,
-                                      'theme_str': theme_str, 'publisher': self.PUBLISHER,
-                                      'contactpoint': self.CONTACTPOINT, 'language': self.LANGUAGE,
-                                      'personaldata': self.PERSONALDATA, 'conformsto': self.CONFORMSTO,
-                                      'vpconnection': vpconnection_str, 'keyword_str': keyword_str,
-                                      'logo': self.LOGO, 'haspolicy': haspolicy_str,
-                                      'identifier': self.IDENTIFIER, 'issued': self.ISSUED,
-                                      'modified': self.MODIFIED, 'version': self.VERSION,
-                                      'accessrights': accessrights_str, 'landingpage': landingpage_str})
-            if Config.DEBUG:
-                print("RDF created with Mustache template:")
-                print(body)
-            graph.parse(data=body, format="turtle")
+    def get_graph(self, graph=None):
+        """
+        Method to get resource RDF, written by the serializer generated from the SHACL shapes
 
-        return(graph)
+        :param graph: Provide graph to add the triples to, or None to create one
+        :return: resource RDF
+        """
+        if graph is None:
+            graph = Graph()
+        graph.parse(data=Serializers.serialize(self, ResourceEntry.NEW_RESOURCE_URL), format="nt")
+        return graph
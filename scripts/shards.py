@@ -0,0 +1,37 @@
+import argparse
+import os
+import subprocess
+import sys
+import Log
+import Sharding
+
+PARSER = argparse.ArgumentParser(description="Merge the journals of a sharded run, or run all its shards locally")
+COMMANDS = PARSER.add_subparsers(dest="command", required=True)
+MERGE = COMMANDS.add_parser("merge", help="merge the journals of the workers into one URL mapping and run report")
+MERGE.add_argument("journals", nargs="+", help="journal files of the workers")
+MERGE.add_argument("--output", help="write the merged URL mapping of every target to this JSON file")
+MERGE.add_argument("--shards", type=int, help="number of shards of the run, to detect a shard without a journal")
+RUN = COMMANDS.add_parser("run", help="run every shard in its own main.py process with the CONFIG_FILE and BASE_PATH "
+                                      "of the environment, and merge their journals")
+RUN.add_argument("shards", type=int, help="number of shards")
+RUN.add_argument("--journals", default="journals", help="directory the journals are written to (default: journals)")
+RUN.add_argument("--output", help="write the merged URL mapping of every target to this JSON file")
+ARGS = PARSER.parse_args()
+
+Log.setup()
+
+if ARGS.command == "merge":
+    Sharding.merge(ARGS.journals, ARGS.output, ARGS.shards)
+else:
+    journals = [os.path.join(os.path.abspath(ARGS.journals), "shard-%d.json" % shard)
+                for shard in range(1, ARGS.shards + 1)]
+    # A journal of an earlier run would hide a worker that failed before writing its own
+    for journal in journals:
+        if os.path.exists(journal):
+            os.remove(journal)
+    main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    workers = [subprocess.Popen([sys.executable, main, "--shards", str(ARGS.shards), "--shard", str(shard),
+                                 "--journal", journal]) for shard, journal in enumerate(journals, 1)]
+    for worker in workers:
+        worker.wait()
+    Sharding.merge([journal for journal in journals if os.path.exists(journal)], ARGS.output, ARGS.shards)
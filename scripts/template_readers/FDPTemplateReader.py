@@ -1,6 +1,10 @@
-import Config
 import csv
-from resource_classes import Dataset, Distribution
+import Deduplication
+import WorkbookCache
+from resource_classes import Catalog, Dataset, Distribution
+import Log
+
+logger = Log.get_logger(__name__)
 
 
 class FDPTemplateReader:
@@ -8,21 +12,111 @@ class FDPTemplateReader:
     NOTE: this class is based on the folling specification:
     <https://github.com/LUMC-BioSemantics/EJP-RD-WP19-FDP-template>
     """
-    def get_datasets(self):
+
+    # Increase when the records extracted from the CSV files change, so cached records of older versions are not used
+    CACHE_VERSION = 1
+
+    def __init__(self, config, selection=None):
+        """
+        :param config: Provide Settings object with the input files and catalog URL
+        :param selection: Provide Selection object of a partial run, or None to read every row
+        """
+        self.CONFIG = config
+        self.SELECTION = selection
+
+    def is_selected(self, resource_type, line_num, title, titles=None):
+        """
+        This method checks whether a resource is made from a row, the CSV files have no identifier column
+
+        :param titles: Provide set of titles that are read whether they are selected or not, e.g. of parents, or None
+        :return: True if the row is read
+        """
+        if self.SELECTION is None:
+            return True
+        return self.SELECTION.is_selected(resource_type, line_num, title, parent=titles is not None and title in titles)
+
+    @staticmethod
+    def read_csv(path):
+        """
+        This method reads the rows of a CSV file
+
+        :return: List of rows
+        """
+        with open(path, 'r') as csv_file:
+            return list(csv.reader(csv_file))
+
+    def get_rows(self, path):
+        """
+        This method reads the rows of a CSV file, from the workbook cache if it is configured
+
+        :return: List of rows
+        """
+        if self.CONFIG.WORKBOOK_CACHE:
+            cache = WorkbookCache.WorkbookCache(self.CONFIG.WORKBOOK_CACHE, self.CONFIG.WORKBOOK_CACHE_SIZE)
+            return cache.load(path, "csv" + str(self.CACHE_VERSION), self.read_csv)
+        return self.read_csv(path)
+
+    @staticmethod
+    def get_column(header, name):
+        """
+        This method finds a column by its name, without case and a trailing * of required columns
+
+        :return: Index of the column, or None if the header has no such column
+        """
+        for index, column_name in enumerate(header):
+            if column_name.strip().rstrip("*").lower() == name.lower():
+                return index
+        return None
+
+    def get_catalogs(self):
+        """
+        This method creates catalog objects by extracting content from the catalog input CSV file, with a Title and
+        Publisher_name column and optionally a Description column
+
+        :return: Dict of catalogs
+        """
+        rows = self.get_rows(self.CONFIG.CATALOG_INPUT_FILE)
+        if not rows:
+            return {}
+        title_column = self.get_column(rows[0], "Title")
+        publisher_column = self.get_column(rows[0], "Publisher_name")
+        description_column = self.get_column(rows[0], "Description")
+        if title_column is None:
+            raise SystemError("The catalog input file has no Title column")
+
+        catalogs = {}
+        for row_number, row in enumerate(rows[1:], 2):
+            values = [value.strip() for value in row]
+            if len(values) <= title_column or values[title_column] == "":
+                continue
+            logger.debug("%s", row)
+            title = values[title_column]
+            publisher_name = values[publisher_column] if publisher_column is not None else None
+            description = values[description_column] if description_column is not None else None
+            catalog = Catalog.Catalog(None, title, description or "Metadata of catalog " + title,
+                                      publisher_name or None)
+            Deduplication.add_unique(catalogs, title, catalog, row_number, self.CONFIG.DEDUPLICATE)
+        return catalogs
+
+    def get_datasets(self, titles=None):
         """
         This method creates datasets objects by extracting content from the dataset input CSV file.
         NOTE: This method assumes that provided input file follows this spec
         <https://github.com/LUMC-BioSemantics/EJP-RD-WP19-FDP-template>
 
+        :param titles: Provide set of the titles of the datasets that are read in a partial run whether they are
+                       selected or not, e.g. of the selected distributions, or None
         :return: Dict of datasets
         """
 
-        reader = csv.reader(open(Config.DATASET_INPUT_FILE, 'r'))
-        catalog_url = Config.CATALOG_URL
+        rows = self.get_rows(self.CONFIG.DATASET_INPUT_FILE)
+        catalog_url = self.CONFIG.CATALOG_URL
+        # An optional Catalog column after the other columns adds a dataset to another catalog
+        catalog_column = self.get_column(rows[0], "Catalog") if rows else None
         datasets = {}
-        for row in reader:
-            if reader.line_num > 1 and row[0] != "":
-                print(row)
+        for line_num, row in enumerate(rows, 1):
+            if line_num > 1 and row[0] != "" and self.is_selected("dataset", line_num, row[0], titles):
+                logger.debug("%s", row)
                 title = row[0]
                 publisher_url = row[1]
                 description = row[2]
@@ -63,7 +157,9 @@ class FDPTemplateReader:
                     themes.append(theme)
                 dataset = Dataset.Dataset(catalog_url, title, description, keywords, themes, publisher_url,
                                           language_url, license_url, landing_page_url, contact_point_url)
-                datasets[title] = dataset
+                if catalog_column is not None and len(row) > catalog_column and row[catalog_column].strip():
+                    dataset.CATALOG = row[catalog_column].strip()
+                Deduplication.add_unique(datasets, title, dataset, line_num, self.CONFIG.DEDUPLICATE)
         return datasets
 
     def get_distributions(self):
@@ -75,11 +171,11 @@ class FDPTemplateReader:
         :return: Dict of distribution
         """
 
-        reader = csv.reader(open(Config.DISTRIBUTION_INPUT_FILE, 'r'))
+        rows = self.get_rows(self.CONFIG.DISTRIBUTION_INPUT_FILE)
         distributions = {}
-        for row in reader:
-            if reader.line_num > 1 and row[0] != "":
-                print(row)
+        for line_num, row in enumerate(rows, 1):
+            if line_num > 1 and row[0] != "" and self.is_selected("distribution", line_num, row[0]):
+                logger.debug("%s", row)
                 title = row[0]
                 dataset_name = row[1]
                 publisher_url = row[2]
@@ -106,5 +202,5 @@ class FDPTemplateReader:
                 distribution = Distribution.Distribution(None, title, description, publisher_url, language_url,
                                                          license_url, access_url, download_url, media_type,
                                                          compression_format, format, byte_size, dataset_name)
-                distributions[title] = distribution
+                Deduplication.add_unique(distributions, title, distribution, line_num, self.CONFIG.DEDUPLICATE)
         return distributions
\ No newline at end of file
@@ -1,6 +1,13 @@
-import Config
 import openpyxl
-from resource_classes import VPOrganisation, VPBiobank, VPPatientregistry, VPDataset, VPDistribution, VPDataService
+import Deduplication
+import WorkbookCache
+import XlsxReader
+import MemoryMonitor
+from resource_classes import Catalog, VPOrganisation, VPBiobank, VPPatientregistry, VPDataset, VPDistribution, \
+    VPDataService
+import Log
+
+logger = Log.get_logger(__name__)
 
 class VPTemplateReader:
     """
@@ -12,6 +19,68 @@ class VPTemplateReader:
     row = []
     keys = []
 
+    # Increase when the records extracted from the workbook change, so cached records of older versions are not used
+    CACHE_VERSION = 2
+
+    # Sheets the resources are read from, the native engine only parses these
+    READ_SHEETS = ['Organisation', 'Biobank', 'PatientRegistry', 'Dataset', 'Distribution', 'DataService', 'Catalog']
+
+    def __init__(self, config, memory=None, selection=None):
+        """
+        :param config: Provide Settings object with the input files and catalog URL
+        :param memory: Provide MemoryMonitor object that accounts the memory use of the reading, or None
+        :param selection: Provide Selection object of a partial run, or None to read every row
+        """
+        self.CONFIG = config
+        self.MEMORY = memory if memory is not None else MemoryMonitor.MemoryMonitor()
+        self.SELECTION = selection
+        self.workbook = None
+
+    @staticmethod
+    def read_workbook(path):
+        """
+        This method extracts the values of all sheets of a workbook
+
+        :return: Dict with the sheet names and the rows of values of every sheet
+        """
+        wb = openpyxl.load_workbook(path)
+        return {"sheetnames": wb.sheetnames,
+                "sheets": {ws.title: [tuple(row) for row in ws.iter_rows(values_only=True)] for ws in wb}}
+
+    def read_workbook_native(self, path):
+        """
+        This method extracts the values of the sheets the resources are read from, directly from the xlsx file
+
+        :return: Dict with the sheet names and the rows of values of the read sheets
+        """
+        return XlsxReader.read_workbook(path, self.READ_SHEETS)
+
+    def load_workbook(self, path):
+        """
+        This method reads a workbook with the configured engine, from the workbook cache if it is configured
+
+        :return: Dict with the sheet names and the rows of values of the read sheets
+        """
+        if self.CONFIG.WORKBOOK_ENGINE == "native":
+            read, version = self.read_workbook_native, "vp%d-native" % self.CACHE_VERSION
+        else:
+            read, version = self.read_workbook, "vp%d" % self.CACHE_VERSION
+        if self.CONFIG.WORKBOOK_CACHE:
+            cache = WorkbookCache.WorkbookCache(self.CONFIG.WORKBOOK_CACHE, self.CONFIG.WORKBOOK_CACHE_SIZE)
+            return cache.load(path, version, read)
+        return read(path)
+
+    def get_workbook(self):
+        """
+        This method reads the input workbook once
+
+        :return: Dict with the sheet names and the rows of values of every sheet
+        """
+        if self.workbook is None:
+            with self.MEMORY.phase("workbook"):
+                self.workbook = self.load_workbook(self.CONFIG.EJP_VP_INPUT_FILE)
+        return self.workbook
+
     def getval(self, key):
         """
         This method returns a value
@@ -19,7 +88,7 @@ class VPTemplateReader:
 
         :return value
         """
-        return self.row[self.keys[key]].value
+        return self.row[self.keys[key]]
 
     def getvals(self, key):
         """
@@ -29,75 +98,151 @@ class VPTemplateReader:
         :return values
         
         """
-        entry = self.row[self.keys[key]].value
+        entry = self.row[self.keys[key]]
         if type(entry) == str:
             return [value.strip() for value in entry.split(self.separator)]
         return []
 
+    def is_selected(self, resource_type, row_number, row, keys, titles=None):
+        """
+        This method checks whether a resource is made from a row
+
+        :param titles: Provide set of titles that are read whether they are selected or not, e.g. of parents, or None
+        :return: True if the row is read
+        """
+        if self.SELECTION is None:
+            return True
+        identifier = row[keys["Identifier"]] if "Identifier" in keys else None
+        parent = titles is not None and row[keys["Title"]] in titles
+        return self.SELECTION.is_selected(resource_type, row_number, row[keys["Title"]], identifier, parent)
+
+    @staticmethod
+    def check_columns(row, expected_column_names, sheet_name):
+        """
+        This method checks the column names of a sheet. After the expected columns a sheet may have a Catalog column
+        with the title of the catalog the resource in the row is added to.
+
+        :return: Index of the Catalog column, or None
+        """
+        column_names = list(row)
+        catalog_column = column_names.index("Catalog") if "Catalog" in column_names else None
+        if catalog_column is not None:
+            column_names[catalog_column] = None
+        while len(column_names) > len(expected_column_names) and column_names[-1] is None:
+            column_names.pop()
+        if column_names != expected_column_names:
+            raise SystemError("Column names do not match in the " + sheet_name + " sheet")
+        return catalog_column
+
+    @staticmethod
+    def get_catalog(row, catalog_column):
+        """
+        :return: Title of the catalog in the Catalog column of a row, or None
+        """
+        if catalog_column is None or row[catalog_column] in (None, ""):
+            return None
+        return str(row[catalog_column]).strip()
+
     def check_template_version(self):
         """
         This method checks whether the Excel template is the expected version
 
         :return: nothing
         """
-        print("Checking sheet names...")
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
+        logger.info("Checking sheet names...")
+        wb = self.get_workbook()
         expected_sheets = ['Organisation', 'ContactPoint', 'Biobank', 
                            'PatientRegistry', 'Guideline', 'Dataset', 
                            'Distribution', 'DataService', 'Catalog']
 
-        sheet_exists = [sheet in wb.sheetnames for sheet in expected_sheets]
+        sheet_exists = [sheet in wb["sheetnames"] for sheet in expected_sheets]
         if False in sheet_exists:
             raise SystemError("A sheet in the Excel template is missing. The sheet could be a different version.")
         
-        print("Excel template contains expected sheets.")
+        logger.info("Excel template contains expected sheets.")
+
+    def get_catalogs(self):
+        """
+        This method creates catalog objects from the catalog sheet of the ejp vp input file, with a Title and
+        Description column and optionally a Publisher column with the name of the publisher
 
-    def get_organisations(self):
+        :return: Dict of catalogs
+        """
+        logger.info("Reading catalog sheet...")
+        ws = self.get_workbook()['sheets']['Catalog']
+        if not ws:
+            return {}
+        keys = {name: index for index, name in enumerate(ws[0]) if name is not None}
+        if "Title" not in keys:
+            raise SystemError("Column names do not match in the catalog sheet")
+
+        catalogs = {}
+        for row_number, row in enumerate(ws[1:], 2):
+            if row[keys["Title"]] != None:
+                self.row = row
+                self.keys = keys
+                title = str(self.getval("Title")).strip()
+                description = self.getval("Description") if "Description" in keys else None
+                publisher = self.getval("Publisher") if "Publisher" in keys else None
+                catalog = Catalog.Catalog(
+                    parent_url=None,
+                    title=title,
+                    description=description or "Metadata of catalog " + title,
+                    publisher_name=publisher)
+                Deduplication.add_unique(catalogs, catalog.TITLE, catalog, row_number, self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(catalog))
+
+        self.MEMORY.checkpoint("Catalog sheet read")
+        return catalogs
+
+    def get_organisations(self, titles=None):
         """
         This method creates organisation objects by extracting content from the ejp vp input file.
         NOTE: This method assumes that provided input file follows this spec
         <https://github.com/ejp-rd-vp/resource-metadata-schema/blob/master/template/EJPRD%20Resource%20Metadata%20template.xlsx>
 
+        :param titles: Provide set of the titles of the organisations to read, or None to read all
         :return: Dict of organisations
         """
         # Prepare reading
-        print("Reading organisation sheet...")
+        logger.info("Reading organisation sheet...")
         expected_column_names = ['Title', 'Description', 'LandingPage',
                                   'Logo', 'Location', 'Identifier']
         keys = dict(zip(expected_column_names, range(0, len(expected_column_names))))
 
         # Open organisation excel sheet
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
-        ws = wb['Organisation']
+        ws = self.get_workbook()['sheets']['Organisation']
 
         # Loop over rows of excel sheet
         first_row = True
         organisations = {}
-        for row in ws:
+        for row_number, row in enumerate(ws, 1):
             # Check header
             if first_row:
                 first_row=False
-                column_names = [cell.value for cell in row]
+                column_names = list(row)
                 if column_names != expected_column_names:
                     raise SystemError("Column names do not match in the organisation sheet")
                 continue
 
             # Read row if it exists
-            if row[keys["Title"]].value != None:
+            if row[keys["Title"]] != None and (titles is None or row[keys["Title"]] in titles):
                 # Create organisation object and add to organisation dictionary
                 self.row = row
                 self.keys = keys
                 organisation = VPOrganisation.VPOrganisation(
-                    parent_url=Config.CATALOG_URL,
+                    parent_url=self.CONFIG.CATALOG_URL,
                     title=self.getval("Title"),
                     description=self.getval("Description"),
                     location=self.getval("Location"),
                     pages=self.getvals("LandingPage"),
                     logo=self.getval("Logo"),
                     identifier=self.getval("Identifier"))
-                organisations[organisation.TITLE] = organisation
-                if Config.DEBUG: print(vars(organisation))
+                Deduplication.add_unique(organisations, organisation.TITLE, organisation, row_number,
+                                         self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(organisation))
 
+        self.MEMORY.checkpoint("Organisation sheet read")
         return organisations
 
     def get_biobanks(self):
@@ -109,7 +254,7 @@ class VPTemplateReader:
         :return: Dict of biobanks
         """
         # Prepare reading
-        print("Reading biobank sheet...")
+        logger.info("Reading biobank sheet...")
         expected_column_names = ['License', 'Title', 'Description', 'Theme',
                         'Publisher', 'ContactPoint', 'PersonalData',
                         'PopulationCoverage', 'Language', 'AccessRights',
@@ -119,28 +264,25 @@ class VPTemplateReader:
         keys = dict(zip(expected_column_names, range(0, len(expected_column_names))))
         
         # Open organisation excel sheet
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
-        ws = wb['Biobank']
+        ws = self.get_workbook()['sheets']['Biobank']
         
         # Loop over rows of excel sheet
         first_row = True
         biobanks = {}
-        for row in ws:
+        for row_number, row in enumerate(ws, 1):
             # Skip header
             if first_row:
                 first_row=False
-                column_names = [cell.value for cell in row]
-                if column_names != expected_column_names:
-                    raise SystemError("Column names do not match in the biobank sheet")
+                catalog_column = self.check_columns(row, expected_column_names, "biobank")
                 continue
 
             # Read row if it exists
-            if row[keys["Title"]].value != None:
+            if row[keys["Title"]] != None and self.is_selected("biobank", row_number, row, keys):
                 # Create biobank object and add to biobank dictionary if it is a biobank
                 self.row = row
                 self.keys = keys
                 biobank = VPBiobank.VPBiobank(
-                    parent_url=Config.CATALOG_URL,
+                    parent_url=self.CONFIG.CATALOG_URL,
                     license=self.getval("License"),
                     title=self.getval("Title"),
                     description=self.getval("Description"),
@@ -163,9 +305,11 @@ class VPTemplateReader:
                     distribution=self.getval("Distribution"),
                     populationcoverage=self.getval("PopulationCoverage"))
 
-                biobanks[biobank.TITLE] = biobank
-                if Config.DEBUG: print(vars(biobank))
+                biobank.CATALOG = self.get_catalog(row, catalog_column)
+                Deduplication.add_unique(biobanks, biobank.TITLE, biobank, row_number, self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(biobank))
 
+        self.MEMORY.checkpoint("Biobank sheet read")
         return biobanks
 
     def get_patientregistries(self):
@@ -177,7 +321,7 @@ class VPTemplateReader:
         :return: Dict of patientregistries
         """
         # Prepare reading
-        print("Reading patient registry sheet...")
+        logger.info("Reading patient registry sheet...")
         expected_column_names = ['License', 'Title', 'Description',
                 'Theme', 'Publisher', 'ContactPoint', 'PersonalData',
                 'PopulationCoverage', 'Language', 'AccessRights',
@@ -187,28 +331,25 @@ class VPTemplateReader:
         keys = dict(zip(expected_column_names, range(0, len(expected_column_names))))
 
         # Open organisation excel sheet
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
-        ws = wb['PatientRegistry']
+        ws = self.get_workbook()['sheets']['PatientRegistry']
         
         # Loop over rows of excel sheet
         first_row = True
         patientregistries = {}
-        for row in ws:
+        for row_number, row in enumerate(ws, 1):
             # Skip header
             if first_row:
                 first_row=False
-                column_names = [cell.value for cell in row]
-                if column_names != expected_column_names:
-                    raise SystemError("Column names do not match in the patient registry sheet")
+                catalog_column = self.check_columns(row, expected_column_names, "patient registry")
                 continue
 
             # Read row if it exists
-            if row[0].value != None:
+            if row[0] != None and self.is_selected("patientregistry", row_number, row, keys):
                 # Create patient registry object and add to patientregistry dictionary if it is a patientregistry
                 self.row = row
                 self.keys = keys
                 patientregistry = VPPatientregistry.VPPatientRegistry(
-                    parent_url=Config.CATALOG_URL,
+                    parent_url=self.CONFIG.CATALOG_URL,
                     license=self.getval("License"),
                     title=self.getval("Title"),
                     description=self.getval("Description"),
@@ -230,20 +371,25 @@ class VPTemplateReader:
                     landingpage=self.getval("LandingPage"),
                     distribution=self.getval("Distribution"),
                     populationcoverage=self.getval("PopulationCoverage"))
-                patientregistries[patientregistry.TITLE] = patientregistry
-                if Config.DEBUG: print(vars(patientregistry))
+                patientregistry.CATALOG = self.get_catalog(row, catalog_column)
+                Deduplication.add_unique(patientregistries, patientregistry.TITLE, patientregistry, row_number,
+                                         self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(patientregistry))
 
+        self.MEMORY.checkpoint("PatientRegistry sheet read")
         return patientregistries
 
-    def get_datasets(self):
+    def get_datasets(self, titles=None):
         """
         This method creates dataset objects by extracting content from the ejp vp input file.
         NOTE: This method assumes that provided input file follows this spec
         <https://github.com/ejp-rd-vp/resource-metadata-schema/blob/master/template/EJPRD%20Resource%20Metadata%20template.xlsx>
 
+        :param titles: Provide set of the titles of the datasets that are read in a partial run whether they are
+                       selected or not, e.g. of the selected distributions, or None
         :return: Dict of datasets
         """
-        print("Reading dataset sheet...")
+        logger.info("Reading dataset sheet...")
         expected_column_names = ['License', 'Title', 'Description', 'Theme',
                         'Publisher', 'ContactPoint', 'PersonalData',
                         'PopulationCoverage', 'Language', 'AccessRights',
@@ -253,28 +399,25 @@ class VPTemplateReader:
         keys = dict(zip(expected_column_names, range(0, len(expected_column_names))))
 
         # Open organisation excel sheet
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
-        ws = wb['Dataset']
+        ws = self.get_workbook()['sheets']['Dataset']
         
         # Loop over rows of excel sheet
         first_row = True
         datasets = {}
-        for row in ws:
+        for row_number, row in enumerate(ws, 1):
             # Skip header
             if first_row:
                 first_row=False
-                column_names = [cell.value for cell in row]
-                if column_names != expected_column_names:
-                    raise SystemError("Column names do not match in the dataset sheet")
+                catalog_column = self.check_columns(row, expected_column_names, "dataset")
                 continue
 
             # Read row if it exists
-            if row[0].value != None:
+            if row[0] != None and self.is_selected("dataset", row_number, row, keys, titles):
                 # Create dataset object and add to dataset dictionary
                 self.row = row
                 self.keys = keys
                 dataset = VPDataset.VPDataset(
-                    parent_url=Config.CATALOG_URL,
+                    parent_url=self.CONFIG.CATALOG_URL,
                     license=self.getval("License"),
                     title=self.getval("Title"),
                     description=self.getval("Description"),
@@ -295,9 +438,11 @@ class VPTemplateReader:
                     accessrights=self.getvals("AccessRights"),
                     landingpage=self.getvals("LandingPage"),
                     distribution=self.getval("Distribution"))
-                datasets[dataset.TITLE] = dataset
-                if Config.DEBUG: print(vars(dataset))
+                dataset.CATALOG = self.get_catalog(row, catalog_column)
+                Deduplication.add_unique(datasets, dataset.TITLE, dataset, row_number, self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(dataset))
 
+        self.MEMORY.checkpoint("Dataset sheet read")
         return datasets
 
     def get_distributions(self):
@@ -308,30 +453,29 @@ class VPTemplateReader:
 
         :return: Dict of distributions
         """
-        print("Reading distribution sheet...")
+        logger.info("Reading distribution sheet...")
         expected_column_names = ['License', 'Title', 'Description',
             'Publisher', 'Version', 'AccessRights', 'ODRLPolicy',
             'MediaType', 'IsPartOf', 'Type', 'AccessService', 'Dataset Title']
         keys = dict(zip(expected_column_names, range(0, len(expected_column_names))))
 
         # Open organisation excel sheet
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
-        ws = wb['Distribution']
+        ws = self.get_workbook()['sheets']['Distribution']
         
         # Loop over rows of excel sheet
         first_row = True
         distributions = {}
-        for row in ws:
+        for row_number, row in enumerate(ws, 1):
             # Skip header
             if first_row:
                 first_row=False
-                column_names = [cell.value for cell in row]
+                column_names = list(row)
                 if column_names != expected_column_names:
                     raise SystemError("Column names do not match in the distribution sheet")
                 continue
 
             # Read row if it exists
-            if row[0].value != None:
+            if row[0] != None and self.is_selected("distribution", row_number, row, keys):
                 # Create distribution object and add to distribution dictionary
                 self.row = row
                 self.keys = keys
@@ -352,9 +496,11 @@ class VPTemplateReader:
                     conformsto=None,
                     dataset_title=self.getval("Dataset Title")
                 )
-                distributions[distribution.TITLE] = distribution
-                if Config.DEBUG: print(vars(distribution))
+                Deduplication.add_unique(distributions, distribution.TITLE, distribution, row_number,
+                                         self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(distribution))
 
+        self.MEMORY.checkpoint("Distribution sheet read")
         return distributions
     
     def get_dataservices(self):
@@ -365,7 +511,7 @@ class VPTemplateReader:
 
         :return: Dict of dataservices
         """
-        print("Reading dataservice sheet...")
+        logger.info("Reading dataservice sheet...")
         expected_column_names = ['License', 'Type', 'Title',
             'Description', 'PersonalData', 'Publisher', 'Theme',
             'Language', 'ContactPoint', 'PopulationCoverage',
@@ -377,28 +523,25 @@ class VPTemplateReader:
         keys = dict(zip(expected_column_names, range(0, len(expected_column_names))))
 
         # Open organisation excel sheet
-        wb = openpyxl.load_workbook(Config.EJP_VP_INPUT_FILE)
-        ws = wb['DataService']
+        ws = self.get_workbook()['sheets']['DataService']
         
         # Loop over rows of excel sheet
         first_row = True
         dataservices = {}
-        for row in ws:
+        for row_number, row in enumerate(ws, 1):
             # Skip header
             if first_row:
                 first_row=False
-                column_names = [cell.value for cell in row]
-                if column_names != expected_column_names:
-                    raise SystemError("Column names do not match in the dataservice sheet")
+                catalog_column = self.check_columns(row, expected_column_names, "dataservice")
                 continue
 
             # Read row if it exists
-            if row[0].value != None:
+            if row[0] != None and self.is_selected("dataservice", row_number, row, keys):
                 # Create dataservice object and add to dataservice dictionary
                 self.row = row
                 self.keys = keys
                 dataservice = VPDataService.VPDataService(
-                    parent_url=Config.CATALOG_URL,
+                    parent_url=self.CONFIG.CATALOG_URL,
                     license=self.getval("License"),
                     title=self.getval("Title"),
                     description=self.getval("Description"),
@@ -423,7 +566,10 @@ class VPTemplateReader:
                     endpointurl=self.getval("EndpointURL"),
                     endpointdescription=self.getvals("EndpointDescription")
                     )
-                dataservices[dataservice.TITLE] = dataservice
-                if Config.DEBUG: print(vars(dataservice))
+                dataservice.CATALOG = self.get_catalog(row, catalog_column)
+                Deduplication.add_unique(dataservices, dataservice.TITLE, dataservice, row_number,
+                                         self.CONFIG.DEDUPLICATE)
+                logger.debug("%s", vars(dataservice))
 
+        self.MEMORY.checkpoint("DataService sheet read")
         return dataservices
\ No newline at end of file
@@ -0,0 +1,9 @@
+import logging
+import Log
+
+"""
+Tests of the populator modules. Run them from the scripts directory with python -m unittest discover -s tests -t .
+"""
+
+# The warnings of retried requests and failed uploads are expected in the tests, they are not printed
+logging.getLogger(Log.ROOT_LOGGER_NAME).addHandler(logging.NullHandler())
@@ -0,0 +1,111 @@
+import os
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import Config
+import FakeFDP
+
+"""
+Local stand-ins for the services the populator talks to: an HTTP server on localhost that answers with a function,
+e.g. with a fake FDP, and the settings of a run against the FDP at FDP_URL
+"""
+
+INPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "test-input")
+FDP_URL = "http://fdp.example.org"
+CATALOG_URL = FDP_URL + "/catalog/1"
+ENVIRONMENT = {"FDP_URL": FDP_URL, "FDP_PERSISTENT_URL": FDP_URL, "FDP_USERNAME": "user", "FDP_PASSWORD": "password"}
+
+
+def make_settings(directory, lines=(), catalog_url=CATALOG_URL, workbook=None):
+    """
+    Method to write a config file that uploads the test-input CSV files or a workbook, and read it. The FDP credentials
+    are read from the environment, see ENVIRONMENT.
+
+    :param directory: Provide directory of the config file and the input files
+    :param lines: Provide extra lines of the config file
+    :param catalog_url: Provide URL of the catalog the resources are added to
+    :param workbook: Provide name of an EJP RD workbook in the directory to upload instead of the CSV files
+    :return: Settings object of a run that does not wait before retrying a request
+    """
+    if workbook is None:
+        for name in ("datasets.csv", "distributions.csv"):
+            shutil.copy(os.path.join(INPUT, name), directory)
+        inputs = ["dataset_file: datasets.csv", "distribution: distributions.csv"]
+    else:
+        inputs = ["ejp_vp_file: " + workbook]
+    config_file = os.path.join(directory, "config.yml")
+    with open(config_file, "w") as config:
+        config.write("\n".join(["catalog_url: " + catalog_url, "log_level: ERROR", "retry_backoff: 0"] + inputs
+                               + list(lines)) + "\n")
+    return Config.Settings(config_file, directory)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Request handler that answers with the respond function of its StubServer
+    """
+    protocol_version = "HTTP/1.1"
+
+    def answer(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.requests.append((self.command, self.path))
+        status, headers, content = self.server.respond(self.command, self.path, dict(self.headers), body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_DELETE = answer
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """
+    HTTP server on a free port of localhost that answers every request with a function, in a background thread
+    """
+
+    def __init__(self, respond):
+        """
+        :param respond: Provide function of method, path, headers and body that returns the status, headers and body
+                        of the response
+        """
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.respond = respond
+        self.server.requests = []
+        self.requests = self.server.requests
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def serve_fake_fdp(fake_fdp):
+    """
+    :param fake_fdp: Provide FakeFDP object
+    :return: Function for a StubServer that answers like the fake FDP
+    """
+    def respond(method, path, headers, body):
+        response = fake_fdp.handle(method, path.split("?")[0], body, headers)
+        return response.status_code, response.headers, response.content
+    return respond
+
+
+def make_fake_fdp(url):
+    """
+    :param url: Provide URL of the FDP
+    :return: FakeFDP object without latency in which the root and the catalog /catalog/1 exist
+    """
+    return FakeFDP.FakeFDP(url, [url, url + "/catalog/1"], latency=0)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import CatalogIndex
+import FDPClient
+from tests.stubs import ENVIRONMENT, StubServer, make_fake_fdp, make_settings, serve_fake_fdp
+
+"""
+Crawl of a catalog in a fake FDP served on localhost, and the lookups in the index
+"""
+
+
+def dataset(title, identifier, catalog_url):
+    return ('<http://localhost/new> <http://purl.org/dc/terms/title> "%s" ; '
+            '<http://purl.org/dc/terms/identifier> "%s" ; <http://purl.org/dc/terms/isPartOf> <%s> .'
+            % (title, identifier, catalog_url))
+
+
+class CatalogCrawlerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        patcher = mock.patch.dict(os.environ, ENVIRONMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FDPClient.TOKENS.tokens.clear()
+
+        self.fake_fdp = None
+        self.server = StubServer(lambda *request: serve_fake_fdp(self.fake_fdp)(*request))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.fake_fdp = make_fake_fdp(self.server.url)
+        self.catalog_url = self.server.url + "/catalog/1"
+        settings = make_settings(directory, catalog_url=self.catalog_url)
+        self.client = FDPClient.FDPClient(self.server.url, "user", "password", self.server.url, settings,
+                                          session=FDPClient.create_session(4))
+
+    def test_crawl(self):
+        urls = [self.client.fdp_create_metadata(dataset("Dataset %d" % index, "id-%d" % index, self.catalog_url),
+                                                "dataset") for index in range(5)]
+        distribution = self.client.fdp_create_metadata(dataset("Distribution", "id-d", urls[0]), "distribution")
+
+        crawler = CatalogIndex.CatalogCrawler(self.client, concurrency=3)
+        index = crawler.crawl(self.catalog_url)
+        self.assertEqual(crawler.fetched, 7)
+        self.assertEqual(index.find("dataset", self.catalog_url, "Dataset 3")["url"], urls[3])
+        self.assertEqual(index.find("dataset", self.catalog_url, None, "id-4")["url"], urls[4])
+        self.assertEqual(index.find("distribution", urls[0], "Distribution")["url"], distribution)
+        self.assertIsNone(index.find("dataset", self.catalog_url, "Dataset 9"))
+        self.assertEqual(index.find("dataset", self.catalog_url, "Dataset 1")["hash"],
+                         CatalogIndex.payload_hash(dataset("Dataset 1", "id-1", self.catalog_url)))
+
+    def test_depth(self):
+        url = self.client.fdp_create_metadata(dataset("Dataset", "id", self.catalog_url), "dataset")
+        self.client.fdp_create_metadata(dataset("Distribution", "id-d", url), "distribution")
+        index = CatalogIndex.CatalogCrawler(self.client).crawl(self.catalog_url, depth=1)
+        self.assertTrue(index.contains(url))
+        self.assertEqual(len(index.get_children(url)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
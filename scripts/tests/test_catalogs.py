@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import FakeFDP
+import FDPClient
+import Populator
+from tests.stubs import CATALOG_URL, ENVIRONMENT, FDP_URL, make_settings
+from tests.workbooks import make_workbook
+
+"""
+Catalogs of the Catalog sheet of the EJP RD workbook: created with create_catalogs, otherwise the Catalog column links
+the resources to catalogs that already exist under the root of the FDP
+"""
+
+CATALOGS = ["Catalog A", "Catalog B"]
+
+
+class CatalogSheetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.dict(os.environ, ENVIRONMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("CHANGED_SINCE", None)
+        FDPClient.TOKENS.tokens.clear()
+        make_workbook(os.path.join(self.directory, "workbook.xlsx"), 2, CATALOGS)
+        self.fdp = FakeFDP.FakeFDP(FDP_URL, [FDP_URL, CATALOG_URL], latency=0)
+
+    def add_catalog(self, title):
+        """
+        :param title: Provide title of a catalog that exists under the root of the FDP before the run
+        :return: URL of the catalog
+        """
+        payload = ('<http://localhost/new> <http://purl.org/dc/terms/title> "%s" ; '
+                   '<http://purl.org/dc/terms/isPartOf> <%s> .' % (title, FDP_URL))
+        return self.fdp.handle("POST", "/catalog", payload.encode("utf-8"), {}).headers["Location"]
+
+    def populate(self, lines=()):
+        populator = Populator.Populator(make_settings(self.directory, lines, workbook="workbook.xlsx"),
+                                        session=self.fdp)
+        return populator, populator.TARGETS[0]
+
+    def test_existing_catalogs_are_linked(self):
+        urls = {title: self.add_catalog(title) for title in CATALOGS}
+        populator, target = self.populate()
+        populator.check_targets()
+        self.assertEqual(target.CREATED, 10)
+        self.assertEqual(len(self.fdp.resources), 2 + 2 + 10)
+        self.assertEqual(target.URLS["catalog/Catalog A"], urls["Catalog A"])
+        metadata = self.fdp.request("GET", target.URLS["dataset/Dataset 1"]).text
+        self.assertIn(urls["Catalog B"], metadata)
+
+    def test_missing_catalog_stops_the_upload(self):
+        self.add_catalog("Catalog A")
+        populator, target = self.populate()
+        with self.assertRaises(SystemExit):
+            populator.check_targets()
+        self.assertIn("Catalog B", str(target.ERROR))
+        self.assertEqual(target.CREATED, 0)
+        self.assertEqual(len(self.fdp.resources), 3)
+
+    def test_create_catalogs(self):
+        self.add_catalog("Catalog A")
+        populator, target = self.populate(["create_catalogs: true"])
+        populator.check_targets()
+        self.assertEqual(target.CREATED, 11)
+        self.assertEqual(len(target.CATALOGS), 2)
+        metadata = self.fdp.request("GET", target.URLS["catalog/Catalog B"]).text
+        self.assertIn(FDP_URL, metadata)
+
+
+if __name__ == "__main__":
+    unittest.main()
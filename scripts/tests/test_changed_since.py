@@ -0,0 +1,92 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+import Config
+import FakeFDP
+import Populator
+from tests.stubs import CATALOG_URL, ENVIRONMENT, FDP_URL, INPUT
+
+"""
+Runs with changed_since against a fake FDP: the resources of edited rows are updated in the FDP, not created again
+"""
+
+
+class RecordingFDP(FakeFDP.FakeFDP):
+    """
+    Fake FDP that keeps the method and URL of every request
+    """
+
+    def __init__(self):
+        super().__init__(FDP_URL, [FDP_URL, CATALOG_URL], latency=0)
+        self.requests = []
+
+    def request(self, method, url, data=None, headers=None, **kwargs):
+        self.requests.append((method, url))
+        return super().request(method, url, data, headers, **kwargs)
+
+
+class ChangedSinceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for name in ("datasets.csv", "distributions.csv"):
+            shutil.copy(os.path.join(INPUT, name), self.directory)
+        self.config_file = os.path.join(self.directory, "config.yml")
+        with open(self.config_file, "w") as config_file:
+            config_file.write("catalog_url: %s\ndataset_file: datasets.csv\ndistribution: distributions.csv\n"
+                              "log_level: WARNING\n" % CATALOG_URL)
+        self.git("init", "-q")
+        self.git("add", ".")
+        self.git("-c", "user.name=test", "-c", "user.email=test@example.org", "commit", "-q", "-m", "input")
+        patcher = mock.patch.dict(os.environ, ENVIRONMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("CHANGED_SINCE", None)
+        self.fdp = RecordingFDP()
+
+    def git(self, *arguments):
+        subprocess.run(["git", "-C", self.directory] + list(arguments), check=True)
+
+    def populate(self, overrides=None):
+        config = Config.Settings(self.config_file, self.directory, overrides)
+        populator = Populator.Populator(config, session=self.fdp)
+        populator.check_targets()
+        return populator.TARGETS[0]
+
+    def test_edited_row_is_updated(self):
+        first = self.populate()
+        self.assertEqual(first.CREATED, 10)
+        dataset_url = first.URLS["dataset/IBM Gene Expression Raw"]
+
+        path = os.path.join(self.directory, "datasets.csv")
+        with open(path, encoding="utf-8") as datasets:
+            content = datasets.read()
+        with open(path, "w", encoding="utf-8") as datasets:
+            datasets.write(content.replace("Gene expression for Inclusion Body Myositis",
+                                           "Raw gene expression for Inclusion Body Myositis", 1))
+        del self.fdp.requests[:]
+
+        second = self.populate({"changed_since": "HEAD"})
+        self.assertEqual(second.CREATED, 0)
+        self.assertEqual(second.UPDATED, 1)
+        self.assertEqual(second.URLS["dataset/IBM Gene Expression Raw"], dataset_url)
+        self.assertIn(("PUT", dataset_url), self.fdp.requests)
+        self.assertNotIn("POST", [method for method, url in self.fdp.requests if not url.endswith("/tokens")])
+        metadata = self.fdp.request("GET", dataset_url).text
+        self.assertIn("Raw gene expression for Inclusion Body Myositis", metadata)
+        self.assertIn(dataset_url, metadata)
+
+    def test_unchanged_input_sends_no_update(self):
+        self.populate()
+        del self.fdp.requests[:]
+        second = self.populate({"changed_since": "HEAD"})
+        self.assertEqual(second.UPDATED, 0)
+        self.assertNotIn("PUT", [method for method, url in self.fdp.requests])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from rdflib import BNode, Graph, URIRef
+from unittest import mock
+import Canonical
+import FakeFDP
+import Populator
+from tests.stubs import CATALOG_URL, ENVIRONMENT, FDP_URL, make_settings
+from tests.workbooks import make_workbook
+
+"""
+Exports of a generated EJP RD workbook: the canonical N-Quads are the same byte for byte in every run, whatever the hash
+seed of the process and whether the resources are rendered into the rdf_store, and so are the digests of the resources
+"""
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SIZE = 4
+
+# Reads the workbook and writes the export in a new process, the export is written while the input is read
+EXPORT = """
+import sys
+import FakeFDP
+import Populator
+from tests.stubs import CATALOG_URL, FDP_URL, make_settings
+Populator.Populator(make_settings(sys.argv[1], sys.argv[2:], workbook="workbook.xlsx"),
+                    session=FakeFDP.FakeFDP(FDP_URL, [FDP_URL, CATALOG_URL], latency=0))
+"""
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        make_workbook(os.path.join(self.directory, "workbook.xlsx"), SIZE, ["Catalog A", "Catalog B"])
+
+    def export(self, name, seed, lines=()):
+        """
+        :param name: Provide name of the export file
+        :param seed: Provide PYTHONHASHSEED of the process
+        :param lines: Provide extra lines of the config file
+        :return: Content of the export file
+        """
+        environment = dict(os.environ, PYTHONHASHSEED=str(seed), **ENVIRONMENT)
+        environment.pop("CHANGED_SINCE", None)
+        result = subprocess.run([sys.executable, "-c", EXPORT, self.directory, "export_file: " + name] + list(lines),
+                                cwd=SCRIPTS, env=environment, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                timeout=300)
+        self.assertEqual(result.returncode, 0, result.stdout.decode("utf-8", "replace"))
+        with open(os.path.join(self.directory, name), "rb") as export:
+            return export.read()
+
+    def test_export_is_reproducible(self):
+        expected = self.export("first.nq", 1)
+        self.assertEqual(self.export("second.nq", 2), expected)
+        self.assertEqual(self.export("store.nq", 3, ["rdf_store: true"]), expected)
+
+        lines = expected.decode("utf-8").splitlines()
+        self.assertEqual(len({line.split()[-2] for line in lines}), 5 * SIZE)
+        # The publishers are blank nodes in the graphs of the resources
+        self.assertTrue(any(" _:" in line for line in lines))
+        self.assertIn("<%s>" % CATALOG_URL, expected.decode("utf-8"))
+
+    def test_digests(self):
+        digests = {}
+        with mock.patch.dict(os.environ, ENVIRONMENT):
+            os.environ.pop("CHANGED_SINCE", None)
+            for rdf_store in ("false", "true"):
+                settings = make_settings(self.directory, ["rdf_store: " + rdf_store], workbook="workbook.xlsx")
+                populator = Populator.Populator(settings, session=FakeFDP.FakeFDP(FDP_URL, [FDP_URL, CATALOG_URL],
+                                                                                  latency=0))
+                digests[rdf_store] = {entry.KEY: entry.get_digest() for entry in populator.ENTRIES}
+        self.assertEqual(len(set(digests["false"].values())), 5 * SIZE)
+        self.assertEqual(digests["true"], digests["false"])
+
+
+class CanonicalTest(unittest.TestCase):
+
+    def test_blank_node_only_an_object(self):
+        graphs = []
+        for _ in range(2):
+            graph = Graph()
+            graph.add((URIRef("http://example.org/s"), URIRef("http://example.org/p"), BNode()))
+            graphs.append(graph)
+        self.assertEqual(Canonical.canonical_ntriples(graphs[0]), Canonical.canonical_ntriples(graphs[1]))
+        self.assertEqual(Canonical.digest(graphs[0]), Canonical.digest(graphs[1]))
+
+    def test_scope(self):
+        graph = Graph()
+        node = BNode()
+        graph.add((URIRef("http://example.org/s"), URIRef("http://example.org/p"), node))
+        graph.add((node, URIRef("http://example.org/name"), URIRef("http://example.org/o")))
+        self.assertNotEqual(Canonical.canonical_ntriples(graph, "dataset/A"),
+                            Canonical.canonical_ntriples(graph, "dataset/B"))
+        self.assertEqual(Canonical.canonical_ntriples(graph, "dataset/A"),
+                         Canonical.canonical_ntriples(graph, "dataset/A"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import requests
+import urllib3
+import FakeFDP
+import FDPClient
+import Populator
+from tests.stubs import CATALOG_URL, ENVIRONMENT, FDP_URL, make_settings
+
+"""
+Retries of the FDP client against a fake FDP. Requests that are not idempotent, like the create of a resource, are
+not sent again when the FDP may have processed them.
+"""
+
+
+class FailingFDP(FakeFDP.FakeFDP):
+    """
+    Fake FDP that fails the create requests with the given numbers, before or after it created the resource
+    """
+
+    def __init__(self, failing=(), after_create=False):
+        super().__init__(FDP_URL, [FDP_URL, CATALOG_URL], latency=0)
+        self.failing = set(failing)
+        self.after_create = after_create
+        self.creates = 0
+        self.requests = []
+
+    def handle(self, method, path, data, headers):
+        self.requests.append((method, path))
+        if method != "POST" or path.endswith("/tokens"):
+            return super().handle(method, path, data, headers)
+        with self.lock:
+            self.creates += 1
+            failing = self.creates in self.failing
+        if not failing:
+            return super().handle(method, path, data, headers)
+        if self.after_create:
+            # The resource is created, but the response is lost
+            super().handle(method, path, data, headers)
+        return FakeFDP.FakeResponse(503)
+
+    def count_created(self):
+        return len(self.resources) - 2
+
+
+class ClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.dict(os.environ, ENVIRONMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("CHANGED_SINCE", None)
+        FDPClient.TOKENS.tokens.clear()
+
+
+class CreateRetryTest(ClientTest):
+
+    def populate(self, fdp):
+        populator = Populator.Populator(make_settings(self.directory), session=fdp)
+        populator.check_targets()
+        return populator.TARGETS[0]
+
+    def test_lost_responses_do_not_duplicate(self):
+        fdp = FailingFDP(failing=(1, 4, 5), after_create=True)
+        target = self.populate(fdp)
+        self.assertEqual(target.CREATED, 10)
+        self.assertEqual(fdp.count_created(), 10)
+        self.assertEqual(fdp.creates, 10)
+        self.assertEqual(len(set(target.URLS.values())), 12)
+
+    def test_failed_creates_are_sent_again(self):
+        fdp = FailingFDP(failing=(1, 4, 5))
+        target = self.populate(fdp)
+        self.assertEqual(target.CREATED, 10)
+        self.assertEqual(fdp.count_created(), 10)
+        self.assertEqual(fdp.creates, 13)
+
+    def test_publish_is_retried(self):
+        fdp = FailingFDP()
+        original = fdp.handle
+        failures = []
+
+        def handle(method, path, data, headers):
+            if method == "PUT" and len(failures) < 2:
+                failures.append(path)
+                return FakeFDP.FakeResponse(503)
+            return original(method, path, data, headers)
+
+        fdp.handle = handle
+        target = self.populate(fdp)
+        self.assertEqual(target.CREATED, 10)
+        self.assertEqual(fdp.creates, 10)
+        self.assertEqual(failures[0], failures[1])
+
+
+class ConnectionErrorTest(ClientTest):
+
+    def make_client(self, errors):
+        """
+        :param errors: Provide list of exceptions raised by the first create requests
+        :return: FDPClient object and its fake FDP
+        """
+        fdp = FailingFDP()
+        original = fdp.request
+
+        def request(method, url, data=None, headers=None, **kwargs):
+            if method == "POST" and not url.endswith("/tokens") and errors:
+                fdp.creates += 1
+                raise errors.pop(0)
+            return original(method, url, data, headers, **kwargs)
+
+        fdp.request = request
+        settings = make_settings(self.directory)
+        return FDPClient.FDPClient(FDP_URL, "user", "password", FDP_URL, settings, session=fdp), fdp
+
+    def test_connect_error_is_retried(self):
+        refused = urllib3.exceptions.NewConnectionError(None, "Connection refused")
+        error = requests.ConnectionError(urllib3.exceptions.MaxRetryError(None, FDP_URL + "/dataset", refused))
+        client, fdp = self.make_client([error, requests.ConnectTimeout("connect timeout")])
+        url = client.fdp_create_metadata("<http://localhost/new> <http://purl.org/dc/terms/title> \"a\" .",
+                                         "dataset")
+        self.assertTrue(url.startswith(FDP_URL + "/dataset/"))
+        self.assertEqual(fdp.creates, 3)
+        self.assertEqual(client.retries, 2)
+
+    def test_read_error_is_not_retried(self):
+        client, fdp = self.make_client([requests.ConnectionError("Connection reset by peer")])
+        with self.assertRaises(requests.ConnectionError):
+            client.fdp_create_metadata("<http://localhost/new> <http://purl.org/dc/terms/title> \"a\" .", "dataset")
+        self.assertEqual(fdp.creates, 1)
+        self.assertEqual(fdp.count_created(), 0)
+
+    def test_read_error_is_retried_if_nothing_was_created(self):
+        client, fdp = self.make_client([requests.ReadTimeout("read timeout")])
+        url = client.fdp_create_metadata("<http://localhost/new> <http://purl.org/dc/terms/title> \"a\" .",
+                                         "dataset", lambda: None)
+        self.assertTrue(url.startswith(FDP_URL + "/dataset/"))
+        self.assertEqual(fdp.count_created(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+import LinkChecker
+from tests.stubs import StubServer
+
+"""
+Link check against an HTTP server on localhost with working, broken and redirected links and a server that does not
+allow HEAD requests
+"""
+
+
+def respond(method, path, headers, body):
+    if path == "/ok":
+        return 200, {}, b"ok"
+    if path == "/moved":
+        return 301, {"Location": "/ok"}, b""
+    if path == "/moved-to-missing":
+        return 302, {"Location": "/missing"}, b""
+    if path == "/no-head":
+        return (405, {"Allow": "GET"}, b"") if method == "HEAD" else (200, {}, b"large body")
+    return 404, {}, b"not found"
+
+
+class LinkCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache_file = os.path.join(self.directory, "links.json")
+        self.server = StubServer(respond)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def url(self, path):
+        return self.server.url + path
+
+    def make_checker(self, ttl=3600):
+        return LinkChecker.LinkChecker(concurrency=4, host_rate=0, timeout=5, cache_file=self.cache_file, ttl=ttl)
+
+    def test_results(self):
+        checker = self.make_checker()
+        results = checker.check([self.url(path) for path in ("/ok", "/missing", "/moved", "/moved-to-missing",
+                                                              "/no-head")])
+        self.assertTrue(results[self.url("/ok")]["ok"])
+        self.assertEqual(results[self.url("/missing")]["status"], 404)
+        self.assertEqual(results[self.url("/missing")]["error"], "HTTP 404")
+        self.assertTrue(results[self.url("/moved")]["ok"])
+        self.assertEqual(results[self.url("/moved")]["status"], 200)
+        self.assertFalse(results[self.url("/moved-to-missing")]["ok"])
+        self.assertTrue(results[self.url("/no-head")]["ok"])
+        self.assertEqual(sorted(checker.get_broken()), [self.url("/missing"), self.url("/moved-to-missing")])
+        self.assertIn(("HEAD", "/no-head"), self.server.requests)
+        self.assertIn(("GET", "/no-head"), self.server.requests)
+        self.assertNotIn(("GET", "/ok"), self.server.requests)
+
+    def test_urls_are_checked_once(self):
+        checker = self.make_checker()
+        checker.check([self.url("/ok")] * 5 + [self.url("/missing")] * 3)
+        self.assertEqual(self.server.requests.count(("HEAD", "/ok")), 1)
+        self.assertEqual(self.server.requests.count(("HEAD", "/missing")), 1)
+
+    def test_connection_error(self):
+        checker = self.make_checker()
+        # Nothing listens on the port of a closed server
+        closed = StubServer(respond)
+        closed.server.server_close()
+        url = closed.url + "/ok"
+        result = checker.check([url])[url]
+        self.assertFalse(result["ok"])
+        self.assertIsNone(result["status"])
+        self.assertIn("ConnectionError", result["error"])
+
+    def test_cache_is_reused(self):
+        urls = [self.url("/ok"), self.url("/missing"), self.url("/no-head")]
+        self.make_checker().check(urls)
+        with open(self.cache_file, encoding="utf-8") as cache_file:
+            self.assertEqual(sorted(json.load(cache_file)), [self.url("/no-head"), self.url("/ok")])
+        del self.server.requests[:]
+
+        # Working links come from the cache, broken links are checked again
+        checker = self.make_checker()
+        results = checker.check(urls)
+        self.assertEqual(checker.cached, 2)
+        self.assertEqual(self.server.requests, [("HEAD", "/missing")])
+        self.assertTrue(results[self.url("/ok")]["ok"])
+        self.assertIn("link check: 3 URLs, 1 broken, 2 from the cache", checker.get_summary()[0])
+
+    def test_expired_cache(self):
+        self.make_checker().check([self.url("/ok")])
+        del self.server.requests[:]
+        checker = self.make_checker(ttl=0)
+        checker.check([self.url("/ok")])
+        self.assertEqual(checker.cached, 0)
+        self.assertEqual(self.server.requests, [("HEAD", "/ok")])
+
+    def test_collect_urls(self):
+        resource = SimpleNamespace(TITLE="Dataset", LANDINGPAGE=[" http://example.org/a ", "not a url"],
+                                   LOGO="http://example.org/a", ACCESSURL=None)
+        entry = SimpleNamespace(RESOURCE=resource, TYPE="dataset")
+        self.assertEqual(LinkChecker.collect_urls([entry]),
+                         {"http://example.org/a": [("dataset", "Dataset", "landingpage"),
+                                                   ("dataset", "Dataset", "logo")]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+import FDPClient
+import RateLimiter
+from tests.stubs import ENVIRONMENT, StubServer, make_fake_fdp, make_settings, serve_fake_fdp
+
+"""
+Rate limiting and adaptive concurrency of the FDP client, against a fake FDP served on localhost that throttles
+requests with 429 Too Many Requests and fails them with 503 Service Unavailable
+"""
+
+PAYLOAD = "<http://localhost/new> <http://purl.org/dc/terms/title> \"Throttled dataset\" ."
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_rate(self):
+        bucket = RateLimiter.TokenBucket(20, 1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertGreater(bucket.waited, 0)
+
+    def test_disabled(self):
+        bucket = RateLimiter.TokenBucket(0)
+        for _ in range(1000):
+            bucket.acquire()
+        self.assertEqual(bucket.waited, 0)
+
+
+class ConcurrencyLimiterTest(unittest.TestCase):
+
+    def run_requests(self, limiter, errors):
+        for error in errors:
+            with limiter.slot() as result:
+                result["error"] = error
+
+    def test_increase(self):
+        limiter = RateLimiter.ConcurrencyLimiter(3, True, window=4)
+        self.assertEqual(limiter.limit, 1)
+        self.run_requests(limiter, [False] * 12)
+        self.assertEqual(limiter.limit, 3)
+        self.assertEqual(limiter.increases, 2)
+
+    def test_decrease(self):
+        limiter = RateLimiter.ConcurrencyLimiter(8, True, window=4)
+        limiter.limit = 8
+        self.run_requests(limiter, [False, True, False, False])
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.decreases, 1)
+
+    def test_fixed(self):
+        limiter = RateLimiter.ConcurrencyLimiter(4, window=4)
+        self.run_requests(limiter, [True] * 8)
+        self.assertEqual(limiter.limit, 4)
+
+
+class ThrottlingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.dict(os.environ, ENVIRONMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FDPClient.TOKENS.tokens.clear()
+
+        # Scripted status and headers of the next requests per method, before the fake FDP answers again
+        self.script = {"POST": [], "PUT": []}
+        self.fake_fdp = None
+
+        def respond(method, path, headers, body):
+            if self.script.get(method) and not path.endswith("/tokens"):
+                status, response_headers = self.script[method].pop(0)
+                return status, response_headers, b""
+            return serve_fake_fdp(self.fake_fdp)(method, path, headers, body)
+
+        self.server = StubServer(respond)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.fake_fdp = make_fake_fdp(self.server.url)
+        settings = make_settings(self.directory, catalog_url=self.server.url + "/catalog/1")
+        self.client = FDPClient.FDPClient(self.server.url, "user", "password", self.server.url, settings,
+                                          session=FDPClient.create_session(1))
+
+    def count(self, method, suffix):
+        return sum(1 for request_method, path in self.server.requests
+                   if request_method == method and path.endswith(suffix))
+
+    def test_retry_after_is_honoured(self):
+        url = self.client.fdp_create_metadata(PAYLOAD, "dataset")
+        self.script["PUT"] = [(429, {"Retry-After": "1"}), (503, {})]
+        start = time.monotonic()
+        self.client.fdp_publish_metadata(url)
+        self.assertGreaterEqual(time.monotonic() - start, 1.0)
+        self.assertEqual(self.client.retries, 2)
+        self.assertEqual(self.count("PUT", "/meta/state"), 4)
+
+    def test_throttled_create_is_sent_again(self):
+        self.script["POST"] = [(429, {"Retry-After": "0"})]
+        url = self.client.fdp_create_metadata(PAYLOAD, "dataset")
+        self.assertTrue(url.startswith(self.server.url + "/dataset/"))
+        self.assertEqual(self.count("POST", "/dataset"), 2)
+        self.assertEqual(len(self.fake_fdp.resources), 3)
+        self.assertEqual(self.client.retries, 1)
+
+    def test_throttling_lowers_the_concurrency_until_it_recovers(self):
+        limiter = RateLimiter.ConcurrencyLimiter(4, True, window=4)
+        self.client.CONCURRENCY_LIMITER = limiter
+        url = self.client.fdp_create_metadata(PAYLOAD, "dataset")
+        for _ in range(10):
+            self.client.fdp_publish_metadata(url)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.increases, 3)
+
+        # Three of the four attempts of one publish are throttled
+        self.script["PUT"] = [(429, {"Retry-After": "0"})] * 3
+        self.client.fdp_publish_metadata(url)
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.decreases, 1)
+
+        for _ in range(8):
+            self.client.fdp_publish_metadata(url)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.decreases, 1)
+
+    def test_throttled_until_the_retries_run_out(self):
+        url = self.client.fdp_create_metadata(PAYLOAD, "dataset")
+        self.script["PUT"] = [(429, {"Retry-After": "0"})] * 4
+        with self.assertRaises(SystemError):
+            self.client.fdp_publish_metadata(url)
+        self.assertEqual(self.client.retries, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
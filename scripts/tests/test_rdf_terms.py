@@ -0,0 +1,146 @@
+import datetime
+import unittest
+import RDFTerms
+from rdflib import Graph, Literal, URIRef
+
+"""
+Escaping of the RDF terms in the Turtle templates. Every serialized term is parsed back with rdflib, so a value that
+breaks the Turtle fails the test.
+"""
+
+SUBJECT = "<http://example.org/s>"
+PREDICATE = "<http://example.org/p>"
+
+
+def parse_objects(objects):
+    """
+    :param objects: Provide serialized Turtle object list
+    :return: Set of the objects of the parsed triples
+    """
+    graph = Graph()
+    graph.parse(data=SUBJECT + " " + PREDICATE + " " + objects + " .", format="turtle")
+    return set(graph.objects())
+
+
+class LiteralTest(unittest.TestCase):
+
+    def assert_round_trip(self, value):
+        self.assertEqual(parse_objects(RDFTerms.literal(value)), {Literal(value)})
+
+    def test_plain(self):
+        self.assertEqual(RDFTerms.literal("rare disease"), '"rare disease"')
+
+    def test_quotes(self):
+        self.assertEqual(RDFTerms.literal('say "hi"'), '"say \\"hi\\""')
+        self.assert_round_trip('say "hi"')
+        self.assert_round_trip('"')
+
+    def test_backslashes(self):
+        self.assertEqual(RDFTerms.literal("a\\b"), '"a\\\\b"')
+        self.assert_round_trip("C:\\data\\")
+        self.assert_round_trip('\\"')
+
+    def test_line_breaks_and_tabs(self):
+        self.assertEqual(RDFTerms.literal("a\nb\rc\td"), '"a\\nb\\rc\\td"')
+        self.assert_round_trip("first line\r\nsecond line\n\tindented")
+
+    def test_backspace_and_form_feed(self):
+        self.assert_round_trip("a\bb\fc")
+
+    def test_angle_brackets_in_literal(self):
+        self.assertEqual(RDFTerms.literal("<b>bold</b>"), '"<b>bold</b>"')
+        self.assert_round_trip("<b>bold</b> & more")
+
+    def test_non_ascii(self):
+        self.assertEqual(RDFTerms.literal("Käse – 日本語"), '"Käse – 日本語"')
+        self.assert_round_trip("Ünïcödé ✓ 😀")
+
+    def test_empty(self):
+        self.assertEqual(RDFTerms.literal(""), '""')
+        self.assert_round_trip("")
+
+    def test_not_a_string(self):
+        self.assertEqual(RDFTerms.literal(12), '"12"')
+
+    def test_typed_literal(self):
+        datatype = "http://www.w3.org/2001/XMLSchema#string"
+        serialized = RDFTerms.typed_literal('a "b"\n', datatype)
+        self.assertEqual(parse_objects(serialized), {Literal('a "b"\n', datatype=URIRef(datatype))})
+
+
+class IRITest(unittest.TestCase):
+
+    def test_plain(self):
+        self.assertEqual(RDFTerms.iri("http://example.org/a"), "<http://example.org/a>")
+
+    def test_angle_brackets(self):
+        self.assertEqual(RDFTerms.iri("http://example.org/<a>"), "<http://example.org/%3Ca%3E>")
+        self.assertEqual(parse_objects(RDFTerms.iri("http://example.org/<a>")),
+                         {URIRef("http://example.org/%3Ca%3E")})
+
+    def test_unsafe_characters(self):
+        serialized = RDFTerms.iri('http://example.org/a b"c{d}|e^f`g\\h')
+        self.assertEqual(serialized, "<http://example.org/a%20b%22c%7Bd%7D%7Ce%5Ef%60g%5Ch>")
+        self.assertEqual(len(parse_objects(serialized)), 1)
+
+    def test_line_breaks_and_tabs(self):
+        self.assertEqual(RDFTerms.iri("http://example.org/a\nb\tc"), "<http://example.org/a%0Ab%09c>")
+
+    def test_surrounding_white_space(self):
+        self.assertEqual(RDFTerms.iri("  http://example.org/a \n"), "<http://example.org/a>")
+
+    def test_non_ascii(self):
+        # Non-ASCII characters are allowed in a Turtle IRI
+        self.assertEqual(RDFTerms.iri("http://example.org/café"), "<http://example.org/café>")
+        self.assertEqual(parse_objects(RDFTerms.iri("http://example.org/café")), {URIRef("http://example.org/café")})
+
+
+class ListTest(unittest.TestCase):
+
+    def test_literal_list(self):
+        serialized = RDFTerms.literal_list(["a", 'b "c"', "d\ne"])
+        self.assertEqual(serialized, '"a", "b \\"c\\"", "d\\ne"')
+        self.assertEqual(parse_objects(serialized), {Literal("a"), Literal('b "c"'), Literal("d\ne")})
+
+    def test_iri_list(self):
+        serialized = RDFTerms.iri_list(["http://example.org/a", "http://example.org/<b>"])
+        self.assertEqual(serialized, "<http://example.org/a>, <http://example.org/%3Cb%3E>")
+        self.assertEqual(len(parse_objects(serialized)), 2)
+
+    def test_none_and_empty_lists(self):
+        for function in (RDFTerms.literal_list, RDFTerms.iri_list):
+            with self.subTest(function=function.__name__):
+                self.assertEqual(function(None), "")
+                self.assertEqual(function([]), "")
+                self.assertEqual(function([None]), "")
+
+    def test_empty_values_are_skipped(self):
+        self.assertEqual(RDFTerms.literal_list([None, "", "a"]), '"a"')
+        self.assertEqual(RDFTerms.literal_list(["", None]), "")
+        self.assertEqual(RDFTerms.iri_list([None, "", "  ", "http://example.org/a"]), "<http://example.org/a>")
+        self.assertEqual(RDFTerms.iri_list(["", " "]), "")
+
+    def test_large_lists(self):
+        keywords = ['keyword "%d"\n' % index for index in range(500)]
+        themes = ["http://example.org/theme/%d <x>" % index for index in range(500)]
+        self.assertEqual(len(parse_objects(RDFTerms.literal_list(keywords))), 500)
+        self.assertEqual(len(parse_objects(RDFTerms.iri_list(themes))), 500)
+
+
+class ValueTest(unittest.TestCase):
+
+    def test_lexical(self):
+        self.assertEqual(RDFTerms.lexical(datetime.date(2023, 1, 31)), "2023-01-31")
+        self.assertEqual(RDFTerms.lexical(datetime.datetime(2023, 1, 31, 12, 30)), "2023-01-31T12:30:00")
+        self.assertEqual(RDFTerms.lexical("  a  "), "a")
+        self.assertEqual(RDFTerms.lexical(3), "3")
+
+    def test_values(self):
+        self.assertEqual(RDFTerms.values(None), [])
+        self.assertEqual(RDFTerms.values(""), [])
+        self.assertEqual(RDFTerms.values("a"), ["a"])
+        self.assertEqual(RDFTerms.values(["a", None, " ", 0]), ["a", 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import FakeFDP
+import FDPClient
+import Log
+import Populator
+from tests.stubs import CATALOG_URL, ENVIRONMENT, FDP_URL, make_settings
+from tests.workbooks import make_workbook
+
+"""
+Partial runs of an EJP RD workbook: the datasets of the selected distributions are read as their parents, and counted
+apart from the selected rows
+"""
+
+
+class SelectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.dict(os.environ, ENVIRONMENT)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop("CHANGED_SINCE", None)
+        FDPClient.TOKENS.tokens.clear()
+        make_workbook(os.path.join(self.directory, "workbook.xlsx"), 3)
+
+    def read(self, lines):
+        """
+        :param lines: Provide select_* lines of the config file
+        :return: Populator that read the workbook, and the lines of the selection summary
+        """
+        settings = make_settings(self.directory, lines, workbook="workbook.xlsx")
+        with self.assertLogs(Log.ROOT_LOGGER_NAME + ".Selection", "INFO") as logs:
+            populator = Populator.Populator(settings, session=FakeFDP.FakeFDP(FDP_URL, [FDP_URL, CATALOG_URL],
+                                                                              latency=0))
+        return populator, [record.getMessage() for record in logs.records]
+
+    def test_parents_of_unselected_type(self):
+        populator, summary = self.read(["select_types: distribution", "select_title: Distribution 1"])
+        self.assertEqual(sorted(entry.KEY for entry in populator.ENTRIES),
+                         ["dataset/Dataset 1", "distribution/Distribution 1"])
+        self.assertIn("Selected 1 of 3 distribution rows", summary)
+        self.assertIn("Read 1 dataset rows as parents of selected resources", summary)
+        self.assertEqual(populator.SELECTION.parents, {"dataset": 1})
+
+    def test_parents_of_selected_type(self):
+        populator, summary = self.read(["select_types: dataset,distribution", "select_title: Distribution 2"])
+        self.assertEqual(sorted(entry.KEY for entry in populator.ENTRIES),
+                         ["dataset/Dataset 2", "distribution/Distribution 2"])
+        self.assertIn("Selected 1 of 3 distribution rows", summary)
+        self.assertIn("Selected 0 of 3 dataset rows, 1 more read as parents of selected resources", summary)
+
+    def test_selected_parent_is_counted_once(self):
+        populator, summary = self.read(["select_types: dataset,distribution", "select_rows: 2"])
+        self.assertIn("Selected 1 of 3 dataset rows", summary)
+        self.assertEqual(populator.SELECTION.parents, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from tests.stubs import StubServer, make_fake_fdp, make_settings, serve_fake_fdp
+
+"""
+A sharded run with worker processes against a fake FDP served on localhost, and the merge of their journals
+"""
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SHARDS = 2
+
+
+class ShardedRunTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.fake_fdp = None
+        self.server = StubServer(lambda *request: serve_fake_fdp(self.fake_fdp)(*request))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.fake_fdp = make_fake_fdp(self.server.url)
+
+    def run_shards(self, lines):
+        """
+        Method to run every shard in its own process with shards.py run, and merge the journals
+
+        :param lines: Provide extra lines of the config file
+        :return: Merged URL mapping of the FDP
+        """
+        environment = dict(os.environ, FDP_URL=self.server.url, FDP_PERSISTENT_URL=self.server.url,
+                           FDP_USERNAME="user", FDP_PASSWORD="password", BASE_PATH=self.directory,
+                           CONFIG_FILE=os.path.join(self.directory, "config.yml"))
+        environment.pop("CHANGED_SINCE", None)
+        make_settings(self.directory, lines, self.server.url + "/catalog/1")
+        output = os.path.join(self.directory, "urls.json")
+        result = subprocess.run([sys.executable, "shards.py", "run", str(SHARDS), "--journals",
+                                 os.path.join(self.directory, "journals"), "--output", output],
+                                cwd=SCRIPTS, env=environment, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                timeout=300)
+        self.assertEqual(result.returncode, 0, result.stdout.decode("utf-8", "replace"))
+        with open(output, encoding="utf-8") as mapping:
+            return json.load(mapping)["targets"]["fdp"]
+
+    def test_merged_mapping(self):
+        target = self.run_shards(["export_file: export.nq"])
+        urls = target["urls"]
+        self.assertEqual(len(urls), 10)
+        self.assertEqual(len(set(urls.values())), 10)
+        self.assertEqual(sum(1 for key in urls if key.startswith("dataset/")), 6)
+        # Every resource was created once, by one of the workers
+        self.assertEqual(len(self.fake_fdp.resources), 12)
+        for url in urls.values():
+            self.assertIn(url[len(self.server.url):], self.fake_fdp.resources)
+
+        # Every resource is in the journal of one shard
+        journals = {}
+        for shard in range(1, SHARDS + 1):
+            with open(os.path.join(self.directory, "journals", "shard-%d.json" % shard), encoding="utf-8") as journal:
+                journals[shard] = set(json.load(journal)["resources"])
+        self.assertEqual(journals[1] | journals[2], set(urls))
+        self.assertFalse(journals[1] & journals[2])
+        self.assertTrue(journals[1] and journals[2])
+
+        # Every worker exported its own shard
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "export.nq")))
+        exported = 0
+        for shard in range(1, SHARDS + 1):
+            with open(os.path.join(self.directory, "export-%d.nq" % shard), encoding="utf-8") as export:
+                exported += len({line.split()[-2] for line in export if line.strip()})
+        self.assertEqual(exported, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
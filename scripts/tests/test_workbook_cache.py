@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import Log
+import WorkbookCache
+from template_readers import FDPTemplateReader, VPTemplateReader
+from tests.stubs import INPUT
+from tests.workbooks import make_workbook
+
+"""
+Records of a generated EJP RD workbook and of the test-input CSV files in the workbook cache: a hit gives the records
+of a parse without parsing again, and changed files, other engines and other reader versions are parsed again
+"""
+
+NOT_PARSED = mock.Mock(side_effect=AssertionError("the input file is parsed again"))
+
+
+def read_bytes(path):
+    with open(path, "rb") as input_file:
+        return input_file.read()
+
+
+class WorkbookCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = os.path.join(self.directory, "cache")
+        self.workbook = os.path.join(self.directory, "workbook.xlsx")
+        make_workbook(self.workbook, 20, ["Catalog A"])
+
+    def make_config(self, engine="openpyxl", cache=True):
+        """
+        :param engine: Provide workbook_engine, openpyxl or native
+        :param cache: Provide False to read without the cache
+        :return: Settings of the readers
+        """
+        return SimpleNamespace(EJP_VP_INPUT_FILE=self.workbook, WORKBOOK_ENGINE=engine,
+                               WORKBOOK_CACHE=self.cache if cache else None, WORKBOOK_CACHE_SIZE=64 * 1024 * 1024)
+
+    def read(self, engine="openpyxl", cache=True):
+        """
+        :return: Records of the workbook, read by a new reader
+        """
+        return VPTemplateReader.VPTemplateReader(self.make_config(engine, cache)).get_workbook()
+
+    def get_entries(self):
+        """
+        :return: Sorted names of the entries in the cache directory
+        """
+        return sorted(name for name in os.listdir(self.cache) if name.endswith(WorkbookCache.WorkbookCache.SUFFIX))
+
+    def test_hit(self):
+        for engine in ("openpyxl", "native"):
+            with self.subTest(engine=engine):
+                records = self.read(engine, cache=False)
+                self.assertEqual(self.read(engine), records)
+                with mock.patch.object(VPTemplateReader.VPTemplateReader, "read_workbook", NOT_PARSED), \
+                        mock.patch.object(VPTemplateReader.VPTemplateReader, "read_workbook_native", NOT_PARSED):
+                    self.assertEqual(self.read(engine), records)
+        # The engines read different sheets, so they have their own entries
+        self.assertEqual(len(self.get_entries()), 2)
+
+    def test_changed_workbook(self):
+        self.read()
+        make_workbook(self.workbook, 21, ["Catalog A"])
+        records = self.read()
+        self.assertEqual(len(records["sheets"]["Dataset"]), 22)
+        self.assertEqual(len(self.get_entries()), 2)
+
+    def test_reader_version(self):
+        self.read()
+        with mock.patch.object(VPTemplateReader.VPTemplateReader, "CACHE_VERSION",
+                               VPTemplateReader.VPTemplateReader.CACHE_VERSION + 1):
+            self.read()
+        self.assertEqual(len(self.get_entries()), 2)
+
+    def test_unreadable_entry(self):
+        records = self.read()
+        for name in self.get_entries():
+            with open(os.path.join(self.cache, name), "wb") as entry:
+                entry.write(b"not a cache entry")
+        with self.assertLogs(Log.ROOT_LOGGER_NAME + ".WorkbookCache", "WARNING"):
+            self.assertEqual(self.read(), records)
+        self.assertEqual(self.read(), records)
+
+    def test_csv_rows(self):
+        config = self.make_config()
+        path = os.path.join(INPUT, "datasets.csv")
+        rows = FDPTemplateReader.FDPTemplateReader.read_csv(path)
+        self.assertEqual(FDPTemplateReader.FDPTemplateReader(config).get_rows(path), rows)
+        with mock.patch.object(FDPTemplateReader.FDPTemplateReader, "read_csv", NOT_PARSED):
+            self.assertEqual(FDPTemplateReader.FDPTemplateReader(config).get_rows(path), rows)
+
+    def test_eviction(self):
+        cache = WorkbookCache.WorkbookCache(self.cache, max_bytes=3000)
+        paths = []
+        for index in range(3):
+            path = os.path.join(self.directory, "input-%d.txt" % index)
+            with open(path, "wb") as input_file:
+                input_file.write(os.urandom(1200))
+            paths.append(path)
+        cache.load(paths[0], 1, read_bytes)
+        cache.load(paths[1], 1, read_bytes)
+        # A hit makes the first entry the most recently used one, so the second entry is evicted
+        time.sleep(0.05)
+        cache.load(paths[0], 1, NOT_PARSED)
+        time.sleep(0.05)
+        cache.load(paths[2], 1, read_bytes)
+        self.assertEqual(self.get_entries(), sorted(
+            WorkbookCache.WorkbookCache.get_file_hash(path) + "-1" + WorkbookCache.WorkbookCache.SUFFIX
+            for path in (paths[0], paths[2])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import FakeFDP
+import Populator
+import XlsxReader
+from template_readers import VPTemplateReader
+from tests.stubs import CATALOG_URL, ENVIRONMENT, FDP_URL, make_settings
+from tests.workbooks import make_workbook
+
+"""
+Parity of the native xlsx reader with the values openpyxl reads, on the EJP RD workbooks in vp_test_input and on
+generated workbooks of the current template version
+"""
+
+TEMPLATES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "vp_test_input",
+                                          "*.xlsx")))
+FIXTURES = list(TEMPLATES)
+DIRECTORY = None
+
+
+def setUpModule():
+    global DIRECTORY
+    DIRECTORY = tempfile.mkdtemp()
+    for name, size, catalogs in (("small.xlsx", 3, ()), ("catalogs.xlsx", 40, ("Catalog A", "Catalog B"))):
+        path = os.path.join(DIRECTORY, name)
+        make_workbook(path, size, catalogs)
+        FIXTURES.append(path)
+
+
+def tearDownModule():
+    del FIXTURES[len(TEMPLATES):]
+    shutil.rmtree(DIRECTORY)
+
+
+class XlsxReaderTest(unittest.TestCase):
+
+    def test_fixtures_exist(self):
+        self.assertGreaterEqual(len(TEMPLATES), 2)
+        self.assertEqual(len(FIXTURES), len(TEMPLATES) + 2)
+
+    def test_values_match_openpyxl(self):
+        for path in FIXTURES:
+            with self.subTest(workbook=os.path.basename(path)):
+                expected = VPTemplateReader.VPTemplateReader.read_workbook(path)
+                actual = XlsxReader.read_workbook(path)
+                self.assertEqual(actual["sheetnames"], expected["sheetnames"])
+                self.assertEqual(sorted(actual["sheets"]), sorted(expected["sheets"]))
+                for sheet, rows in expected["sheets"].items():
+                    self.assertEqual(actual["sheets"][sheet], rows, "sheet " + sheet)
+
+    def test_only_requested_sheets_are_read(self):
+        for path in FIXTURES:
+            with self.subTest(workbook=os.path.basename(path)):
+                expected = VPTemplateReader.VPTemplateReader.read_workbook(path)
+                names = expected["sheetnames"][:2]
+                actual = XlsxReader.read_workbook(path, names)
+                self.assertEqual(actual["sheetnames"], expected["sheetnames"])
+                self.assertEqual(actual["sheets"], {name: expected["sheets"][name] for name in names})
+
+    def test_no_sheets_requested(self):
+        for path in FIXTURES:
+            with self.subTest(workbook=os.path.basename(path)):
+                actual = XlsxReader.read_workbook(path, [])
+                self.assertEqual(actual["sheets"], {})
+                self.assertTrue(actual["sheetnames"])
+
+
+class TemplateVersionTest(unittest.TestCase):
+
+    @staticmethod
+    def make_reader(path, engine):
+        """
+        :param path: Provide path of the workbook
+        :param engine: Provide workbook_engine, openpyxl or native
+        :return: VPTemplateReader of the workbook without a cache
+        """
+        config = SimpleNamespace(EJP_VP_INPUT_FILE=path, WORKBOOK_ENGINE=engine, WORKBOOK_CACHE=None)
+        return VPTemplateReader.VPTemplateReader(config)
+
+    def test_generated_workbooks_conform(self):
+        for path in FIXTURES[len(TEMPLATES):]:
+            for engine in ("openpyxl", "native"):
+                with self.subTest(workbook=os.path.basename(path), engine=engine):
+                    self.make_reader(path, engine).check_template_version()
+
+    def test_older_templates_are_rejected(self):
+        # The workbooks in vp_test_input have a combined BiobankPatientRegistry sheet and no Catalog sheet
+        for path in TEMPLATES:
+            for engine in ("openpyxl", "native"):
+                with self.subTest(workbook=os.path.basename(path), engine=engine):
+                    with self.assertRaises(SystemError):
+                        self.make_reader(path, engine).check_template_version()
+
+    def test_payloads_match(self):
+        # Every resource of a run is rendered to the same payload with both engines
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        shutil.copy(FIXTURES[-1], os.path.join(directory, "workbook.xlsx"))
+        payloads = {}
+        with mock.patch.dict(os.environ, ENVIRONMENT):
+            os.environ.pop("CHANGED_SINCE", None)
+            for engine in ("openpyxl", "native"):
+                settings = make_settings(directory, ["workbook_engine: " + engine], workbook="workbook.xlsx")
+                populator = Populator.Populator(settings, session=FakeFDP.FakeFDP(FDP_URL, [FDP_URL, CATALOG_URL],
+                                                                                  latency=0))
+                payloads[engine] = {entry.KEY: entry.get_payload() for entry in populator.ENTRIES}
+        self.assertEqual(len(payloads["native"]), 40 * 5)
+        self.assertTrue(all(payloads["native"].values()))
+        self.assertEqual(payloads["native"], payloads["openpyxl"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import openpyxl
+
+"""
+EJP RD workbooks for the tests, with the sheets and columns check_template_version and the readers expect
+"""
+
+RESOURCE_COLUMNS = ["License", "Title", "Description", "Theme", "Publisher", "ContactPoint", "PersonalData",
+                    "PopulationCoverage", "Language", "AccessRights", "LandingPage", "Distribution", "VPConnection",
+                    "ODRL Policy", "Keyword", "Logo", "Identifier", "Issued", "Modified", "Version", "ConformsTo"]
+DISTRIBUTION_COLUMNS = ["License", "Title", "Description", "Publisher", "Version", "AccessRights", "ODRLPolicy",
+                        "MediaType", "IsPartOf", "Type", "AccessService", "Dataset Title"]
+DATASERVICE_COLUMNS = ["License", "Type", "Title", "Description", "PersonalData", "Publisher", "Theme", "Language",
+                       "ContactPoint", "PopulationCoverage", "AccessRights", "ConformsTo", "EndpointDescription",
+                       "EndpointURL", "LandingPage", "VPConnection", "ODRLPolicy", "Logo", "ServesDataset", "Keyword",
+                       "Identifier", "Issued", "Modified", "Version", "ConformsTo"]
+ORGANISATION = "Organisation A"
+
+
+def resource_row(kind, index, catalogs):
+    """
+    :param kind: Provide title prefix of the resource, e.g. Dataset
+    :param index: Provide number of the resource
+    :param catalogs: Provide list of catalog titles the resources are spread over, or an empty list
+    :return: Row of a biobank, patient registry or dataset sheet
+    """
+    return ["http://rdflicense.appspot.com/rdflicense/cc-by-nc-nd3.0", "%s %d" % (kind, index),
+            "Description of %s %d, with \"quotes\" and a\nline break" % (kind.lower(), index),
+            "http://purl.obolibrary.org/obo/DOID_%d|http://edamontology.org/topic_0203" % (index + 1), ORGANISATION,
+            "mailto:contact%d@example.org" % index, "true", "National", "en",
+            "https://w3id.org/ejp-rd/vocabulary#OpenAccess", "http://example.org/landing/%d" % index, None,
+            "http://example.org/vp", "http://example.org/policy/1", "keyword %d|rare disease" % index,
+            "http://example.org/logo/%d.png" % index, "id-%s-%d" % (kind.lower(), index), "2023-01-01T00:00:00",
+            "2023-01-02T00:00:00", "1.%d" % index, "http://example.org/conforms",
+            catalogs[index % len(catalogs)] if catalogs else "-"]
+
+
+def make_workbook(path, size=3, catalogs=()):
+    """
+    Method to write an EJP RD workbook with an organisation and size biobanks, patient registries, datasets,
+    distributions and data services
+
+    :param path: Provide path of the xlsx file
+    :param size: Provide number of resources of every type
+    :param catalogs: Provide titles of the catalogs in the Catalog sheet; the biobanks, patient registries and datasets
+                     are spread over them with a Catalog column
+    """
+    catalogs = list(catalogs)
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+
+    sheet = workbook.create_sheet("Organisation")
+    sheet.append(["Title", "Description", "LandingPage", "Logo", "Location", "Identifier"])
+    sheet.append([ORGANISATION, "An organisation", "http://example.org/a|http://example.org/b",
+                  "http://example.org/logo.png", "Leiden", "organisation-a"])
+
+    # The last column is the Catalog column, or an unnamed column after the others
+    for name in ("Biobank", "PatientRegistry", "Dataset"):
+        sheet = workbook.create_sheet(name)
+        sheet.append(RESOURCE_COLUMNS + ["Catalog" if catalogs else None])
+        for index in range(size):
+            sheet.append(resource_row(name, index, catalogs))
+
+    workbook.create_sheet("ContactPoint")
+    workbook.create_sheet("Guideline")
+
+    sheet = workbook.create_sheet("Distribution")
+    sheet.append(DISTRIBUTION_COLUMNS)
+    for index in range(size):
+        sheet.append(["http://rdflicense.appspot.com/rdflicense/cc-by-nc-nd3.0", "Distribution %d" % index,
+                      "Distribution of dataset %d" % index, ORGANISATION, "1", "http://example.org/access/open",
+                      "http://example.org/policy/1", "text/csv", None, "download",
+                      "http://example.org/service/%d" % index, "Dataset %d" % index])
+
+    sheet = workbook.create_sheet("DataService")
+    sheet.append(DATASERVICE_COLUMNS + [None])
+    for index in range(size):
+        sheet.append(["http://rdflicense.appspot.com/rdflicense/cc-by-nc-nd3.0",
+                      "http://edamontology.org/operation_0004", "Service %d" % index, "Service description", "true",
+                      ORGANISATION, "http://edamontology.org/topic_0203", "en", "mailto:service@example.org",
+                      "National", "http://example.org/access/open", "http://example.org/conforms",
+                      "http://example.org/endpoint/description", "http://example.org/endpoint/%d" % index,
+                      "http://example.org/landing", "http://example.org/vp", "http://example.org/policy/1",
+                      "http://example.org/logo.png", "Dataset %d" % index, "service keyword",
+                      "service-%d" % index, "2023-01-01T00:00:00", "2023-01-01T00:00:00", "1",
+                      "http://example.org/conforms", "-"])
+
+    sheet = workbook.create_sheet("Catalog")
+    sheet.append(["Title", "Description"])
+    for title in catalogs:
+        sheet.append([title, "Catalog " + title])
+    workbook.save(path)